@@ -43,6 +43,9 @@ example code:
 
         app.exec_()
 """
+import importlib
+import sys
+
 from .pkg_info import __version__ as VERSION
 from .pkg_info import __license__ as LICENSE
 
@@ -61,12 +64,46 @@ from .nodes.group_node import GroupNode
 
 # widgets
 from .widgets.node_widgets import NodeBaseWidget
-from .custom_widgets.nodes_tree import NodesTreeWidget
-from .custom_widgets.nodes_palette import NodesPaletteWidget
-from .custom_widgets.properties_bin.node_property_widgets import (
-    NodePropEditorWidget,
-    PropertiesBinWidget
-)
+
+# custom widgets are imported on first access so "import NodeGraphQt"
+# doesn't load the properties bin, nodes palette and nodes tree widgets.
+# {attribute name: (module, module attribute)}
+_LAZY_IMPORTS = {
+    'custom_widgets': ('.custom_widgets', None),
+    'NodesTreeWidget': ('.custom_widgets.nodes_tree', 'NodesTreeWidget'),
+    'NodesPaletteWidget': (
+        '.custom_widgets.nodes_palette', 'NodesPaletteWidget'
+    ),
+    'NodePropEditorWidget': (
+        '.custom_widgets.properties_bin.node_property_widgets',
+        'NodePropEditorWidget'
+    ),
+    'PropertiesBinWidget': (
+        '.custom_widgets.properties_bin.node_property_widgets',
+        'PropertiesBinWidget'
+    ),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(
+            'module "{}" has no attribute "{}"'.format(__name__, name))
+    module_name, attr = _LAZY_IMPORTS[name]
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, attr) if attr else module
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+# module "__getattr__" is only supported from python 3.7.
+if sys.version_info < (3, 7):
+    for _name in _LAZY_IMPORTS:
+        __getattr__(_name)
 
 
 __version__ = VERSION
@@ -0,0 +1,234 @@
+#!/usr/bin/python
+import sys
+from collections import OrderedDict
+
+from NodeGraphQt.base.commands import estimate_size
+
+
+def estimate_result_size(outputs):
+    """
+    Returns the approximate memory footprint of node output values in bytes.
+
+    Values with a ``nbytes`` attribute (eg. NumPy arrays, memoryviews) are
+    measured by their buffer size as ``sys.getsizeof`` doesn't count the
+    buffer of array views.
+
+    Args:
+        outputs (dict): {<output_port_name>: <value>}
+
+    Returns:
+        int: size in bytes.
+    """
+    size = sys.getsizeof(outputs)
+    for name, value in outputs.items():
+        nbytes = getattr(value, 'nbytes', None)
+        if isinstance(nbytes, int):
+            size += sys.getsizeof(name) + nbytes
+        else:
+            size += estimate_size(name) + estimate_size(value)
+    return size
+
+
+class ResultCache(object):
+    """
+    Least recently used cache for the node output values computed by the
+    :class:`NodeGraphQt.base.evaluation.GraphEvaluator`.
+
+    Entries are keyed by ``(<node_id>, <fingerprint>)`` so a node has a
+    cache entry for each combination of input values and properties it was
+    computed with, once the estimated size of the entries exceeds the byte
+    budget the least recently used entries are evicted.
+
+    The latest entry of a pinned node is never evicted.
+
+    Args:
+        budget (int): budget in bytes (0 = unlimited).
+    """
+
+    def __init__(self, budget=0):
+        self._budget = max(int(budget), 0)
+        self._entries = OrderedDict()
+        self._node_keys = {}
+        self._latest = {}
+        self._pinned = set()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __repr__(self):
+        return '<{}() entries={} size={} object at {}>'.format(
+            self.__class__.__name__, len(self._entries), self._size,
+            hex(id(self)))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def budget(self):
+        """
+        Returns:
+            int: budget in bytes (0 = unlimited).
+        """
+        return self._budget
+
+    def set_budget(self, budget=0):
+        """
+        Set the cache budget in estimated bytes and evict the least recently
+        used entries over it.
+
+        Args:
+            budget (int): budget in bytes (0 = unlimited).
+        """
+        self._budget = max(int(budget), 0)
+        self._evict()
+
+    @property
+    def size(self):
+        """
+        Returns:
+            int: estimated size of the cached values in bytes.
+        """
+        return self._size
+
+    def get(self, key, default=None):
+        """
+        Returns the cached output values and marks the entry as the most
+        recently used.
+
+        Args:
+            key (tuple): (<node_id>, <fingerprint>)
+            default (object): returned if the entry isn't cached.
+
+        Returns:
+            dict: {<output_port_name>: <value>}
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key):
+        """
+        Returns the cached output values without updating the statistics
+        or the entry use order.
+
+        Args:
+            key (tuple): (<node_id>, <fingerprint>)
+
+        Returns:
+            dict: {<output_port_name>: <value>} or ``None`` if not cached.
+        """
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def put(self, key, outputs):
+        """
+        Cache the node output values.
+
+        Args:
+            key (tuple): (<node_id>, <fingerprint>)
+            outputs (dict): {<output_port_name>: <value>}
+        """
+        self._remove(key)
+        size = estimate_result_size(outputs)
+        self._entries[key] = (outputs, size)
+        self._node_keys.setdefault(key[0], set()).add(key)
+        self._latest[key[0]] = key
+        self._size += size
+        self._evict()
+
+    def discard_node(self, node_id):
+        """
+        Remove all the cache entries of a node.
+
+        Args:
+            node_id (str): node id.
+        """
+        for key in list(self._node_keys.get(node_id, [])):
+            self._remove(key)
+        self._latest.pop(node_id, None)
+
+    def pin(self, node_id, pinned=True):
+        """
+        Pin the latest cache entry of a node so it's not evicted.
+
+        Args:
+            node_id (str): node id.
+            pinned (bool): false to unpin the node.
+        """
+        if pinned:
+            self._pinned.add(node_id)
+        else:
+            self._pinned.discard(node_id)
+            self._evict()
+
+    def is_pinned(self, node_id):
+        """
+        Args:
+            node_id (str): node id.
+
+        Returns:
+            bool: true if the node is pinned.
+        """
+        return node_id in self._pinned
+
+    def clear(self):
+        """
+        Remove all the cache entries (the pinned nodes stay pinned).
+        """
+        self._entries.clear()
+        self._node_keys.clear()
+        self._latest.clear()
+        self._size = 0
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Returns:
+            dict: "hits", "misses", "evictions", "entries", "size" and
+                "budget".
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'entries': len(self._entries),
+            'size': self._size,
+            'budget': self._budget,
+        }
+
+    def reset_stats(self):
+        """
+        Reset the hit, miss and eviction counters.
+        """
+        self._hits = self._misses = self._evictions = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._size -= entry[1]
+        node_keys = self._node_keys[key[0]]
+        node_keys.discard(key)
+        if not node_keys:
+            del self._node_keys[key[0]]
+        return True
+
+    def _evict(self):
+        if not self._budget or self._size <= self._budget:
+            return
+        for key in list(self._entries.keys()):
+            if self._size <= self._budget:
+                break
+            if key[0] in self._pinned and self._latest.get(key[0]) == key:
+                continue
+            self._remove(key)
+            self._evictions += 1
@@ -1,8 +1,383 @@
 #!/usr/bin/python
+import pickle
+import sys
+import time
+import zlib
+from array import array
+from itertools import chain
+
 from Qt import QtWidgets
 
+from NodeGraphQt.base.headless import HeadlessNodeItem
 from NodeGraphQt.constants import PortTypeEnum
 
+# rough memory cost (in bytes) of the Qt objects owned by a node view that
+# isn't visible to "sys.getsizeof" (graphics items, text items and the
+# proxy widgets of embedded node widgets).
+NODE_ITEM_SIZE = 16 * 1024
+PORT_ITEM_SIZE = 2 * 1024
+NODE_WIDGET_SIZE = 64 * 1024
+
+
+def estimate_size(value, _seen=None):
+    """
+    Returns the approximate memory footprint of a value in bytes including
+    the items of containers.
+
+    Args:
+        value (object): value to measure.
+
+    Returns:
+        int: size in bytes.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, val in value.items():
+            size += estimate_size(key, _seen) + estimate_size(val, _seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for val in value:
+            size += estimate_size(val, _seen)
+    return size
+
+
+def estimate_node_size(node):
+    """
+    Returns the approximate memory footprint of a node in bytes including
+    its node item, port items and embedded widgets (headless nodes only
+    count their node model).
+
+    Args:
+        node (NodeGraphQt.NodeObject): node.
+
+    Returns:
+        int: size in bytes.
+    """
+    if node.is_headless():
+        # headless stand-in items only hold the port names.
+        return estimate_size(node.model.to_dict)
+    view = node.view
+    ports = (list(getattr(view, 'inputs', [])) +
+             list(getattr(view, 'outputs', [])))
+    widgets = getattr(view, 'widgets', {})
+    return (estimate_size(node.model.to_dict) +
+            NODE_ITEM_SIZE +
+            len(ports) * PORT_ITEM_SIZE +
+            len(widgets) * NODE_WIDGET_SIZE)
+
+
+def command_size(command):
+    """
+    Returns the approximate memory footprint of an undo command and its
+    child commands in bytes.
+
+    Commands can implement a ``size_hint()`` method to report the memory
+    they keep alive otherwise :func:`attributes_size` is used.
+
+    Args:
+        command (QtWidgets.QUndoCommand): undo command.
+
+    Returns:
+        int: size in bytes.
+    """
+    size_hint = getattr(command, 'size_hint', None)
+    if size_hint:
+        size = size_hint()
+    else:
+        size = attributes_size(command)
+    for i in range(command.childCount()):
+        size += command_size(command.child(i))
+    return size
+
+
+def attributes_size(command):
+    """
+    Returns the approximate memory footprint of an undo command in bytes
+    from its attributes (without the child commands).
+
+    Args:
+        command (QtWidgets.QUndoCommand): undo command.
+
+    Returns:
+        int: size in bytes.
+    """
+    return sys.getsizeof(command) + estimate_size(
+        getattr(command, '__dict__', {}))
+
+
+def pack_values(values):
+    """
+    Returns the values in a compressed serialized form.
+
+    Args:
+        values (object): values to pack.
+
+    Returns:
+        bytes: packed values or None if the values can't be serialized or
+            the packed form isn't smaller.
+    """
+    try:
+        packed = zlib.compress(pickle.dumps(values, pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    if len(packed) >= estimate_size(values):
+        return None
+    return packed
+
+
+def unpack_values(packed):
+    """
+    Returns the values packed by :func:`pack_values`.
+
+    Args:
+        packed (bytes): packed values.
+
+    Returns:
+        object: values.
+    """
+    return pickle.loads(zlib.decompress(packed))
+
+
+def compact_command(command):
+    """
+    Spill an undo command and its child commands to their compact form.
+
+    Commands can implement a ``compact()`` method to release the memory
+    they hold until they are undone or redone again.
+
+    Args:
+        command (QtWidgets.QUndoCommand): undo command.
+    """
+    compact = getattr(command, 'compact', None)
+    if compact:
+        compact()
+    for i in range(command.childCount()):
+        compact_command(command.child(i))
+
+
+def update_node_property(node, name, value):
+    """
+    Updates the node model and view with a property value.
+    (doesn't emit any signals)
+
+    Args:
+        node (NodeGraphQt.NodeObject): node.
+        name (str): node property name.
+        value (object): node property value.
+    """
+    # set model data.
+    node.model.set_property(name, value)
+    if name == 'name' and node.graph:
+        node.graph._cache_node_names([value])
+
+    # set view data.
+    view = node.view
+
+    # view widgets.
+    if hasattr(view, 'widgets') and name in view.widgets.keys():
+        # check if previous value is identical to current value,
+        # prevent signals from causing an infinite loop.
+        if view.widgets[name].get_value() != value:
+            view.widgets[name].set_value(value)
+
+    # view properties.
+    if name in view.properties.keys():
+        # remap "pos" to "xy_pos" node view has pre-existing pos method.
+        if name == 'pos':
+            name = 'xy_pos'
+        setattr(view, name, value)
+
+
+def node_ports(node):
+    """
+    Args:
+        node (NodeGraphQt.NodeObject): node.
+
+    Returns:
+        list[NodeGraphQt.Port]: input and output ports.
+    """
+    if not hasattr(node, 'input_ports'):
+        return []
+    return node.input_ports() + node.output_ports()
+
+
+def is_rebuildable(graph, node):
+    """
+    Returns True if the node items can be re-created through the node
+    factory.
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+        node (NodeGraphQt.NodeObject): node.
+
+    Returns:
+        bool: true if the node can be rebuilt.
+    """
+    node_cls = graph.node_factory.nodes.get(node.type_)
+    if node_cls is not type(node):
+        return False
+    # port nodes are created by their parent port.
+    return getattr(node, 'parent_port', None) is None
+
+
+def is_releasable(graph, node):
+    """
+    Returns True if the node items can be released and re-created through
+    the node factory.
+
+    Nodes with embedded widgets keep their items as the proxy widgets of
+    the re-created items would have to be moved from a throwaway node
+    instance.
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+        node (NodeGraphQt.NodeObject): node.
+
+    Returns:
+        bool: true if the node items can be released.
+    """
+    if node.is_headless() or getattr(node.view, 'widgets', None):
+        return False
+    return is_rebuildable(graph, node)
+
+
+def snapshot_node(node):
+    """
+    Snapshot the node view state that isn't stored in the node model.
+
+    Args:
+        node (NodeGraphQt.NodeObject): node.
+
+    Returns:
+        dict: node snapshot.
+    """
+    node.update_model()
+    widgets = getattr(node.view, 'widgets', {})
+    return {
+        'hidden_widgets': [n for n, w in widgets.items()
+                           if not w.isVisible()]
+    }
+
+
+def release_node_view(node):
+    """
+    Remove the node item from the scene and replace the node item and port
+    items with headless stand-ins so the ``QGraphicsItem`` items and
+    embedded widgets are released while the node and port objects are kept.
+
+    Args:
+        node (NodeGraphQt.NodeObject): node.
+    """
+    node.view.delete()
+    item = HeadlessNodeItem(node.name())
+    for port in node_ports(node):
+        if port.type_() == PortTypeEnum.IN.value:
+            add_port = item.add_input
+        else:
+            add_port = item.add_output
+        port_item = add_port(port.name(), port.model.multi_connection,
+                             port.model.display_name, port.model.locked)
+        port_item.setVisible(port.model.visible)
+        port.set_view(port_item)
+    node.set_view(item)
+
+
+def rebuild_node(graph, node, snapshot=None):
+    """
+    Re-create the node item, port items and embedded widgets of a node that
+    has headless stand-in items (a released or headless node).
+
+    The items are built by a new instance of the node class created through
+    the node factory and moved to the node object and its port objects so
+    the node objects and any state set on them are kept, the embedded
+    widgets are linked to the node (see :meth:`BaseNode._link_widget`).
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+        node (NodeGraphQt.NodeObject): node.
+        snapshot (dict): node snapshot from :func:`snapshot_node`.
+    """
+    template = graph.node_factory.create_node_instance(node.type_)
+    item = template.view
+    item.name = node.name()
+
+    # widget value changes are set on the node the widget is linked to.
+    widgets = getattr(item, 'widgets', {})
+    for widget in widgets.values():
+        widget._node = node
+
+    for port_type, ports, port_items in [
+            (PortTypeEnum.IN.value, getattr(node, '_inputs', []),
+             getattr(item, 'inputs', [])),
+            (PortTypeEnum.OUT.value, getattr(node, '_outputs', []),
+             getattr(item, 'outputs', []))]:
+        if not ports and not port_items:
+            continue
+        if port_type == PortTypeEnum.IN.value:
+            add_port, delete_port = item.add_input, item.delete_input
+        else:
+            add_port, delete_port = item.add_output, item.delete_output
+        port_items = {p.name: p for p in port_items}
+        for port in ports:
+            # ports added after the node "__init__" are created from the
+            # port model.
+            port_item = port_items.pop(port.name(), None)
+            if port_item is None:
+                port_item = add_port(
+                    port.name(), port.model.multi_connection,
+                    port.model.display_name, port.model.locked)
+            port_item.locked = port.model.locked
+            port.set_view(port_item)
+        for port_item in port_items.values():
+            delete_port(port_item)
+
+    node.set_view(item)
+
+    # the items are owned by the node now, drop the template references.
+    for port in node_ports(template):
+        port.set_view(None)
+    template._view = None
+
+    for port in node_ports(node):
+        if not port.model.visible:
+            PortVisibleCmd(port, False).redo()
+    for name, value in node.model.custom_properties.items():
+        if name in widgets:
+            widgets[name].set_value(value)
+    for name in (snapshot or {}).get('hidden_widgets', []):
+        if name in widgets:
+            widgets[name].setVisible(False)
+
+
+def connect_node_views(graph, nodes):
+    """
+    Connect the port items of the nodes from the port models.
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+        nodes (list[NodeGraphQt.NodeObject]): nodes with new node items.
+    """
+    for node in nodes:
+        for port in node_ports(node):
+            for node_id, port_names in port.model.connected_ports.items():
+                connected_node = graph.get_node_by_id(node_id)
+                if connected_node is None:
+                    continue
+                if port.type_() == PortTypeEnum.IN.value:
+                    connected_ports = connected_node.outputs()
+                else:
+                    connected_ports = connected_node.inputs()
+                for port_name in port_names:
+                    connected_port = connected_ports.get(port_name)
+                    if connected_port is None or connected_port.view in \
+                            port.view.connected_ports:
+                        continue
+                    port.view.connect_to(connected_port.view)
+
 
 class PropertyChangedCmd(QtWidgets.QUndoCommand):
     """
@@ -12,54 +387,189 @@ class PropertyChangedCmd(QtWidgets.QUndoCommand):
         node (NodeGraphQt.NodeObject): node.
         name (str): node property name.
         value (object): node property value.
+        merge (bool): merge with the previous interactive change.
     """
 
-    def __init__(self, node, name, value):
+    # consecutive interactive changes to the same property within this
+    # interval (in seconds) are merged into one undo command.
+    MERGE_INTERVAL = 0.5
+    MERGE_ID = 1
+
+    def __init__(self, node, name, value, merge=False):
         QtWidgets.QUndoCommand.__init__(self)
         self.setText('property "{}:{}"'.format(node.name(), name))
         self.node = node
         self.name = name
         self.old_val = node.get_property(name)
         self.new_val = value
+        self.merge = merge
+        self.timestamp = time.time()
+        self._packed = None
 
-    def set_node_property(self, name, value):
+    def compact(self):
         """
-        updates the node view and model.
+        Spill the old and new property values to a compressed serialized
+        form, they're restored the next time the command is undone or redone.
         """
-        # set model data.
-        model = self.node.model
-        model.set_property(name, value)
+        if self._packed is not None:
+            return
+        packed = pack_values((self.old_val, self.new_val))
+        if packed is None:
+            return
+        self._packed = packed
+        self.old_val = self.new_val = None
 
-        # set view data.
-        view = self.node.view
+    def restore(self):
+        """
+        Restore the property values spilled by
+        :meth:`PropertyChangedCmd.compact`.
+        """
+        if self._packed is None:
+            return
+        self.old_val, self.new_val = unpack_values(self._packed)
+        self._packed = None
 
-        # view widgets.
-        if hasattr(view, 'widgets') and name in view.widgets.keys():
-            # check if previous value is identical to current value,
-            # prevent signals from causing an infinite loop.
-            if view.widgets[name].get_value() != value:
-                view.widgets[name].set_value(value)
+    def size_hint(self):
+        return attributes_size(self)
 
-        # view properties.
-        if name in view.properties.keys():
-            # remap "pos" to "xy_pos" node view has pre-existing pos method.
-            if name == 'pos':
-                name = 'xy_pos'
-            setattr(view, name, value)
+    def set_node_property(self, name, value):
+        """
+        updates the node view and model.
+        """
+        update_node_property(self.node, name, value)
 
         # emit property changed signal.
         graph = self.node.graph
-        graph.property_changed.emit(self.node, self.name, value)
+        graph.emit_graph_signal(
+            'property_changed', self.node, self.name, value)
+
+    def id(self):
+        return self.MERGE_ID
+
+    def mergeWith(self, command):
+        """
+        Merge consecutive interactive changes to the same node property made
+        within the merge interval (eg. dragging a slider) into a single
+        command, changes made from code are never merged.
+
+        Args:
+            command (PropertyChangedCmd): command pushed after this one.
+
+        Returns:
+            bool: true if the command was merged.
+        """
+        if not isinstance(command, PropertyChangedCmd):
+            return False
+        if not (self.merge and command.merge):
+            return False
+        if command.node is not self.node or command.name != self.name:
+            return False
+        if command.timestamp - self.timestamp > self.MERGE_INTERVAL:
+            return False
+        self.restore()
+        command.restore()
+        self.new_val = command.new_val
+        self.timestamp = command.timestamp
+        # the stack drops the command if the value was changed back.
+        self.setObsolete(self.old_val == self.new_val)
+        return True
 
     def undo(self):
+        self.restore()
         if self.old_val != self.new_val:
             self.set_node_property(self.name, self.old_val)
 
     def redo(self):
+        self.restore()
         if self.old_val != self.new_val:
             self.set_node_property(self.name, self.new_val)
 
 
+class PropertiesChangedCmd(QtWidgets.QUndoCommand):
+    """
+    Multiple node properties changed command.
+
+    The properties are applied with a single redraw per node and a single
+    "properties_changed" signal is emitted from the node graph.
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+        changes (list[tuple(NodeGraphQt.NodeObject, dict)]):
+            nodes and their property names and values.
+    """
+
+    def __init__(self, graph, changes):
+        QtWidgets.QUndoCommand.__init__(self)
+        self.setText('change node properties')
+        self.graph = graph
+        self.nodes = [node for node, _ in changes]
+        self.new_vals = [properties for _, properties in changes]
+        self.old_vals = [
+            {name: node.get_property(name) for name in properties}
+            for node, properties in changes
+        ]
+        self._packed = None
+
+    def size_hint(self):
+        return attributes_size(self)
+
+    def compact(self):
+        """
+        Spill the old and new property values to a compressed serialized
+        form, they're restored the next time the command is undone or redone.
+        """
+        if self._packed is not None:
+            return
+        packed = pack_values((self.old_vals, self.new_vals))
+        if packed is None:
+            return
+        self._packed = packed
+        self.old_vals = self.new_vals = None
+
+    def restore(self):
+        """
+        Restore the property values spilled by
+        :meth:`PropertiesChangedCmd.compact`.
+        """
+        if self._packed is None:
+            return
+        self.old_vals, self.new_vals = unpack_values(self._packed)
+        self._packed = None
+
+    def set_properties(self, values):
+        """
+        updates the node views and models.
+
+        Args:
+            values (list[dict]): property names and values for each node.
+        """
+        node_ids = []
+        prop_names = set()
+        for node, properties in zip(self.nodes, values):
+            redraw = False
+            for name, value in properties.items():
+                if node.get_property(name) == value:
+                    continue
+                update_node_property(node, name, value)
+                redraw = redraw or node.model.is_custom_property(name)
+                prop_names.add(name)
+            if redraw and hasattr(node.view, 'draw_node'):
+                node.view.draw_node()
+            node_ids.append(node.id)
+
+        if prop_names:
+            self.graph.emit_graph_signal(
+                'properties_changed', node_ids, sorted(prop_names))
+
+    def undo(self):
+        self.restore()
+        self.set_properties(self.old_vals)
+
+    def redo(self):
+        self.restore()
+        self.set_properties(self.new_vals)
+
+
 class NodeVisibleCmd(QtWidgets.QUndoCommand):
     """
     Node visibility changed command.
@@ -75,6 +585,9 @@ class NodeVisibleCmd(QtWidgets.QUndoCommand):
         self.visible = visible
         self.selected = self.node.selected()
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def set_node_visible(self, visible):
         model = self.node.model
         model.set_property('visible', visible)
@@ -94,7 +607,8 @@ class NodeVisibleCmd(QtWidgets.QUndoCommand):
 
         # emit property changed signal.
         graph = self.node.graph
-        graph.property_changed.emit(self.node, 'visible', visible)
+        graph.emit_graph_signal(
+            'property_changed', self.node, 'visible', visible)
 
     def undo(self):
         self.set_node_visible(not self.visible)
@@ -117,17 +631,25 @@ class NodeWidgetVisibleCmd(QtWidgets.QUndoCommand):
         QtWidgets.QUndoCommand.__init__(self)
         label = 'show' if visible else 'hide'
         self.setText('{} node widget "{}"'.format(label, name))
-        self.view = node.view
-        self.node_widget = self.view.get_widget(name)
+        # the node view is looked up when the command is run as the node
+        # items are re-created if the node is deleted and restored.
+        self.node = node
+        self.name = name
         self.visible = visible
 
+    def size_hint(self):
+        return attributes_size(self)
+
+    def set_widget_visible(self, visible):
+        view = self.node.view
+        view.get_widget(self.name).setVisible(visible)
+        view.draw_node()
+
     def undo(self):
-        self.node_widget.setVisible(not self.visible)
-        self.view.draw_node()
+        self.set_widget_visible(not self.visible)
 
     def redo(self):
-        self.node_widget.setVisible(self.visible)
-        self.view.draw_node()
+        self.set_widget_visible(self.visible)
 
 
 class NodeMovedCmd(QtWidgets.QUndoCommand):
@@ -146,6 +668,9 @@ class NodeMovedCmd(QtWidgets.QUndoCommand):
         self.pos = pos
         self.prev_pos = prev_pos
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def undo(self):
         self.node.view.xy_pos = self.prev_pos
         self.node.model.pos = self.prev_pos
@@ -157,10 +682,64 @@ class NodeMovedCmd(QtWidgets.QUndoCommand):
         self.node.model.pos = self.pos
 
 
+class NodesMovedCmd(QtWidgets.QUndoCommand):
+    """
+    Multiple nodes moved command.
+
+    Positions are stored in packed arrays and applied to all the nodes in a
+    single pass with the connected pipes only redrawn once.
+
+    Args:
+        nodes (list[NodeGraphQt.NodeObject]): nodes.
+        positions (list[tuple(float, float)]): new node positions.
+        prev_positions (list[tuple(float, float)]): previous node positions.
+    """
+
+    def __init__(self, nodes, positions, prev_positions):
+        QtWidgets.QUndoCommand.__init__(self)
+        self.setText('move nodes')
+        self.nodes = list(nodes)
+        self.pos = array('d', chain.from_iterable(positions))
+        self.prev_pos = array('d', chain.from_iterable(prev_positions))
+
+    def size_hint(self):
+        return attributes_size(self)
+
+    def set_positions(self, positions):
+        """
+        updates the node views and models.
+
+        Args:
+            positions (array): packed x, y positions.
+        """
+        xy_positions = [[positions[i], positions[i + 1]]
+                        for i in range(0, len(positions), 2)]
+        views = [n.view for n in self.nodes]
+        viewer = views[0].viewer() if views else None
+        if viewer:
+            viewer.set_node_positions(views, xy_positions)
+        else:
+            for view, xy_pos in zip(views, xy_positions):
+                view.xy_pos = xy_pos
+        for node, xy_pos in zip(self.nodes, xy_positions):
+            node.model.pos = xy_pos
+
+    def undo(self):
+        self.set_positions(self.prev_pos)
+
+    def redo(self):
+        if self.pos == self.prev_pos:
+            return
+        self.set_positions(self.pos)
+
+
 class NodeAddedCmd(QtWidgets.QUndoCommand):
     """
     Node added command.
 
+    The node items of an undone node are released when the command is
+    compacted and re-created through the node factory when it's redone.
+
     Args:
         graph (NodeGraphQt.NodeGraph): node graph.
         node (NodeGraphQt.NodeObject): node.
@@ -175,33 +754,75 @@ class NodeAddedCmd(QtWidgets.QUndoCommand):
         self.node = node
         self.pos = pos
         self.emit_signal = emit_signal
+        self.snapshot = None
+        self.undone = False
+
+    def size_hint(self):
+        """
+        Returns the approximate memory footprint of the command, an undone
+        node is kept alive by the command.
+
+        Returns:
+            int: size in bytes.
+        """
+        size = attributes_size(self)
+        if self.undone:
+            size += estimate_node_size(self.node)
+        return size
+
+    def compact(self):
+        """
+        Release the node items of the undone node.
+        """
+        if self.snapshot is not None or not self.undone:
+            return
+        if not is_releasable(self.graph, self.node):
+            return
+        self.snapshot = snapshot_node(self.node)
+        release_node_view(self.node)
 
     def undo(self):
         node_id = self.node.id
         self.pos = self.pos or self.node.pos()
         self.graph.model.nodes.pop(self.node.id)
+        self.graph._invalidate_name_cache()
         self.node.view.delete()
+        self.undone = True
 
         if self.emit_signal:
-            self.graph.nodes_deleted.emit([node_id])
+            self.graph.emit_graph_signal('nodes_deleted', [node_id])
 
     def redo(self):
+        if self.snapshot is not None:
+            rebuild_node(self.graph, self.node, self.snapshot)
+            self.snapshot = None
+        self.undone = False
         self.graph.model.nodes[self.node.id] = self.node
-        self.graph.viewer().add_node(self.node.view, self.pos)
-
-        # node width & height is calculated when it's added to the scene,
-        # so we have to update the node model here.
-        self.node.model.width = self.node.view.width
-        self.node.model.height = self.node.view.height
+        self.graph._cache_node_names([self.node.name()])
+        viewer = self.graph.viewer()
+        if viewer:
+            viewer.add_node(self.node.view, self.pos)
+            # node width & height is calculated when it's added to the scene,
+            # so we have to update the node model here.
+            self.node.model.width = self.node.view.width
+            self.node.model.height = self.node.view.height
+        else:
+            # headless node graph.
+            self.node.view.xy_pos = list(self.pos or self.node.model.pos)
 
         if self.emit_signal:
-            self.graph.node_created.emit(self.node)
+            self.graph.emit_graph_signal('node_created', self.node)
 
 
 class NodesRemovedCmd(QtWidgets.QUndoCommand):
     """
     Node deleted command.
 
+    The node items of the removed nodes are released (replaced with
+    headless stand-ins) and re-created through the node factory on undo so
+    the undo history doesn't keep the graphics items of deleted nodes
+    alive, the node and port objects are kept (see :func:`is_releasable`).
+
     Args:
         graph (NodeGraphQt.NodeGraph): node graph.
         nodes (list[NodeGraphQt.BaseNode or NodeGraphQt.NodeObject]): nodes.
@@ -214,24 +835,78 @@ class NodesRemovedCmd(QtWidgets.QUndoCommand):
         self.graph = graph
         self.nodes = nodes
         self.emit_signal = emit_signal
+        self.snapshots = {}
+
+    def size_hint(self):
+        """
+        Returns the approximate memory footprint of the command, removed
+        nodes that can't be re-created are kept alive by the command.
+
+        Returns:
+            int: size in bytes.
+        """
+        nodes = self.graph.model.nodes
+        return attributes_size(self) + sum(
+            estimate_node_size(n) for n in self.nodes
+            if n.id not in self.snapshots and n.id not in nodes)
+
+    def detach_node(self, node):
+        """
+        Snapshot the node view state and release its node items.
+
+        Args:
+            node (NodeGraphQt.NodeObject): removed node.
+        """
+        self.snapshots[node.id] = snapshot_node(node)
+        release_node_view(node)
+
+    def restore_node(self, node):
+        """
+        Re-create the node items of a detached node through the node
+        factory.
+
+        Args:
+            node (NodeGraphQt.NodeObject): detached node.
+        """
+        rebuild_node(self.graph, node, self.snapshots.pop(node.id))
 
     def undo(self):
+        viewer = self.graph.viewer()
+        restored = []
         for node in self.nodes:
-            self.graph.model.nodes[node.id] = node
-            self.graph.scene().addItem(node.view)
+            if node.id in self.snapshots:
+                self.restore_node(node)
+                self.graph.model.nodes[node.id] = node
+                viewer.add_node(node.view, node.model.pos)
+                node.model.width = node.view.width
+                node.model.height = node.view.height
+                restored.append(node)
+            else:
+                self.graph.model.nodes[node.id] = node
+                if viewer:
+                    viewer.scene().addItem(node.view)
 
             if self.emit_signal:
-                self.graph.node_created.emit(node)
+                self.graph.emit_graph_signal('node_created', node)
+
+        self.graph._cache_node_names([n.name() for n in self.nodes])
+
+        # restore the pipes to the connected nodes in the graph.
+        connect_node_views(self.graph, restored)
 
     def redo(self):
         node_ids = []
         for node in self.nodes:
             node_ids.append(node.id)
             self.graph.model.nodes.pop(node.id)
-            node.view.delete()
+            if is_releasable(self.graph, node):
+                self.detach_node(node)
+            else:
+                node.view.delete()
+        self.graph._invalidate_name_cache()
 
         if self.emit_signal:
-            self.graph.nodes_deleted.emit(node_ids)
+            self.graph.emit_graph_signal('nodes_deleted', node_ids)
 
 
 class NodeInputConnectedCmd(QtWidgets.QUndoCommand):
@@ -252,6 +927,9 @@ class NodeInputConnectedCmd(QtWidgets.QUndoCommand):
             self.source = trg_port
             self.target = src_port
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def undo(self):
         node = self.source.node()
         node.on_input_disconnected(self.source, self.target)
@@ -279,6 +957,9 @@ class NodeInputDisconnectedCmd(QtWidgets.QUndoCommand):
             self.source = trg_port
             self.target = src_port
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def undo(self):
         node = self.source.node()
         node.on_input_connected(self.source, self.target)
@@ -304,6 +985,9 @@ class PortConnectedCmd(QtWidgets.QUndoCommand):
         self.target = trg_port
         self.emit_signal = emit_signal
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def undo(self):
         src_model = self.source.model
         trg_model = self.target.model
@@ -328,8 +1012,9 @@ class PortConnectedCmd(QtWidgets.QUndoCommand):
         if self.emit_signal:
             ports = {p.type_(): p for p in [self.source, self.target]}
             graph = self.source.node().graph
-            graph.port_disconnected.emit(ports[PortTypeEnum.IN.value],
-                                         ports[PortTypeEnum.OUT.value])
+            graph.emit_graph_signal('port_disconnected',
+                                   ports[PortTypeEnum.IN.value],
+                                   ports[PortTypeEnum.OUT.value])
 
     def redo(self):
         src_model = self.source.model
@@ -346,8 +1031,9 @@ class PortConnectedCmd(QtWidgets.QUndoCommand):
         if self.emit_signal:
             ports = {p.type_(): p for p in [self.source, self.target]}
             graph = self.source.node().graph
-            graph.port_connected.emit(ports[PortTypeEnum.IN.value],
-                                      ports[PortTypeEnum.OUT.value])
+            graph.emit_graph_signal('port_connected',
+                                   ports[PortTypeEnum.IN.value],
+                                   ports[PortTypeEnum.OUT.value])
 
 
 class PortDisconnectedCmd(QtWidgets.QUndoCommand):
@@ -366,6 +1052,9 @@ class PortDisconnectedCmd(QtWidgets.QUndoCommand):
         self.target = trg_port
         self.emit_signal = emit_signal
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def undo(self):
         src_model = self.source.model
         trg_model = self.target.model
@@ -381,8 +1070,9 @@ class PortDisconnectedCmd(QtWidgets.QUndoCommand):
         if self.emit_signal:
             ports = {p.type_(): p for p in [self.source, self.target]}
             graph = self.source.node().graph
-            graph.port_connected.emit(ports[PortTypeEnum.IN.value],
-                                      ports[PortTypeEnum.OUT.value])
+            graph.emit_graph_signal('port_connected',
+                                   ports[PortTypeEnum.IN.value],
+                                   ports[PortTypeEnum.OUT.value])
 
     def redo(self):
         src_model = self.source.model
@@ -408,8 +1098,9 @@ class PortDisconnectedCmd(QtWidgets.QUndoCommand):
         if self.emit_signal:
             ports = {p.type_(): p for p in [self.source, self.target]}
             graph = self.source.node().graph
-            graph.port_disconnected.emit(ports[PortTypeEnum.IN.value],
-                                         ports[PortTypeEnum.OUT.value])
+            graph.emit_graph_signal('port_disconnected',
+                                   ports[PortTypeEnum.IN.value],
+                                   ports[PortTypeEnum.OUT.value])
 
 
 class PortLockedCmd(QtWidgets.QUndoCommand):
@@ -425,6 +1116,9 @@ class PortLockedCmd(QtWidgets.QUndoCommand):
         self.setText('lock port "{}"'.format(port.name()))
         self.port = port
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def undo(self):
         self.port.model.locked = False
         self.port.view.locked = False
@@ -447,6 +1141,9 @@ class PortUnlockedCmd(QtWidgets.QUndoCommand):
         self.setText('unlock port "{}"'.format(port.name()))
         self.port = port
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def undo(self):
         self.port.model.locked = True
         self.port.view.locked = True
@@ -473,6 +1170,9 @@ class PortVisibleCmd(QtWidgets.QUndoCommand):
         else:
             self.setText('hide port {}'.format(self.port.name()))
 
+    def size_hint(self):
+        return attributes_size(self)
+
     def set_visible(self, visible):
         self.port.model.visible = visible
         self.port.view.setVisible(visible)
@@ -0,0 +1,265 @@
+#!/usr/bin/python
+import os
+import pickle
+import tempfile
+import time
+
+from NodeGraphQt.base.process import is_ndarray
+
+
+class _ArrayFile(object):
+    """
+    Placeholder for an array output value stored in its own ``.npy`` file.
+
+    Args:
+        file_name (str): array file name.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+
+
+class DiskCache(object):
+    """
+    Persistent cache for the node output values computed by the
+    :class:`NodeGraphQt.base.evaluation.GraphEvaluator`, the entries are
+    keyed by the node fingerprint (a hash of the node type, properties and
+    upstream fingerprints) so they're reused across sessions.
+
+    Output values are pickled and NumPy arrays are stored as ``.npy`` files
+    which are memory mapped (read only) when loaded, once the size of the
+    cache directory exceeds the byte budget the least recently used entries
+    are deleted.
+
+    Args:
+        path (str): cache directory.
+        budget (int): budget in bytes (0 = unlimited).
+    """
+
+    EXTENSION = '.pickle'
+
+    def __init__(self, path, budget=0):
+        self._path = os.path.abspath(path)
+        self._budget = max(int(budget), 0)
+        self._entries = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(self._path, exist_ok=True)
+        self._scan()
+        self._evict()
+
+    def __repr__(self):
+        return '<{}("{}") object at {}>'.format(
+            self.__class__.__name__, self._path, hex(id(self)))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._entries
+
+    @property
+    def path(self):
+        """
+        Returns:
+            str: cache directory.
+        """
+        return self._path
+
+    @property
+    def budget(self):
+        """
+        Returns:
+            int: budget in bytes (0 = unlimited).
+        """
+        return self._budget
+
+    def set_budget(self, budget=0):
+        """
+        Set the cache budget in bytes and delete the least recently used
+        entries over it.
+
+        Args:
+            budget (int): budget in bytes (0 = unlimited).
+        """
+        self._budget = max(int(budget), 0)
+        self._evict()
+
+    @property
+    def size(self):
+        """
+        Returns:
+            int: size of the cache entries in bytes.
+        """
+        return self._size
+
+    def _scan(self):
+        """
+        Index the entries in the cache directory and remove the files left
+        by incomplete writes.
+        """
+        files = {}
+        for file_name in os.listdir(self._path):
+            file_path = os.path.join(self._path, file_name)
+            if not os.path.isfile(file_path):
+                continue
+            fingerprint = file_name.split('.', 1)[0]
+            files.setdefault(fingerprint, []).append(file_path)
+
+        for fingerprint, file_paths in files.items():
+            entry_path = self._entry_path(fingerprint)
+            if entry_path not in file_paths:
+                self._remove_files(file_paths)
+                continue
+            size = sum(os.path.getsize(f) for f in file_paths)
+            used = os.path.getmtime(entry_path)
+            self._entries[fingerprint] = [size, used, file_paths]
+            self._size += size
+
+    def _entry_path(self, fingerprint):
+        return os.path.join(self._path, fingerprint + self.EXTENSION)
+
+    @staticmethod
+    def _remove_files(file_paths):
+        for file_path in file_paths:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+    def get(self, fingerprint):
+        """
+        Load the cached output values, arrays are memory mapped read only.
+
+        Args:
+            fingerprint (str): node fingerprint.
+
+        Returns:
+            dict: {<output_port_name>: <value>} or ``None`` if not cached.
+        """
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            self._misses += 1
+            return
+        try:
+            with open(self._entry_path(fingerprint), 'rb') as f:
+                outputs = pickle.load(f)
+            for name, value in outputs.items():
+                if isinstance(value, _ArrayFile):
+                    import numpy
+                    outputs[name] = numpy.load(
+                        os.path.join(self._path, value.file_name),
+                        mmap_mode='r')
+        except Exception:
+            # missing or corrupt entry.
+            self.discard(fingerprint)
+            self._misses += 1
+            return
+        self._hits += 1
+        entry[1] = time.time()
+        try:
+            os.utime(self._entry_path(fingerprint))
+        except OSError:
+            pass
+        return outputs
+
+    def put(self, fingerprint, outputs):
+        """
+        Store the output values, values that can't be pickled aren't
+        cached.
+
+        Args:
+            fingerprint (str): node fingerprint.
+            outputs (dict): {<output_port_name>: <value>}
+
+        Returns:
+            bool: true if the values were stored.
+        """
+        if fingerprint in self._entries:
+            return True
+        file_paths = []
+        temp_path = None
+        data = {}
+        try:
+            for index, (name, value) in enumerate(outputs.items()):
+                if is_ndarray(value) and not value.dtype.hasobject:
+                    import numpy
+                    file_name = '{}.{}.npy'.format(fingerprint, index)
+                    file_path = os.path.join(self._path, file_name)
+                    file_paths.append(file_path)
+                    numpy.save(file_path, value, allow_pickle=False)
+                    value = _ArrayFile(file_name)
+                data[name] = value
+
+            # the entry file is written last and moved into place so only
+            # complete entries are loaded.
+            fd, temp_path = tempfile.mkstemp(dir=self._path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            entry_path = self._entry_path(fingerprint)
+            os.replace(temp_path, entry_path)
+            file_paths.append(entry_path)
+        except (pickle.PicklingError, TypeError, AttributeError, OSError):
+            if temp_path:
+                file_paths.append(temp_path)
+            self._remove_files(file_paths)
+            return False
+
+        size = sum(os.path.getsize(f) for f in file_paths)
+        if self._budget and size > self._budget:
+            # don't evict the whole cache for a single entry.
+            self._remove_files(file_paths)
+            return False
+        self._entries[fingerprint] = [size, time.time(), file_paths]
+        self._size += size
+        self._evict()
+        return True
+
+    def discard(self, fingerprint):
+        """
+        Delete a cache entry.
+
+        Args:
+            fingerprint (str): node fingerprint.
+        """
+        entry = self._entries.pop(fingerprint, None)
+        if entry is None:
+            return
+        self._size -= entry[0]
+        self._remove_files(entry[2])
+
+    def clear(self):
+        """
+        Delete all the cache entries.
+        """
+        for fingerprint in list(self._entries.keys()):
+            self.discard(fingerprint)
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Returns:
+            dict: "hits", "misses", "evictions", "entries", "size" and
+                "budget".
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'entries': len(self._entries),
+            'size': self._size,
+            'budget': self._budget,
+        }
+
+    def _evict(self):
+        if not self._budget or self._size <= self._budget:
+            return
+        entries = sorted(self._entries.items(), key=lambda e: e[1][1])
+        for fingerprint, _ in entries:
+            if self._size <= self._budget:
+                break
+            self.discard(fingerprint)
+            self._evictions += 1
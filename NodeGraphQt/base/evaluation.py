@@ -0,0 +1,1270 @@
+#!/usr/bin/python
+import asyncio
+import functools
+import hashlib
+import pickle
+from collections import ChainMap, Counter
+from concurrent.futures import (FIRST_COMPLETED,
+                                Future,
+                                ThreadPoolExecutor,
+                                wait)
+
+from Qt import QtCore
+
+from NodeGraphQt.base.cache import ResultCache
+from NodeGraphQt.base.event_loop import EventLoopThread
+from NodeGraphQt.base.plan import ExecutionPlan, PlanNode
+from NodeGraphQt.base.port import Port
+from NodeGraphQt.base.process import (compute_in_process,
+                                      create_process_pool,
+                                      load_outputs,
+                                      release_future_outputs)
+from NodeGraphQt.constants import PortTypeEnum
+from NodeGraphQt.errors import NodeEvaluationError
+
+
+def _no_compute(node, inputs):
+    return {}
+
+
+def _pass_through(links, node, inputs):
+    """
+    Compute function of a disabled node.
+
+    Args:
+        links (tuple): (<output_port_name>, <input_port_name>,
+            <multi_connection>) for each output port.
+        node (object): node (unused).
+        inputs (dict): {<input_port_name>: <value>}
+
+    Returns:
+        dict: {<output_port_name>: <value>}
+    """
+    outputs = {}
+    for name, input_name, multi_connection in links:
+        value = inputs.get(input_name)
+        if multi_connection:
+            value = value[0] if value else None
+        outputs[name] = value
+    return outputs
+
+
+class _EvaluationRelay(QtCore.QObject):
+    """
+    Passes the computed nodes from the thread pool back to the thread the
+    evaluator was created on.
+    """
+
+    computed = QtCore.Signal(object, object, object)
+
+    def __init__(self):
+        super(_EvaluationRelay, self).__init__()
+        self.callback = None
+
+    def forward(self, run, node, future):
+        self.callback(run, node, future)
+
+
+class _EvaluationRun(object):
+    """
+    State of a single evaluation, the nodes left to compute and the output
+    values held for their downstream nodes.
+
+    Args:
+        targets (list[NodeGraphQt.NodeObject]): nodes to evaluate.
+    """
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.target_ids = set(node.id for node in targets)
+        self.values = {}
+        self.fingerprints = {}
+        self.pending = []
+        self.evaluated = []
+        self.upstream = {}
+        self.consumers = Counter()
+        self.waiting = {}
+        self.dependents = {}
+        self.remaining = 0
+        self.future = None
+        self.futures = {}
+        self.computed = set()
+
+    def add_pending(self, node, fingerprint, upstream_ids):
+        """
+        Add a node to compute, nodes must be added in evaluation order.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            fingerprint (str): node fingerprint.
+            upstream_ids (list[str]): ids of the upstream nodes.
+        """
+        self.pending.append(node)
+        self.fingerprints[node.id] = fingerprint
+        self.upstream[node.id] = upstream_ids
+        self.consumers.update(upstream_ids)
+        pending_ids = set(n_id for n_id in upstream_ids
+                          if n_id in self.fingerprints)
+        self.waiting[node.id] = len(pending_ids)
+        for node_id in pending_ids:
+            self.dependents.setdefault(node_id, []).append(node)
+        self.remaining += 1
+
+    def ready(self):
+        """
+        Returns:
+            list[NodeGraphQt.NodeObject]: nodes with no upstream nodes left
+                to compute.
+        """
+        return [n for n in self.pending if not self.waiting[n.id]]
+
+    def complete(self, node, outputs):
+        """
+        Store the computed output values of a node.
+
+        Args:
+            node (NodeGraphQt.NodeObject): computed node.
+            outputs (dict): {<output_port_name>: <value>}
+
+        Returns:
+            list[NodeGraphQt.NodeObject]: nodes ready to be computed.
+        """
+        self.values[node.id] = outputs
+        self.evaluated.append(node)
+        self.computed.add(node.id)
+        self.remaining -= 1
+
+        # release the values no longer needed by this evaluation.
+        for node_id in self.upstream[node.id]:
+            self.consumers[node_id] -= 1
+            if not self.consumers[node_id] and \
+                    node_id not in self.target_ids:
+                self.values.pop(node_id, None)
+
+        ready = []
+        for downstream in self.dependents.get(node.id, []):
+            self.waiting[downstream.id] -= 1
+            if not self.waiting[downstream.id]:
+                ready.append(downstream)
+        return ready
+
+    def results(self):
+        """
+        Returns:
+            dict: {<node_id>: {<output_port_name>: <value>}} for the target
+                nodes.
+        """
+        return {node.id: self.values[node.id] for node in self.targets}
+
+
+class GraphEvaluator(object):
+    """
+    Dataflow evaluation engine used by the :meth:`NodeGraph.evaluate`
+    function.
+
+    The evaluation order is derived from the port connections of the node
+    models, each node is computed with :meth:`NodeGraphQt.BaseNode.compute`
+    after its upstream nodes and the output values are passed along the
+    connections to the input ports of the downstream nodes.
+
+    The output values are kept between evaluations in a
+    :class:`NodeGraphQt.base.cache.ResultCache` and a node is only
+    recomputed when it's marked dirty, the ``property_changed``,
+    ``port_connected`` and ``port_disconnected`` graph changes mark the
+    changed node and every node downstream of it dirty as they're made
+    (see :meth:`GraphEvaluator.graph_changed`).
+
+    Cache entries are keyed by the node id and a fingerprint of the node
+    properties and upstream fingerprints so a dirty node that's set back to
+    a previous state reuses its cached output values.
+
+    Note:
+        Changes made without emitting the graph signals
+        (eg. ``emit_signal=False``) are not tracked, call
+        :meth:`GraphEvaluator.invalidate` after making them.
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+        self._cache = ResultCache()
+        self._max_workers = 0
+        self._max_processes = 0
+        self._executor = None
+        self._process_pool = None
+        self._event_loop = EventLoopThread('NodeGraphEvaluatorLoop')
+        self._timeout = None
+        self._runs = []
+        self._disk_cache = None
+        self._relay = _EvaluationRelay()
+        self._relay.computed.connect(self._relay.forward,
+                                     QtCore.Qt.QueuedConnection)
+        self._relay.callback = self._on_async_computed
+        self._fingerprints = {}
+        self._dirty = set()
+        self._change_handlers = {
+            'node_created': self._on_node_created,
+            'nodes_deleted': self._on_nodes_deleted,
+            'port_connected': self._on_port_changed,
+            'port_disconnected': self._on_port_changed,
+            'property_changed': self._on_property_changed,
+        }
+
+    def __repr__(self):
+        return '<{}() object at {}>'.format(
+            self.__class__.__name__, hex(id(self)))
+
+    @property
+    def graph(self):
+        """
+        Returns:
+            NodeGraphQt.NodeGraph: node graph.
+        """
+        return self._graph
+
+    @property
+    def cache(self):
+        """
+        Returns:
+            NodeGraphQt.base.cache.ResultCache: node output values cache.
+        """
+        return self._cache
+
+    @property
+    def disk_cache(self):
+        """
+        Returns:
+            NodeGraphQt.base.disk_cache.DiskCache: persistent node output
+                values cache (``None`` if not set).
+        """
+        return self._disk_cache
+
+    def set_disk_cache(self, disk_cache=None):
+        """
+        Set the persistent cache the computed node output values are
+        stored in and loaded from.
+
+        Args:
+            disk_cache (NodeGraphQt.base.disk_cache.DiskCache): disk cache
+                (``None`` to disable).
+        """
+        self._disk_cache = disk_cache
+
+    @staticmethod
+    def upstream_ids(node):
+        """
+        Returns the ids of the nodes connected to the node input ports.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+
+        Returns:
+            list[str]: node ids.
+        """
+        node_ids = []
+        for _, port in GraphEvaluator.input_ports(node):
+            # disconnected ports leave an empty list under the node id.
+            node_ids.extend(node_id for node_id, port_names in
+                            port.connected_ports.items() if port_names)
+        return node_ids
+
+    @staticmethod
+    def input_ports(node):
+        """
+        Returns the input ports the node output values depend on, all the
+        input ports or only the passed through ports if it's disabled.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+
+        Returns:
+            list[tuple]: (<input_port_name>, <PortModel>)
+        """
+        inputs = node.model.inputs
+        if not node.model.disabled:
+            return inputs.items()
+        names = set(GraphEvaluator.passthrough_inputs(node).values())
+        return [(name, port) for name, port in inputs.items()
+                if name in names]
+
+    @staticmethod
+    def passthrough_inputs(node):
+        """
+        Returns the input port passed through to each output port when the
+        node is disabled, the output ports are paired with the input port
+        at the same index (or the last input port).
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+
+        Returns:
+            dict: {<output_port_name>: <input_port_name>}
+        """
+        inputs = list(node.model.inputs.keys())
+        if not inputs:
+            return {}
+        return {name: inputs[min(i, len(inputs) - 1)]
+                for i, name in enumerate(node.model.outputs.keys())}
+
+    @staticmethod
+    def _passthrough_links(node):
+        """
+        Args:
+            node (NodeGraphQt.NodeObject): disabled node.
+
+        Returns:
+            tuple: (<output_port_name>, <input_port_name>,
+                <multi_connection>) for each passed through output port.
+        """
+        inputs = node.model.inputs
+        return tuple((name, input_name, inputs[input_name].multi_connection)
+                     for name, input_name in
+                     GraphEvaluator.passthrough_inputs(node).items())
+
+    @staticmethod
+    def downstream_ids(node):
+        """
+        Returns the ids of the nodes connected to the node output ports.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+
+        Returns:
+            list[str]: node ids.
+        """
+        node_ids = []
+        for port in node.model.outputs.values():
+            node_ids.extend(node_id for node_id, port_names in
+                            port.connected_ports.items() if port_names)
+        return node_ids
+
+    def is_dirty(self, node):
+        """
+        Returns true if the node will be recomputed the next time it's
+        evaluated.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+
+        Returns:
+            bool: true if dirty.
+        """
+        return not self._is_clean(node.id)
+
+    def dirty_nodes(self):
+        """
+        Returns the nodes in the graph that will be recomputed the next time
+        they're evaluated.
+
+        Returns:
+            list[NodeGraphQt.NodeObject]: dirty nodes.
+        """
+        return [n for n in self._graph.model.nodes.values()
+                if self.is_dirty(n)]
+
+    def pin(self, node, pinned=True):
+        """
+        Pin the node output values in the cache so they're not evicted
+        (eg. the node the user is viewing).
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            pinned (bool): false to unpin the node.
+        """
+        self._cache.pin(node.id, pinned)
+
+    def _is_clean(self, node_id):
+        """
+        Args:
+            node_id (str): node id.
+
+        Returns:
+            bool: true if the node output values are cached and up to date.
+        """
+        if node_id in self._dirty:
+            return False
+        fingerprint = self._fingerprints.get(node_id)
+        return fingerprint is not None and \
+            self._has_result(node_id, fingerprint)
+
+    def _has_result(self, node_id, fingerprint):
+        """
+        Args:
+            node_id (str): node id.
+            fingerprint (str): node fingerprint.
+
+        Returns:
+            bool: true if the output values are in the memory or disk cache.
+        """
+        if (node_id, fingerprint) in self._cache:
+            return True
+        return self._disk_cache is not None and \
+            fingerprint in self._disk_cache
+
+    def mark_dirty(self, node):
+        """
+        Mark the node and all nodes downstream of it dirty.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+        """
+        nodes = self._graph.model.nodes
+        if node.id not in nodes or node.id in self._dirty:
+            return
+        self._dirty.add(node.id)
+        marked = [node.id]
+        # every downstream node of a dirty node is already dirty so the walk
+        # stops at the nodes that are already marked.
+        queue = [node]
+        while queue:
+            for node_id in self.downstream_ids(queue.pop()):
+                if node_id in self._dirty or node_id not in nodes:
+                    continue
+                self._dirty.add(node_id)
+                marked.append(node_id)
+                queue.append(nodes[node_id])
+        if self._runs:
+            self._cancel_runs(marked)
+
+    def invalidate(self, nodes=None):
+        """
+        Remove the cached output values of the nodes and their downstream
+        nodes so they're recomputed the next time they're evaluated.
+
+        Args:
+            nodes (list[NodeGraphQt.NodeObject]): nodes to invalidate
+                (all nodes in the graph if not specified).
+        """
+        if nodes is None:
+            self._cache.clear()
+            self._fingerprints.clear()
+            self._dirty.clear()
+            for run in list(self._runs):
+                self._cancel_run(run)
+            return
+        all_nodes = self._graph.model.nodes
+        queue = [n for n in nodes if n.id in all_nodes]
+        visited = set(n.id for n in queue)
+        while queue:
+            node = queue.pop()
+            self._cache.discard_node(node.id)
+            self._fingerprints.pop(node.id, None)
+            self._dirty.add(node.id)
+            for node_id in self.downstream_ids(node):
+                if node_id not in visited and node_id in all_nodes:
+                    visited.add(node_id)
+                    queue.append(all_nodes[node_id])
+        if self._runs:
+            self._cancel_runs(visited)
+
+    def schedule(self, targets=None, dirty_only=False):
+        """
+        Returns the evaluation order for the target nodes, the target nodes
+        and their upstream nodes sorted so every node comes after the nodes
+        connected to its inputs.
+
+        Args:
+            targets (list[NodeGraphQt.NodeObject]): nodes to evaluate
+                (all nodes in the graph if not specified).
+            dirty_only (bool): only schedule the dirty nodes.
+
+        Returns:
+            list[NodeGraphQt.NodeObject]: nodes in evaluation order.
+        """
+        nodes = self._graph.model.nodes
+        if targets is None:
+            targets = list(nodes.values())
+
+        # iterative depth first search so deep graphs don't hit the
+        # recursion limit. (1: visiting, 2: scheduled)
+        order = []
+        state = {}
+        # clean nodes are skipped along with their upstream nodes, checked
+        # as they're visited so only the upstream nodes are walked.
+        is_clean = self._is_clean if dirty_only else lambda node_id: False
+        for target in targets:
+            if state.get(target.id) == 2:
+                continue
+            if is_clean(target.id):
+                state[target.id] = 2
+                continue
+            state[target.id] = 1
+            stack = [(target, iter(self.upstream_ids(target)))]
+            while stack:
+                node, upstream = stack[-1]
+                for node_id in upstream:
+                    node_state = state.get(node_id)
+                    if node_state is None and is_clean(node_id):
+                        state[node_id] = node_state = 2
+                    if node_state == 2:
+                        continue
+                    if node_state == 1:
+                        raise NodeEvaluationError(
+                            'Can\'t evaluate cycle at node "{}".'
+                            .format(nodes[node_id].name()))
+                    state[node_id] = 1
+                    upstream_node = nodes[node_id]
+                    stack.append((upstream_node,
+                                  iter(self.upstream_ids(upstream_node))))
+                    break
+                else:
+                    stack.pop()
+                    state[node.id] = 2
+                    order.append(node)
+        return order
+
+    @staticmethod
+    def fingerprint(node, upstream):
+        """
+        Returns a fingerprint of the node type, properties and the
+        fingerprints of the upstream nodes connected to its inputs.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            upstream (dict): {<node_id>: <fingerprint>} of the upstream
+                nodes.
+
+        Returns:
+            str: fingerprint hex digest.
+        """
+        model = node.model
+        inputs = [(name, [(upstream[node_id], port_name)
+                          for node_id, port_names in
+                          port.connected_ports.items()
+                          for port_name in port_names])
+                  for name, port in GraphEvaluator.input_ports(node)]
+        state = (model.type_, model.disabled,
+                 sorted(model.custom_properties.items()), inputs)
+        try:
+            data = pickle.dumps(state, protocol=4)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            data = repr(state).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    @staticmethod
+    def gather_inputs(node, values):
+        """
+        Collect the input values of a node from the computed output values
+        of its upstream nodes.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            values (dict): {<node_id>: {<output_port_name>: <value>}}
+
+        Returns:
+            dict: {<input_port_name>: <value>}
+        """
+        inputs = {}
+        for name, port in GraphEvaluator.input_ports(node):
+            port_values = [values[node_id].get(port_name)
+                           for node_id, port_names in
+                           port.connected_ports.items()
+                           for port_name in port_names]
+            if port.multi_connection:
+                inputs[name] = port_values
+            else:
+                inputs[name] = port_values[0] if port_values else None
+        return inputs
+
+    @staticmethod
+    def compute_node(node, inputs):
+        """
+        Compute the node output values.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            inputs (dict): {<input_port_name>: <value>}
+
+        Returns:
+            dict: {<output_port_name>: <value>}
+        """
+        if node.model.disabled:
+            return GraphEvaluator.passthrough(node, inputs)
+        compute = getattr(node, 'compute', None)
+        if compute is None:
+            return {}
+        try:
+            outputs = compute(inputs)
+        except NodeEvaluationError:
+            raise
+        except Exception as e:
+            raise NodeEvaluationError(
+                'Failed to compute node "{}": {}'.format(node.name(), e)
+            ) from e
+        return GraphEvaluator._validate_outputs(node, outputs)
+
+    @staticmethod
+    def passthrough(node, inputs):
+        """
+        Returns the output values of a disabled node, the values of the
+        input ports paired by :meth:`GraphEvaluator.passthrough_inputs`
+        (the first value for multi connection ports).
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            inputs (dict): {<input_port_name>: <value>}
+
+        Returns:
+            dict: {<output_port_name>: <value>}
+        """
+        return _pass_through(
+            GraphEvaluator._passthrough_links(node), node, inputs)
+
+    @staticmethod
+    async def compute_node_async(node, inputs):
+        """
+        Compute the node output values with a coroutine
+        :meth:`NodeGraphQt.BaseNode.compute` function.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            inputs (dict): {<input_port_name>: <value>}
+
+        Returns:
+            dict: {<output_port_name>: <value>}
+        """
+        try:
+            outputs = await node.compute(inputs)
+        except NodeEvaluationError:
+            raise
+        except Exception as e:
+            raise NodeEvaluationError(
+                'Failed to compute node "{}": {}'.format(node.name(), e)
+            ) from e
+        return GraphEvaluator._validate_outputs(node, outputs)
+
+    @staticmethod
+    def _validate_outputs(node, outputs):
+        """
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            outputs (dict): value returned by the node compute function.
+
+        Returns:
+            dict: {<output_port_name>: <value>}
+        """
+        if outputs is None:
+            return {}
+        if not isinstance(outputs, dict):
+            raise NodeEvaluationError(
+                'Node "{}" compute() must return a dict not "{}".'
+                .format(node.name(), type(outputs).__name__))
+        return outputs
+
+    @property
+    def timeout(self):
+        """
+        Returns:
+            float: default node compute timeout in seconds
+                (``None`` = no timeout).
+        """
+        return self._timeout
+
+    def set_timeout(self, timeout=None):
+        """
+        Set the default node compute timeout, nodes can override it with
+        the :attr:`NodeGraphQt.BaseNode.COMPUTE_TIMEOUT` attribute.
+
+        Args:
+            timeout (float): timeout in seconds (``None`` = no timeout).
+        """
+        self._timeout = timeout
+
+    def node_timeout(self, node):
+        """
+        Returns the compute timeout for the node.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+
+        Returns:
+            float: timeout in seconds (``None`` = no timeout).
+        """
+        timeout = getattr(node, 'COMPUTE_TIMEOUT', None)
+        return self._timeout if timeout is None else timeout
+
+    def is_async(self, node):
+        """
+        Returns true if the node is computed on the evaluator event loop,
+        nodes with a coroutine compute function or a compute timeout.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+
+        Returns:
+            bool: true if computed on the event loop.
+        """
+        if node.model.disabled:
+            return False
+        compute = getattr(node, 'compute', None)
+        return (asyncio.iscoroutinefunction(compute) or
+                self.node_timeout(node) is not None)
+
+    async def _compute_on_loop(self, node, inputs, executor, timeout):
+        """
+        Compute a node on the event loop, synchronous compute functions are
+        run on the thread pool so they don't block the other nodes.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node.
+            inputs (dict): {<input_port_name>: <value>}
+            executor (concurrent.futures.Executor): thread pool.
+            timeout (float): timeout in seconds (``None`` = no timeout).
+
+        Returns:
+            dict: {<output_port_name>: <value>}
+        """
+        if asyncio.iscoroutinefunction(getattr(node, 'compute', None)):
+            compute = self.compute_node_async(node, inputs)
+        else:
+            compute = asyncio.get_running_loop().run_in_executor(
+                executor, self.compute_node, node, inputs)
+        try:
+            return await asyncio.wait_for(compute, timeout)
+        except asyncio.TimeoutError:
+            raise NodeEvaluationError(
+                'Node "{}" compute() timed out after {}s.'
+                .format(node.name(), timeout)) from None
+
+    def compile(self, outputs):
+        """
+        Compile the nodes needed to compute the outputs into an
+        :class:`NodeGraphQt.base.plan.ExecutionPlan`.
+
+        The plan computes the nodes with the node class compute functions
+        and a snapshot of the node properties, it doesn't use the caches
+        and isn't updated when the graph is edited.
+
+        Args:
+            outputs (list): output ports (:class:`NodeGraphQt.Port`) or
+                nodes (all the node output ports) to compute.
+
+        Returns:
+            NodeGraphQt.base.plan.ExecutionPlan: execution plan.
+        """
+        output_keys = []
+        targets = {}
+        for item in outputs:
+            if isinstance(item, Port):
+                if item.type_() != PortTypeEnum.OUT.value:
+                    raise NodeEvaluationError(
+                        'Can\'t compile input port "{}", only output ports '
+                        'have values.'.format(item.name()))
+                node = item.node()
+                output_keys.append((node.id, item.name()))
+            else:
+                node = item
+                output_keys.extend((node.id, name)
+                                   for name in node.model.outputs.keys())
+            targets[node.id] = node
+        order = self.schedule(list(targets.values()))
+
+        slots = {}
+        for node in order:
+            for name in node.model.outputs.keys():
+                slots[(node.id, name)] = len(slots)
+
+        steps = []
+        states = []
+        for node in order:
+            compute = getattr(node.__class__, 'compute', None) or _no_compute
+            if node.model.disabled:
+                compute = functools.partial(
+                    _pass_through, self._passthrough_links(node))
+            elif asyncio.iscoroutinefunction(compute):
+                raise NodeEvaluationError(
+                    'Can\'t compile node "{}" with an async compute '
+                    'function.'.format(node.name()))
+            inputs = []
+            for name, port in self.input_ports(node):
+                port_slots = tuple(slots[(node_id, port_name)]
+                                   for node_id, port_names in
+                                   port.connected_ports.items()
+                                   for port_name in port_names)
+                if port.multi_connection:
+                    inputs.append((name, port_slots))
+                else:
+                    inputs.append((name, port_slots[0] if port_slots else -1))
+            outputs = tuple((name, slots[(node.id, name)])
+                            for name in node.model.outputs.keys())
+            steps.append((compute, tuple(inputs), outputs))
+
+            properties = node.model.properties
+            properties.pop('inputs', None)
+            properties.pop('outputs', None)
+            properties.update(node.model.custom_properties)
+            states.append(PlanNode(
+                node.id, node.name(), node.type_, properties,
+                vectorized=getattr(node, 'VECTORIZED', False)))
+
+        return ExecutionPlan(
+            tuple(steps), tuple(states), len(slots), tuple(output_keys),
+            tuple(slots[key] for key in output_keys))
+
+    @property
+    def max_workers(self):
+        """
+        Returns:
+            int: number of worker threads the nodes are computed on
+                (0 = computed on the calling thread).
+        """
+        return self._max_workers
+
+    def set_max_workers(self, workers=0):
+        """
+        Set the number of worker threads the nodes are computed on.
+
+        Args:
+            workers (int): number of worker threads
+                (0 = computed on the calling thread).
+        """
+        workers = max(int(workers), 0)
+        if workers == self._max_workers:
+            return
+        self._max_workers = workers
+        self.shutdown()
+
+    def executor(self):
+        """
+        Returns the thread pool the nodes are computed on, the pool is
+        created on first use.
+
+        Returns:
+            concurrent.futures.ThreadPoolExecutor: thread pool.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers or 1,
+                thread_name_prefix='NodeGraphEvaluator')
+        return self._executor
+
+    @property
+    def max_processes(self):
+        """
+        Returns:
+            int: number of worker processes the ``PROCESS_SAFE`` nodes are
+                computed in (0 = not computed in worker processes).
+        """
+        return self._max_processes
+
+    def set_max_processes(self, processes=0):
+        """
+        Set the number of worker processes the nodes flagged as
+        ``PROCESS_SAFE`` are computed in.
+
+        Args:
+            processes (int): number of worker processes
+                (0 = not computed in worker processes).
+        """
+        processes = max(int(processes), 0)
+        if processes == self._max_processes:
+            return
+        self._max_processes = processes
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+
+    def process_pool(self):
+        """
+        Returns the process pool the ``PROCESS_SAFE`` nodes are computed in,
+        the pool is created on first use.
+
+        Returns:
+            concurrent.futures.ProcessPoolExecutor: process pool.
+        """
+        if self._process_pool is None:
+            self._process_pool = create_process_pool(
+                self._max_processes or 1)
+        return self._process_pool
+
+    def shutdown(self, wait=False):
+        """
+        Shutdown the thread pool, process pool and event loop thread (new
+        ones are created when needed).
+
+        Args:
+            wait (bool): wait for the running computations to finish.
+        """
+        self._event_loop.stop(wait=wait)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
+
+    def _plan(self, targets):
+        """
+        Create the evaluation run for the target nodes, the scheduled nodes
+        are fingerprinted and their cached output values are looked up so
+        only the cache misses are left to compute.
+
+        Args:
+            targets (list[NodeGraphQt.NodeObject]): nodes to evaluate.
+
+        Returns:
+            _EvaluationRun: evaluation run.
+        """
+        run = _EvaluationRun(targets)
+        cache = self._cache
+        fingerprints = self._fingerprints
+        upstream_fingerprints = ChainMap(run.fingerprints, fingerprints)
+        for node in self.schedule(targets, dirty_only=True):
+            fingerprint = self.fingerprint(node, upstream_fingerprints)
+            self._dirty.discard(node.id)
+            if self._lookup(node.id, fingerprint):
+                fingerprints[node.id] = fingerprint
+                continue
+            # the node is clean again once its computed values are cached.
+            fingerprints.pop(node.id, None)
+            run.add_pending(node, fingerprint, self.upstream_ids(node))
+
+        # hold the cached values needed by this evaluation so they can't
+        # be evicted by the values computed in it.
+        values = run.values
+        loaded = []
+        missing = []
+        for node_id in run.target_ids.union(run.consumers):
+            if node_id in run.fingerprints:
+                continue
+            key = (node_id, fingerprints[node_id])
+            outputs = cache.peek(key)
+            if outputs is None and self._disk_cache is not None:
+                outputs = self._disk_cache.get(key[1])
+                loaded.append((key, outputs))
+            if outputs is None:
+                missing.append(node_id)
+            values[node_id] = outputs
+        if missing:
+            # entries removed from the disk cache by another process.
+            for node_id in missing:
+                fingerprints.pop(node_id, None)
+            return self._plan(targets)
+        for key, outputs in loaded:
+            cache.put(key, outputs)
+        return run
+
+    def _lookup(self, node_id, fingerprint):
+        """
+        Look up the node output values in the memory and disk caches and
+        count the cache hit or miss (the disk cache values are loaded when
+        they're needed).
+
+        Args:
+            node_id (str): node id.
+            fingerprint (str): node fingerprint.
+
+        Returns:
+            bool: true if the output values are cached.
+        """
+        if self._cache.get((node_id, fingerprint)) is not None:
+            return True
+        if self._disk_cache is None:
+            return False
+        if fingerprint in self._disk_cache:
+            return True
+        # counts the disk cache miss.
+        self._disk_cache.get(fingerprint)
+        return False
+
+    def _complete(self, run, node, outputs):
+        """
+        Store the computed output values of a node in the evaluation run.
+
+        Args:
+            run (_EvaluationRun): evaluation run.
+            node (NodeGraphQt.NodeObject): computed node.
+            outputs (dict): {<output_port_name>: <value>}
+
+        Returns:
+            list[NodeGraphQt.NodeObject]: nodes ready to be computed.
+        """
+        outputs = load_outputs(outputs)
+        fingerprint = run.fingerprints[node.id]
+        if node.id in self._graph.model.nodes:
+            self._cache.put((node.id, fingerprint), outputs)
+            if self._disk_cache is not None:
+                self._disk_cache.put(fingerprint, outputs)
+            # nodes edited while they were computed stay dirty.
+            if node.id not in self._dirty:
+                self._fingerprints[node.id] = fingerprint
+        ready = run.complete(node, outputs)
+        self._graph.emit_graph_signal('node_evaluated', node, outputs)
+        return ready
+
+    def _submit(self, run, node):
+        """
+        Submit a node to be computed on the event loop if it's async, in the
+        process pool if it's flagged as ``PROCESS_SAFE`` or on the thread
+        pool.
+
+        Args:
+            run (_EvaluationRun): evaluation run.
+            node (NodeGraphQt.NodeObject): node ready to be computed.
+
+        Returns:
+            concurrent.futures.Future: computation future.
+        """
+        inputs = self.gather_inputs(node, run.values)
+        if self.is_async(node):
+            return self._event_loop.submit(self._compute_on_loop(
+                node, inputs, self.executor(), self.node_timeout(node)))
+        if (self._max_processes and not node.model.disabled and
+                getattr(node, 'PROCESS_SAFE', False)):
+            return self.process_pool().submit(
+                compute_in_process, node.__class__,
+                node.model.to_dict[node.id], inputs)
+        return self.executor().submit(self.compute_node, node, inputs)
+
+    def evaluate(self, targets=None):
+        """
+        Evaluate the target nodes and their upstream nodes, only the dirty
+        nodes are computed and the cached output values are used for the
+        rest.
+
+        With :attr:`GraphEvaluator.max_workers` set the nodes are computed
+        on a thread pool as soon as their upstream nodes are computed so
+        independent branches are computed in parallel, the function blocks
+        until all nodes are computed.
+
+        With :attr:`GraphEvaluator.max_processes` set the nodes flagged as
+        ``PROCESS_SAFE`` are computed in worker processes.
+
+        Nodes with a coroutine compute function or a compute timeout are
+        computed concurrently on the evaluator asyncio event loop which
+        runs in its own thread.
+
+        Args:
+            targets (list[NodeGraphQt.NodeObject]): nodes to evaluate
+                (all nodes in the graph if not specified).
+
+        Returns:
+            dict: {<node_id>: {<output_port_name>: <value>}} for the target
+                nodes.
+        """
+        if targets is None:
+            targets = list(self._graph.model.nodes.values())
+        run = self._plan(targets)
+
+        serial = not (self._max_workers or self._max_processes or
+                      any(self.is_async(n) for n in run.pending))
+        if serial:
+            for node in run.pending:
+                outputs = self.compute_node(
+                    node, self.gather_inputs(node, run.values))
+                self._complete(run, node, outputs)
+            return run.results()
+
+        futures = {self._submit(run, node): node for node in run.ready()}
+        try:
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = futures.pop(future)
+                    outputs = future.result()
+                    for ready_node in self._complete(run, node, outputs):
+                        futures[self._submit(run, ready_node)] = ready_node
+        finally:
+            # the computations left after an error are cancelled and the
+            # shared memory of the ones already running is freed when done.
+            for future in futures:
+                future.cancel()
+                future.add_done_callback(release_future_outputs)
+        return run.results()
+
+    def resolve_port(self, port):
+        """
+        Returns the output port that provides the value of an output port,
+        disabled nodes are followed upstream through their passed through
+        input ports.
+
+        Args:
+            port (NodeGraphQt.Port): output port.
+
+        Returns:
+            tuple: (<NodeGraphQt.NodeObject>, <output_port_name>) or
+                ``None`` if the value comes from an unconnected input port.
+        """
+        if port.type_() != PortTypeEnum.OUT.value:
+            raise NodeEvaluationError(
+                'Can\'t evaluate input port "{}", only output ports have '
+                'values.'.format(port.name()))
+        nodes = self._graph.model.nodes
+        node, name = port.node(), port.name()
+        visited = set()
+        while node.model.disabled:
+            if node.id in visited:
+                raise NodeEvaluationError(
+                    'Can\'t evaluate cycle at node "{}".'.format(node.name()))
+            visited.add(node.id)
+            input_name = self.passthrough_inputs(node).get(name)
+            if input_name is None:
+                return
+            connected = [(node_id, port_name) for node_id, port_names in
+                         node.model.inputs[input_name].connected_ports.items()
+                         for port_name in port_names]
+            if not connected:
+                return
+            node_id, name = connected[0]
+            node = nodes[node_id]
+        return node, name
+
+    def evaluate_port(self, port):
+        """
+        Evaluate the value of a single output port, only the nodes upstream
+        of the port are evaluated and the up to date cached output values
+        are reused.
+
+        Args:
+            port (NodeGraphQt.Port): output port.
+
+        Returns:
+            object: output port value.
+        """
+        resolved = self.resolve_port(port)
+        if resolved is None:
+            return
+        node, name = resolved
+        return self.evaluate([node])[node.id].get(name)
+
+    def evaluate_async(self, targets=None):
+        """
+        Evaluate the target nodes on the thread pool without blocking.
+
+        The computed output values are passed back to the thread the
+        evaluator was created on (the Qt thread) with a queued signal where
+        the :attr:`NodeGraph.node_evaluated` signal is emitted for each
+        node and the :attr:`NodeGraph.evaluation_finished` signal once all
+        nodes are computed.
+
+        The evaluation is cancelled (and the future with it) if a node
+        that's being computed is edited, cancelling the future stops the
+        evaluation and cancels the running coroutine compute functions.
+
+        Note:
+            This requires a running Qt event loop.
+
+        Args:
+            targets (list[NodeGraphQt.NodeObject]): nodes to evaluate
+                (all nodes in the graph if not specified).
+
+        Returns:
+            concurrent.futures.Future: future for the
+                {<node_id>: {<output_port_name>: <value>}} output values of
+                the target nodes.
+        """
+        if targets is None:
+            targets = list(self._graph.model.nodes.values())
+        run = self._plan(targets)
+        run.future = Future()
+        run.future.add_done_callback(
+            lambda f: self._cancel_run(run) if f.cancelled() else None)
+        if not run.pending:
+            self._finish_async(run)
+            return run.future
+        self._runs.append(run)
+        for node in run.ready():
+            self._submit_async(run, node)
+        return run.future
+
+    def _submit_async(self, run, node):
+        future = self._submit(run, node)
+        run.futures[future] = node
+        future.add_done_callback(
+            lambda f: self._relay.computed.emit(run, node, f))
+
+    def _cancel_runs(self, node_ids):
+        """
+        Cancel the async evaluations computing any of the nodes.
+
+        Args:
+            node_ids (list[str]): ids of the edited nodes.
+        """
+        for run in list(self._runs):
+            if any(n_id in run.fingerprints and n_id not in run.computed
+                   for n_id in node_ids):
+                self._cancel_run(run)
+
+    def _cancel_run(self, run):
+        """
+        Cancel an async evaluation and its running node computations.
+
+        Args:
+            run (_EvaluationRun): evaluation run.
+        """
+        self._cancel_futures(run)
+        run.future.cancel()
+
+    def _cancel_futures(self, run):
+        """
+        Remove an async evaluation and cancel its running node
+        computations.
+
+        Args:
+            run (_EvaluationRun): evaluation run.
+        """
+        if run in self._runs:
+            self._runs.remove(run)
+        # the output values of the running computations won't be loaded so
+        # their shared memory is freed when they're done.
+        for future in run.futures:
+            future.cancel()
+            future.add_done_callback(release_future_outputs)
+        run.futures.clear()
+
+    def _on_async_computed(self, run, node, future):
+        run.futures.pop(future, None)
+        if run.future.done() or future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._cancel_futures(run)
+            run.future.set_exception(error)
+            return
+        for ready_node in self._complete(run, node, future.result()):
+            self._submit_async(run, ready_node)
+        if run.remaining == 0:
+            self._finish_async(run)
+
+    def _finish_async(self, run):
+        if run in self._runs:
+            self._runs.remove(run)
+        results = run.results()
+        run.future.set_result(results)
+        self._graph.emit_graph_signal('evaluation_finished', results)
+
+    def graph_changed(self, name, *args):
+        """
+        Track a change to the node graph, called by
+        :meth:`NodeGraph.emit_graph_signal` when the change is made (before
+        the signal is queued by an open :meth:`NodeGraph.transaction`) so
+        nodes evaluated inside a transaction are up to date.
+
+        Args:
+            name (str): graph signal name eg. ``"property_changed"``.
+            args: signal arguments.
+        """
+        handler = self._change_handlers.get(name)
+        if handler:
+            handler(*args)
+
+    def _on_node_created(self, node):
+        self._cache.discard_node(node.id)
+        self._fingerprints.pop(node.id, None)
+        self.mark_dirty(node)
+
+    def _on_nodes_deleted(self, node_ids):
+        for node_id in node_ids:
+            self._cache.discard_node(node_id)
+            self._cache.pin(node_id, False)
+            self._fingerprints.pop(node_id, None)
+            self._dirty.discard(node_id)
+
+    def _on_port_changed(self, in_port, out_port):
+        self.mark_dirty(in_port.node())
+
+    def _on_property_changed(self, node, name, value):
+        if name == 'disabled' or name in node.model.custom_properties:
+            self.mark_dirty(node)
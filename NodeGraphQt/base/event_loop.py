@@ -0,0 +1,87 @@
+#!/usr/bin/python
+import asyncio
+import threading
+
+
+class EventLoopThread(object):
+    """
+    Asyncio event loop running in a dedicated thread so coroutines can be
+    run alongside the Qt event loop without blocking it.
+
+    Args:
+        name (str): thread name.
+    """
+
+    def __init__(self, name='NodeGraphEventLoop'):
+        self._name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<{}("{}") object at {}>'.format(
+            self.__class__.__name__, self._name, hex(id(self)))
+
+    def is_running(self):
+        """
+        Returns:
+            bool: true if the event loop thread is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def loop(self):
+        """
+        Returns the event loop, the loop thread is started on first use.
+
+        Returns:
+            asyncio.AbstractEventLoop: event loop.
+        """
+        with self._lock:
+            if not self.is_running():
+                started = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._loop, started),
+                    name=self._name, daemon=True)
+                self._thread.start()
+                started.wait()
+            return self._loop
+
+    @staticmethod
+    def _run(loop, started):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the event loop.
+
+        Args:
+            coro (coroutine): coroutine.
+
+        Returns:
+            concurrent.futures.Future: future for the coroutine result,
+                cancelling it cancels the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop())
+
+    def stop(self, wait=False):
+        """
+        Stop the event loop thread (it's restarted when needed).
+
+        Args:
+            wait (bool): wait for the thread to exit.
+        """
+        with self._lock:
+            if not self.is_running():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            thread = self._thread
+            self._thread = None
+            self._loop = None
+        if wait:
+            thread.join()
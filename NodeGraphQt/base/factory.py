@@ -1,4 +1,5 @@
 #!/usr/bin/python
+from NodeGraphQt.base.headless import headless_nodes
 from NodeGraphQt.errors import NodeRegistrationError
 
 
@@ -42,12 +43,13 @@ class NodeFactory(object):
         """
         return self.__nodes
 
-    def create_node_instance(self, node_type=None):
+    def create_node_instance(self, node_type=None, headless=False):
         """
         create node object by the node type identifier or alias.
 
         Args:
             node_type (str): node type or optional alias name.
+            headless (bool): create the node without a graphics item.
 
         Returns:
             NodeGraphQt.NodeObject: new node object.
@@ -57,6 +59,9 @@ class NodeFactory(object):
 
         _NodeClass = self.__nodes.get(node_type)
         if _NodeClass:
+            if headless:
+                with headless_nodes():
+                    return _NodeClass()
             return _NodeClass()
 
     def register_node(self, node, alias=None):
@@ -1,5 +1,6 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
+import contextlib
 import copy
 import json
 import os
@@ -8,13 +9,18 @@ from pathlib import Path
 
 from Qt import QtCore, QtWidgets
 
-from NodeGraphQt.base.commands import (NodeAddedCmd, NodeMovedCmd,
-                                       NodesRemovedCmd, PortConnectedCmd)
+from NodeGraphQt.base.commands import (NodeAddedCmd, NodesMovedCmd,
+                                       NodesRemovedCmd, PortConnectedCmd,
+                                       PropertiesChangedCmd,
+                                       command_size, compact_command,
+                                       connect_node_views, is_rebuildable,
+                                       rebuild_node, snapshot_node)
 from NodeGraphQt.base.factory import NodeFactory
 from NodeGraphQt.base.menu import NodeGraphMenu, NodesMenu
 from NodeGraphQt.base.model import NodeGraphModel
 from NodeGraphQt.base.node import NodeObject
 from NodeGraphQt.base.port import Port
+from NodeGraphQt.base.transaction import SignalBatch
 from NodeGraphQt.constants import (MIME_TYPE, URI_SCHEME, URN_SCHEME,
                                    LayoutDirectionEnum, PipeLayoutEnum,
                                    PortTypeEnum, ViewerEnum)
@@ -55,6 +61,14 @@ class NodeGraph(QtCore.QObject):
     :parameters: :class:`NodeGraphQt.NodeObject`
     :emits: created node
     """
+    nodes_created = QtCore.Signal(list)
+    """
+    Signal triggered when nodes have been created in a
+    :meth:`NodeGraph.transaction`.
+
+    :parameters: list[:class:`NodeGraphQt.NodeObject`]
+    :emits: created nodes
+    """
     nodes_deleted = QtCore.Signal(list)
     """
     Signal triggered when nodes have been deleted from the node graph.
@@ -98,6 +112,32 @@ class NodeGraph(QtCore.QObject):
     :parameters: :class:`NodeGraphQt.Port`, :class:`NodeGraphQt.Port`
     :emits: input port, output port
     """
+    connections_changed = QtCore.Signal(list, list)
+    """
+    Signal triggered when ports have been connected and disconnected in a
+    :meth:`NodeGraph.transaction`.
+
+    :parameters: list[tuple[:class:`NodeGraphQt.Port`]],
+                 list[tuple[:class:`NodeGraphQt.Port`]]
+    :emits: disconnected (input port, output port) pairs,
+            connected (input port, output port) pairs
+    """
+    node_evaluated = QtCore.Signal(NodeObject, object)
+    """
+    Signal triggered when a node has been computed by
+    :meth:`NodeGraph.evaluate` or :meth:`NodeGraph.evaluate_async`.
+
+    :parameters: :class:`NodeGraphQt.NodeObject`, dict
+    :emits: computed node, output values
+    """
+    evaluation_finished = QtCore.Signal(object)
+    """
+    Signal triggered when a :meth:`NodeGraph.evaluate_async` evaluation has
+    finished.
+
+    :parameters: dict
+    :emits: output values of the target nodes
+    """
     property_changed = QtCore.Signal(NodeObject, str, object)
     """
     Signal is triggered when a property has changed on a node.
@@ -105,6 +145,14 @@ class NodeGraph(QtCore.QObject):
     :parameters: :class:`NodeGraphQt.BaseNode`, str, object
     :emits: triggered node, property name, property value
     """
+    properties_changed = QtCore.Signal(list, list)
+    """
+    Signal is triggered when properties have been changed on nodes in a
+    single batch.
+
+    :parameters: list[str], list[str]
+    :emits: node ids, property names
+    """
     data_dropped = QtCore.Signal(QtCore.QMimeData, QtCore.QPoint)
     """
     Signal is triggered when data has been dropped to the graph.
@@ -145,38 +193,40 @@ class NodeGraph(QtCore.QObject):
         self._undo_stack = (
             kwargs.get('undo_stack') or QtWidgets.QUndoStack(self)
         )
+        self._undo_compact_threshold = 0
+        self._undo_sizes = []
+        self._undo_spilled = []
+        self._undo_index = self._undo_stack.index()
+        self._signal_batch = None
+        self._flushing_signals = False
+        self._merge_edits = 0
+        self._name_cache = None
+        self._evaluator = None
         self._widget = None
         self._sub_graphs = {}
-        self._viewer = (
-            kwargs.get('viewer') or NodeViewer(undo_stack=self._undo_stack)
-        )
+        self._context_menu = {}
+
+        # headless node graphs don't create a viewer until one is attached.
+        self._viewer = None
+        if not kwargs.get('headless'):
+            self._viewer = (
+                kwargs.get('viewer') or NodeViewer(undo_stack=self._undo_stack)
+            )
 
         layout_direction = kwargs.get('layout_direction')
         if layout_direction:
             if layout_direction not in [e.value for e in LayoutDirectionEnum]:
                 layout_direction = LayoutDirectionEnum.HORIZONTAL.value
             self._model.layout_direction = layout_direction
-        else:
-            layout_direction = self._model.layout_direction
-        self._viewer.set_layout_direction(layout_direction)
 
         pipe_style = kwargs.get('pipe_style')
         if pipe_style is not None:
             if pipe_style not in [e.value for e in PipeLayoutEnum]:
                 pipe_style = PipeLayoutEnum.CURVED.value
             self._model.pipe_style = pipe_style
-        else:
-            pipe_style = self._model.pipe_style
-        self._viewer.set_pipe_layout(pipe_style)
 
-        # viewer needs a reference to the model port connection constrains
-        # for the user interaction with the live pipe.
-        self._viewer.accept_connection_types = self._model.accept_connection_types
-        self._viewer.reject_connection_types = self._model.reject_connection_types
-
-        self._context_menu = {}
-
-        self._register_context_menu()
+        if self._viewer:
+            self._setup_viewer()
         self._register_builtin_nodes()
         self._wire_signals()
 
@@ -187,8 +237,9 @@ class NodeGraph(QtCore.QObject):
     def _register_context_menu(self):
         """
         Register the default context menus.
+        (called the first time a context menu is requested)
         """
-        if not self._viewer:
+        if not self._viewer or self._context_menu:
             return
         menus = self._viewer.context_menus()
         if menus.get('graph'):
@@ -202,12 +253,41 @@ class NodeGraph(QtCore.QObject):
         """
         self.register_node(BackdropNode, alias='Backdrop')
 
+    def _setup_viewer(self):
+        """
+        Set up the viewer from the graph model, register the default context
+        menus and connect up the viewer signals.
+        """
+        self._viewer.set_layout_direction(self._model.layout_direction)
+        self._viewer.set_pipe_layout(self._model.pipe_style)
+        self._viewer.acyclic = self._model.acyclic
+        self._viewer.pipe_collision = self._model.pipe_collision
+        self._viewer.pipe_slicing = self._model.pipe_slicing
+        self._viewer.port_snap_radius = self._model.port_snap_radius
+        scene = self._viewer.scene()
+        scene.background_color = self._model.background_color
+        scene.grid_color = self._model.grid_color
+        scene.grid_mode = self._model.grid_mode
+
+        # viewer needs a reference to the model port connection constrains
+        # for the user interaction with the live pipe.
+        self._viewer.accept_connection_types = self._model.accept_connection_types
+        self._viewer.reject_connection_types = self._model.reject_connection_types
+
+        self._wire_viewer_signals()
+
     def _wire_signals(self):
         """
         Connect up all the signals and slots here.
         """
 
         # internal signals.
+        self._undo_stack.indexChanged.connect(self._on_undo_index_changed)
+
+    def _wire_viewer_signals(self):
+        """
+        Connect up the viewer signals and slots.
+        """
         self._viewer.search_triggered.connect(self._on_search_triggered)
         self._viewer.connection_sliced.connect(self._on_connection_sliced)
         self._viewer.connection_changed.connect(self._on_connection_changed)
@@ -225,6 +305,65 @@ class NodeGraph(QtCore.QObject):
         self._viewer.data_dropped.connect(self._on_node_data_dropped)
         self._viewer.context_menu_prompt.connect(self._on_context_menu_prompt)
 
+    def _on_undo_index_changed(self, index):
+        """
+        Slot function triggered when the undo stack index changes to keep
+        track of the estimated memory footprint of the commands.
+
+        Args:
+            index (int): undo stack index.
+        """
+        stack = self._undo_stack
+        count = stack.count()
+        prev_index = self._undo_index
+        self._undo_index = index
+
+        # commands that were undone, redone or pushed (or merged with the
+        # top command when the index didn't change).
+        if index == prev_index:
+            changed = range(max(index - 1, 0), index)
+        else:
+            changed = range(min(index, prev_index), max(index, prev_index))
+
+        sizes = self._undo_sizes
+        spilled = self._undo_spilled
+        del sizes[count:]
+        del spilled[count:]
+        # undone and redone commands are restored from their compact form.
+        for idx in changed:
+            if idx < len(sizes):
+                sizes[idx] = command_size(stack.command(idx))
+                spilled[idx] = False
+        while len(sizes) < count:
+            sizes.append(command_size(stack.command(len(sizes))))
+            spilled.append(False)
+        self._compact_undo_stack()
+
+    def _compact_undo_stack(self):
+        """
+        Spill the oldest commands (including the undone commands) to their
+        compact form until the estimated undo stack size is under the
+        compaction threshold or there's nothing left to compact.
+        """
+        if not self._undo_compact_threshold:
+            return
+        sizes = self._undo_sizes
+        total = sum(sizes)
+        # QUndoStack can't drop individual commands so old commands are
+        # compacted instead of being evicted.
+        stack = self._undo_stack
+        for idx, spilled in enumerate(self._undo_spilled):
+            if total <= self._undo_compact_threshold:
+                break
+            if spilled:
+                continue
+            command = stack.command(idx)
+            compact_command(command)
+            size = command_size(command)
+            total += size - sizes[idx]
+            sizes[idx] = size
+            self._undo_spilled[idx] = True
+
     def _on_context_menu_prompt(self, menu_name, node_id):
         """
         Slot function triggered just before a context menu is shown.
@@ -283,7 +422,8 @@ class NodeGraph(QtCore.QObject):
 
         # prevent signals from causing a infinite loop.
         if node.get_property(prop_name) != prop_value:
-            node.set_property(prop_name, prop_value)
+            with self.merge_property_edits():
+                node.set_property(prop_name, prop_value)
 
     def _on_node_name_changed(self, node_id, name):
         """
@@ -398,11 +538,15 @@ class NodeGraph(QtCore.QObject):
         Args:
             node_data (dict): {<node_view>: <previous_pos>}
         """
-        self._undo_stack.beginMacro('move nodes')
+        nodes, positions, prev_positions = [], [], []
         for node_view, prev_pos in node_data.items():
             node = self._model.nodes[node_view.id]
-            self._undo_stack.push(NodeMovedCmd(node, node.pos(), prev_pos))
-        self._undo_stack.endMacro()
+            nodes.append(node)
+            positions.append(node.pos())
+            prev_positions.append(prev_pos)
+        self._undo_stack.push(
+            NodesMovedCmd(nodes, positions, prev_positions)
+        )
 
     def _on_node_backdrop_updated(self, node_id, update_property, value):
         """
@@ -508,6 +652,7 @@ class NodeGraph(QtCore.QObject):
             NodeGraphWidget: node graph widget.
         """
         if self._widget is None:
+            self.attach_viewer()
             self._widget = NodeGraphWidget()
             self._widget.addTab(self._viewer, 'Node Graph')
             # hide the close button on the first tab.
@@ -546,7 +691,7 @@ class NodeGraph(QtCore.QObject):
         Returns:
             tuple(float, float): cursor x,y coordinates of the scene.
         """
-        cursor_pos = self.viewer().scene_cursor_pos()
+        cursor_pos = self._viewer and self._viewer.scene_cursor_pos()
         if not cursor_pos:
             return 0.0, 0.0
         return cursor_pos.x(), cursor_pos.y()
@@ -555,7 +700,7 @@ class NodeGraph(QtCore.QObject):
         """
         toggle the node search widget visibility.
         """
-        if self._viewer.underMouse():
+        if self._viewer and self._viewer.underMouse():
             self._viewer.tab_search_set_nodes(self._node_factory.names)
             self._viewer.tab_search_toggle()
 
@@ -598,7 +743,61 @@ class NodeGraph(QtCore.QObject):
         Returns:
             NodeGraphQt.widgets.scene.NodeScene: node scene.
         """
-        return self._viewer.scene()
+        if self._viewer:
+            return self._viewer.scene()
+
+    def is_headless(self):
+        """
+        Returns true if the node graph doesn't have a viewer.
+
+        A headless node graph is created with ``NodeGraph(headless=True)``
+        the nodes are created without their graphics items or embedded
+        widgets so sessions can be loaded, edited and saved without a
+        ``QApplication``.
+
+        See Also:
+            :meth:`NodeGraph.attach_viewer`
+
+        Returns:
+            bool: true if headless.
+        """
+        return self._viewer is None
+
+    def attach_viewer(self, viewer=None):
+        """
+        Attach a viewer to a headless node graph, the nodes in the graph
+        are re-created with their graphics items and widgets.
+        (called when the :attr:`NodeGraph.widget` is first accessed)
+
+        Note:
+            The node and port objects (and any attributes set on them) are
+            kept, only their items are created through the node factory so a
+            ``QApplication`` is required.
+
+        Args:
+            viewer (NodeGraphQt.widgets.viewer.NodeViewer): viewer to attach
+                (a new viewer is created if not specified).
+
+        Returns:
+            NodeGraphQt.widgets.viewer.NodeViewer: the node graph viewer.
+        """
+        if self._viewer:
+            return self._viewer
+        self._viewer = viewer or NodeViewer(undo_stack=self._undo_stack)
+        self._setup_viewer()
+        self._viewer.rebuild_tab_search()
+
+        nodes = []
+        for node in self.all_nodes():
+            if not is_rebuildable(self, node):
+                continue
+            rebuild_node(self, node, snapshot_node(node))
+            self._viewer.add_node(node.view, node.model.pos)
+            node.model.width = node.view.width
+            node.model.height = node.view.height
+            nodes.append(node)
+        connect_node_views(self, nodes)
+        return self._viewer
 
     def background_color(self):
         """
@@ -607,7 +806,7 @@ class NodeGraph(QtCore.QObject):
         Returns:
             tuple: r, g ,b
         """
-        return self.scene().background_color
+        return self._model.background_color
 
     def set_background_color(self, r, g, b):
         """
@@ -618,8 +817,10 @@ class NodeGraph(QtCore.QObject):
             g (int): green value.
             b (int): blue value.
         """
-        self.scene().background_color = (r, g, b)
-        self._viewer.force_update()
+        self._model.background_color = (r, g, b)
+        if self._viewer:
+            self.scene().background_color = self._model.background_color
+            self._viewer.force_update()
 
     def grid_color(self):
         """
@@ -628,7 +829,7 @@ class NodeGraph(QtCore.QObject):
         Returns:
             tuple: r, g ,b
         """
-        return self.scene().grid_color
+        return self._model.grid_color
 
     def set_grid_color(self, r, g, b):
         """
@@ -639,8 +840,10 @@ class NodeGraph(QtCore.QObject):
             g (int): green value.
             b (int): blue value.
         """
-        self.scene().grid_color = (r, g, b)
-        self._viewer.force_update()
+        self._model.grid_color = (r, g, b)
+        if self._viewer:
+            self.scene().grid_color = self._model.grid_color
+            self._viewer.force_update()
 
     def set_grid_mode(self, mode=None):
         """
@@ -666,8 +869,10 @@ class NodeGraph(QtCore.QObject):
         ]
         if mode not in display_types:
             mode = ViewerEnum.GRID_DISPLAY_LINES.value
-        self.scene().grid_mode = mode
-        self._viewer.force_update()
+        self._model.grid_mode = mode
+        if self._viewer:
+            self.scene().grid_mode = mode
+            self._viewer.force_update()
 
     def add_properties_bin(self, prop_bin):
         """
@@ -706,6 +911,53 @@ class NodeGraph(QtCore.QObject):
         """
         self._undo_stack.clear()
 
+    def undo_compact_threshold(self):
+        """
+        Returns the undo stack size above which the undo commands are
+        compacted.
+
+        See Also:
+            :meth:`NodeGraph.set_undo_compact_threshold`,
+            :meth:`NodeGraph.undo_stack_size`
+
+        Returns:
+            int: size in bytes (0 = never compact).
+        """
+        return self._undo_compact_threshold
+
+    def set_undo_compact_threshold(self, size=0):
+        """
+        Set the estimated undo stack size in bytes above which the undo
+        commands are compacted.
+
+        Once the undo commands exceed the threshold the oldest commands are
+        spilled to their compact form: property values are serialized and
+        the node items of deleted (or undone) nodes without embedded
+        widgets are released and re-created through the node factory when
+        they're restored.
+
+        Note:
+            Compaction is best effort and not a memory limit, commands are
+            never dropped (``QUndoStack`` can't evict individual commands)
+            so the undo stack can stay above the threshold, use
+            ``undo_stack().setUndoLimit()`` on an empty stack to limit the
+            number of commands.
+
+        Args:
+            size (int): size in bytes (0 = never compact).
+        """
+        self._undo_compact_threshold = max(int(size), 0)
+        self._compact_undo_stack()
+
+    def undo_stack_size(self):
+        """
+        Returns the estimated memory footprint of the undo stack commands.
+
+        Returns:
+            int: size in bytes.
+        """
+        return sum(self._undo_sizes)
+
     def begin_undo(self, name):
         """
         Start of an undo block followed by a
@@ -723,6 +975,524 @@ class NodeGraph(QtCore.QObject):
         """
         self._undo_stack.endMacro()
 
+    @contextlib.contextmanager
+    def transaction(self, name='graph transaction'):
+        """
+        Context manager that groups graph edits into a single undo block and
+        batches the graph signals emitted until the block is closed.
+
+        While the transaction is open the :attr:`NodeGraph.node_created`,
+        :attr:`NodeGraph.nodes_deleted`, :attr:`NodeGraph.port_connected`,
+        :attr:`NodeGraph.port_disconnected`,
+        :attr:`NodeGraph.property_changed` and
+        :attr:`NodeGraph.properties_changed` signals are queued and emitted
+        on exit with the net changes: the per item
+        :attr:`NodeGraph.node_created`, :attr:`NodeGraph.port_disconnected`,
+        :attr:`NodeGraph.port_connected` and
+        :attr:`NodeGraph.property_changed` signals (with the current
+        property values) are emitted once per item before the batched
+        :attr:`NodeGraph.nodes_deleted`, :attr:`NodeGraph.nodes_created`,
+        :attr:`NodeGraph.connections_changed` and
+        :attr:`NodeGraph.properties_changed` signals
+        (see :meth:`NodeGraph.is_flushing_signals`).
+
+        .. code-block:: python
+            :linenos:
+
+            with graph.transaction('build nodes'):
+                for i in range(1000):
+                    graph.create_node('nodes.basic.BasicNodeA')
+
+        If an exception is raised in the outer most transaction the undo
+        block is closed and the edits made before the exception are undone
+        and removed from the undo stack, the exception is then re-raised.
+
+        Note:
+            Transactions can be nested, the signals are only emitted and
+            the edits are only undone on an exception when the outer most
+            transaction is closed.
+
+        Args:
+            name (str): name for the undo block.
+        """
+        batch = self._signal_batch
+        if batch is None:
+            batch = self._signal_batch = SignalBatch()
+        batch.depth += 1
+        stack = self._undo_stack
+        index = stack.index()
+        stack.beginMacro(name)
+        try:
+            yield self
+        except Exception:
+            stack.endMacro()
+            # the stack drops the undo block if it's obsolete once undone.
+            if batch.depth == 1 and stack.index() > index:
+                command = stack.command(stack.index() - 1)
+                command.undo()
+                command.setObsolete(True)
+                stack.undo()
+            raise
+        else:
+            stack.endMacro()
+        finally:
+            batch.depth -= 1
+            if batch.depth == 0:
+                self._signal_batch = None
+                self._flushing_signals = True
+                try:
+                    batch.flush(self)
+                finally:
+                    self._flushing_signals = False
+
+    @contextlib.contextmanager
+    def suspend_updates(self):
+        """
+        Context manager that suspends the viewer updates while building or
+        editing the graph from code.
+
+        While suspended the viewport isn't repainted, the scene doesn't
+        index its items and the node and pipe items are not re-drawn, the
+        touched items are laid out in a single pass on exit.
+
+        .. code-block:: python
+            :linenos:
+
+            with graph.suspend_updates():
+                for i in range(10000):
+                    graph.create_node('nodes.basic.BasicNodeA')
+
+        Note:
+            Node sizes are only calculated when the updates are resumed and
+            the unique node names are looked up from a cache.
+        """
+        outer = self._name_cache is None
+        if outer:
+            self._name_cache = (set(n.name() for n in self.all_nodes()), {})
+        viewer = self._viewer
+        if viewer:
+            viewer.suspend_updates()
+        try:
+            yield self
+        finally:
+            if outer:
+                self._name_cache = None
+            for node_view in (viewer.resume_updates() if viewer else []):
+                node = self._model.nodes.get(node_view.id)
+                if node and node.view is node_view:
+                    node.model.width = node_view.width
+                    node.model.height = node_view.height
+
+    @contextlib.contextmanager
+    def merge_property_edits(self):
+        """
+        Context manager for interactive property edits from a widget (eg.
+        dragging a slider).
+
+        Consecutive changes to the same node property made within
+        :attr:`PropertyChangedCmd.MERGE_INTERVAL` while the context is open
+        are merged into a single undo command, property changes made outside
+        of it are always registered as separate undo commands.
+
+        .. code-block:: python
+            :linenos:
+
+            def on_slider_moved(value):
+                with graph.merge_property_edits():
+                    node.set_property('my_property', value)
+        """
+        self._merge_edits += 1
+        try:
+            yield self
+        finally:
+            self._merge_edits -= 1
+
+    def is_merging_property_edits(self):
+        """
+        Returns true if a :meth:`NodeGraph.merge_property_edits` context is
+        open.
+
+        Returns:
+            bool: true if property edits are merged.
+        """
+        return self._merge_edits > 0
+
+    def in_transaction(self):
+        """
+        Returns true if a :meth:`NodeGraph.transaction` is open.
+
+        Returns:
+            bool: true if in a transaction.
+        """
+        return self._signal_batch is not None
+
+    def is_flushing_signals(self):
+        """
+        Returns true while the signals queued by a
+        :meth:`NodeGraph.transaction` are emitted.
+
+        The per item signals are emitted before the batched signals so
+        listeners connected to both can skip the per item signals while the
+        queued signals are flushed.
+
+        Returns:
+            bool: true if the queued signals are being emitted.
+        """
+        return self._flushing_signals
+
+    def emit_graph_signal(self, name, *args):
+        """
+        Emit a node graph signal or queue it if a
+        :meth:`NodeGraph.transaction` is open.
+
+        Args:
+            name (str): signal name eg. ``"node_created"``.
+            args: signal arguments.
+        """
+        # the evaluator tracks the change as it's made even if the signal is
+        # queued so nodes evaluated inside a transaction are up to date.
+        if self._evaluator is not None:
+            self._evaluator.graph_changed(name, *args)
+        batch = self._signal_batch
+        if batch is not None and batch.queue(name, args):
+            return
+        getattr(self, name).emit(*args)
+
+    def evaluator(self):
+        """
+        Returns the dataflow evaluation engine used to evaluate the nodes,
+        it's created the first time the graph is evaluated.
+
+        See Also:
+            :meth:`NodeGraph.evaluate`,
+            :meth:`NodeGraphQt.base.evaluation.GraphEvaluator.invalidate`
+
+        Returns:
+            NodeGraphQt.base.evaluation.GraphEvaluator: evaluation engine.
+        """
+        if self._evaluator is None:
+            # imported here so the evaluation event loop, thread and process
+            # pools are only loaded by graphs that are evaluated.
+            from NodeGraphQt.base.evaluation import GraphEvaluator
+            self._evaluator = GraphEvaluator(self)
+        return self._evaluator
+
+    def evaluate(self, targets=None):
+        """
+        Evaluate the target nodes, the nodes are computed in the order of
+        their port connections with :meth:`NodeGraphQt.BaseNode.compute`
+        and the output values are passed along the connections.
+
+        Only the target nodes and their upstream nodes are computed and the
+        output values are reused until a node is marked dirty by a property
+        change or a port connection change upstream of it.
+
+        Disabled nodes aren't computed, the values of their input ports are
+        passed through to the output ports at the same index (or the last
+        input port).
+
+        .. code-block:: python
+            :linenos:
+
+            results = graph.evaluate([node])
+            print(results[node.id]['out'])
+
+        Args:
+            targets (list[NodeGraphQt.NodeObject]): nodes to evaluate
+                (all nodes if not specified).
+
+        Returns:
+            dict: {<node_id>: {<output_port_name>: <value>}} output values
+                of the target nodes.
+        """
+        if isinstance(targets, NodeObject):
+            targets = [targets]
+        return self.evaluator().evaluate(targets)
+
+    def evaluate_port(self, port):
+        """
+        Evaluate the value of a single output port (eg. for a preview).
+
+        Only the nodes upstream of the port are walked so it's fast even if
+        the rest of the graph is large or dirty and the cached output values
+        of the clean nodes are reused.
+
+        Disabled nodes pass the values of their input ports through to the
+        output ports (paired by index) without being computed so only the
+        nodes upstream of the passed through ports are evaluated.
+
+        .. code-block:: python
+            :linenos:
+
+            value = graph.evaluate_port(node.output(0))
+
+        See Also:
+            :meth:`NodeGraph.evaluate`
+
+        Args:
+            port (NodeGraphQt.Port): output port.
+
+        Returns:
+            object: output port value.
+        """
+        return self.evaluator().evaluate_port(port)
+
+    def compile(self, outputs):
+        """
+        Compile the nodes needed to compute the output ports into an
+        immutable execution plan for evaluating the same graph topology
+        many times.
+
+        The plan is an ordered list of the node compute functions with the
+        input and output slot indices resolved up front and the node
+        properties snapshot when compiled, running it doesn't touch the
+        node objects or Qt so the cost is only the compute functions.
+
+        .. code-block:: python
+            :linenos:
+
+            plan = graph.compile([node.output(0)])
+            for value in range(1000):
+                result, = plan.run({node.id: {'offset': value}})
+
+        Note:
+            The compute functions are called with a
+            :class:`NodeGraphQt.base.plan.PlanNode` as ``self`` which only
+            implements ``get_property()`` and ``name()``.
+
+        Args:
+            outputs (list): output ports (:class:`NodeGraphQt.Port`) or nodes
+                (all the node output ports) to compute.
+
+        Returns:
+            NodeGraphQt.base.plan.ExecutionPlan: execution plan.
+        """
+        if isinstance(outputs, (NodeObject, Port)):
+            outputs = [outputs]
+        return self.evaluator().compile(outputs)
+
+    def evaluate_batch(self, outputs, table):
+        """
+        Evaluate the output ports for each row of a table of property
+        overrides (eg. a parameter sweep) with a compiled execution plan.
+
+        .. code-block:: python
+            :linenos:
+
+            table = numpy.zeros(100, dtype=[('noise.seed', 'i4'),
+                                             ('blur.radius', 'f8')])
+            table['noise.seed'] = numpy.arange(100)
+            table['blur.radius'] = numpy.linspace(0.0, 4.0, 100)
+            images, = graph.evaluate_batch([node.output(0)], table)
+
+        See Also:
+            :meth:`NodeGraph.compile`,
+            :meth:`NodeGraphQt.base.plan.ExecutionPlan.run_batch`,
+            :attr:`NodeGraphQt.BaseNode.VECTORIZED`
+
+        Args:
+            outputs (list): output ports (:class:`NodeGraphQt.Port`) or nodes
+                (all the node output ports) to compute.
+            table (numpy.ndarray or dict): NumPy structured array or dict of
+                arrays with a ``"<node_name>.<property>"`` column for each
+                property to override.
+
+        Returns:
+            list: output values in the order of the output ports each with
+                a value per table row.
+        """
+        return self.compile(outputs).run_batch(table)
+
+    def evaluate_async(self, targets=None):
+        """
+        Evaluate the target nodes on the evaluation thread pool without
+        blocking the Qt event loop.
+
+        The :attr:`NodeGraph.node_evaluated` signal is emitted on the Qt
+        thread as each node is computed and the
+        :attr:`NodeGraph.evaluation_finished` signal once all the target
+        nodes are computed.
+
+        .. code-block:: python
+            :linenos:
+
+            graph.evaluation_finished.connect(on_results)
+            graph.evaluate_async([node])
+
+        Args:
+            targets (list[NodeGraphQt.NodeObject]): nodes to evaluate
+                (all nodes if not specified).
+
+        Returns:
+            concurrent.futures.Future: future for the
+                {<node_id>: {<output_port_name>: <value>}} output values of
+                the target nodes.
+        """
+        if isinstance(targets, NodeObject):
+            targets = [targets]
+        return self.evaluator().evaluate_async(targets)
+
+    def evaluation_workers(self):
+        """
+        Returns the number of worker threads nodes are computed on by
+        :meth:`NodeGraph.evaluate`.
+
+        Returns:
+            int: number of worker threads (0 = computed on the calling thread).
+        """
+        return self.evaluator().max_workers
+
+    def set_evaluation_workers(self, workers=0):
+        """
+        Set the number of worker threads nodes are computed on by
+        :meth:`NodeGraph.evaluate`.
+
+        Nodes are computed as soon as all their upstream nodes are computed
+        so independent branches of the graph are computed in parallel, this
+        speeds up nodes that release the GIL (eg. NumPy or file I/O).
+
+        Args:
+            workers (int): number of worker threads
+                (0 = computed on the calling thread).
+        """
+        self.evaluator().set_max_workers(workers)
+
+    def evaluation_processes(self):
+        """
+        Returns the number of worker processes the nodes flagged as
+        ``PROCESS_SAFE`` are computed in by :meth:`NodeGraph.evaluate`.
+
+        Returns:
+            int: number of worker processes (0 = not computed in processes).
+        """
+        return self.evaluator().max_processes
+
+    def set_evaluation_processes(self, processes=0):
+        """
+        Set the number of worker processes the nodes flagged as
+        :attr:`BaseNode.PROCESS_SAFE` are computed in by
+        :meth:`NodeGraph.evaluate`, pure Python nodes don't release the GIL
+        so they're only computed in parallel in separate processes.
+
+        NumPy array outputs are passed back from the worker processes
+        through shared memory instead of being pickled.
+
+        Args:
+            processes (int): number of worker processes
+                (0 = not computed in processes).
+        """
+        self.evaluator().set_max_processes(processes)
+
+    def evaluation_timeout(self):
+        """
+        Returns the default node compute timeout used by
+        :meth:`NodeGraph.evaluate`.
+
+        Returns:
+            float: timeout in seconds (``None`` = no timeout).
+        """
+        return self.evaluator().timeout
+
+    def set_evaluation_timeout(self, timeout=None):
+        """
+        Set the default node compute timeout used by
+        :meth:`NodeGraph.evaluate`, a :class:`NodeEvaluationError` is
+        raised for nodes that take longer.
+
+        Nodes can override it with the :attr:`BaseNode.COMPUTE_TIMEOUT`
+        attribute, nodes with a timeout are computed on the evaluation
+        event loop.
+
+        Args:
+            timeout (float): timeout in seconds (``None`` = no timeout).
+        """
+        self.evaluator().set_timeout(timeout)
+
+    def result_cache_budget(self):
+        """
+        Returns the memory budget of the node output values cache.
+
+        See Also:
+            :meth:`NodeGraph.set_result_cache_budget`,
+            :meth:`NodeGraph.result_cache_stats`
+
+        Returns:
+            int: budget in bytes (0 = unlimited).
+        """
+        return self.evaluator().cache.budget
+
+    def set_result_cache_budget(self, budget=0):
+        """
+        Set the memory budget of the node output values cache used by
+        :meth:`NodeGraph.evaluate` in estimated bytes.
+
+        Once the cached values exceed the budget the least recently used
+        values are evicted and recomputed when they're needed again.
+
+        Note:
+            Value sizes are estimated with ``sys.getsizeof`` (or ``nbytes``
+            for arrays) and the budget is a soft limit.
+
+        Args:
+            budget (int): budget in bytes (0 = unlimited).
+        """
+        self.evaluator().cache.set_budget(budget)
+
+    def result_cache_stats(self):
+        """
+        Returns the node output values cache statistics.
+
+        Returns:
+            dict: "hits", "misses", "evictions", "entries", "size" (bytes)
+                and "budget" (bytes).
+        """
+        return self.evaluator().cache.stats()
+
+    def disk_cache(self):
+        """
+        Returns the persistent node output values cache.
+
+        See Also:
+            :meth:`NodeGraph.set_disk_cache`
+
+        Returns:
+            NodeGraphQt.base.disk_cache.DiskCache: disk cache
+                (``None`` if not set).
+        """
+        return self.evaluator().disk_cache
+
+    def set_disk_cache(self, path=None, budget=0):
+        """
+        Store the node output values computed by :meth:`NodeGraph.evaluate`
+        in a cache directory so they're reused when the same session is
+        re-evaluated later.
+
+        Entries are keyed by a hash of the node type, custom properties and
+        the upstream node hashes, NumPy arrays are stored as ``.npy`` files
+        and memory mapped (read only) when loaded.
+
+        Args:
+            path (str): cache directory (``None`` to disable).
+            budget (int): max size of the cache directory in bytes
+                (0 = unlimited).
+        """
+        disk_cache = None
+        if path:
+            from NodeGraphQt.base.disk_cache import DiskCache
+            disk_cache = DiskCache(path, budget)
+        self.evaluator().set_disk_cache(disk_cache)
+
+    def pin_node_result(self, node, pinned=True):
+        """
+        Pin the output values of a node in the cache so they're never
+        evicted (eg. the node displayed in a viewer).
+
+        Args:
+            node (NodeGraphQt.NodeObject): node object.
+            pinned (bool): false to unpin the node.
+        """
+        self.evaluator().pin(node, pinned)
+
     def context_menu(self):
         """
         Returns the context menu for the node graph.
@@ -766,6 +1536,7 @@ class NodeGraph(QtCore.QObject):
         Returns:
             NodeGraphQt.NodeGraphMenu or NodeGraphQt.NodesMenu: context menu object.
         """
+        self._register_context_menu()
         return self._context_menu.get(menu)
 
     def _deserialize_context_menu(self, menu, menu_data, anchor_path=None):
@@ -951,7 +1722,8 @@ class NodeGraph(QtCore.QObject):
             mode (bool): true to enable acyclic.
         """
         self._model.acyclic = mode
-        self._viewer.acyclic = self._model.acyclic
+        if self._viewer:
+            self._viewer.acyclic = self._model.acyclic
 
     def pipe_collision(self):
         """
@@ -980,7 +1752,8 @@ class NodeGraph(QtCore.QObject):
             mode (bool): False to disable pipe collision.
         """
         self._model.pipe_collision = mode
-        self._viewer.pipe_collision = self._model.pipe_collision
+        if self._viewer:
+            self._viewer.pipe_collision = self._model.pipe_collision
 
     def pipe_slicing(self):
         """
@@ -1012,7 +1785,39 @@ class NodeGraph(QtCore.QObject):
             mode (bool): False to disable the slicer pipe.
         """
         self._model.pipe_slicing = mode
-        self._viewer.pipe_slicing = self._model.pipe_slicing
+        if self._viewer:
+            self._viewer.pipe_slicing = self._model.pipe_slicing
+
+    def port_snapping_radius(self):
+        """
+        Returns the radius used to snap a live connection to the nearest
+        compatible port.
+
+        See Also:
+            :meth:`NodeGraph.set_port_snapping_radius`
+
+        Returns:
+            float: snapping radius in viewer pixels (0 if disabled).
+        """
+        return self._model.port_snap_radius
+
+    def set_port_snapping_radius(self, radius=0.0):
+        """
+        Set the radius used to snap a live connection to the nearest
+        compatible port when the cursor is not directly over a port.
+
+        Port candidates are filtered by the port connection constraints and
+        the acyclic mode.
+
+        See Also:
+            :meth:`NodeGraph.port_snapping_radius`
+
+        Args:
+            radius (float): snapping radius in viewer pixels (0 to disable).
+        """
+        self._model.port_snap_radius = max(float(radius), 0.0)
+        if self._viewer:
+            self._viewer.port_snap_radius = self._model.port_snap_radius
 
     def pipe_style(self):
         """
@@ -1050,7 +1855,8 @@ class NodeGraph(QtCore.QObject):
                         PipeLayoutEnum.ANGLE.value])
         style = style if 0 <= style <= pipe_max else PipeLayoutEnum.CURVED.value
         self._model.pipe_style = style
-        self._viewer.set_pipe_layout(style)
+        if self._viewer:
+            self._viewer.set_pipe_layout(style)
 
     def layout_direction(self):
         """
@@ -1098,13 +1904,19 @@ class NodeGraph(QtCore.QObject):
         self._model.layout_direction = direction
         for node in self.all_nodes():
             node.set_layout_direction(direction)
-        self._viewer.set_layout_direction(direction)
+        if self._viewer:
+            self._viewer.set_layout_direction(direction)
 
     def fit_to_selection(self):
         """
         Sets the zoom level to fit selected nodes.
         If no nodes are selected then all nodes in the graph will be framed.
+
+        Note:
+            Does nothing if the node graph is headless.
         """
+        if not self._viewer:
+            return
         nodes = self.selected_nodes() or self.all_nodes()
         if not nodes:
             return
@@ -1113,8 +1925,12 @@ class NodeGraph(QtCore.QObject):
     def reset_zoom(self):
         """
         Reset the zoom level
+
+        Note:
+            Does nothing if the node graph is headless.
         """
-        self._viewer.reset_zoom()
+        if self._viewer:
+            self._viewer.reset_zoom()
 
     def set_zoom(self, zoom=0):
         """
@@ -1122,32 +1938,49 @@ class NodeGraph(QtCore.QObject):
 
         Args:
             zoom (float): zoom factor (max zoom out ``-0.9`` / max zoom in ``2.0``)
+
+        Note:
+            Does nothing if the node graph is headless.
         """
-        self._viewer.set_zoom(zoom)
+        if self._viewer:
+            self._viewer.set_zoom(zoom)
 
     def get_zoom(self):
         """
         Get the current zoom level of the node graph.
 
         Returns:
-            float: the current zoom level.
+            float: the current zoom level (``0.0`` if the node graph is
+                headless).
         """
+        if not self._viewer:
+            return 0.0
         return self._viewer.get_zoom()
 
     def center_on(self, nodes=None):
         """
         Center the node graph on the given nodes or all nodes by default.
 
+        Note:
+            Does nothing if the node graph is headless.
+
         Args:
             nodes (list[NodeGraphQt.BaseNode]): a list of nodes.
         """
+        if not self._viewer:
+            return
         nodes = nodes or []
         self._viewer.center_selection([n.view for n in nodes])
 
     def center_selection(self):
         """
         Centers on the current selected nodes.
+
+        Note:
+            Does nothing if the node graph is headless.
         """
+        if not self._viewer:
+            return
         nodes = self._viewer.selected_nodes()
         self._viewer.center_selection(nodes)
 
@@ -1172,7 +2005,8 @@ class NodeGraph(QtCore.QObject):
             alias (str): custom alias name for the node type.
         """
         self._node_factory.register_node(node, alias)
-        self._viewer.rebuild_tab_search()
+        if self._viewer:
+            self._viewer.rebuild_tab_search()
         self.nodes_registered.emit([node])
 
     def register_nodes(self, nodes):
@@ -1183,7 +2017,8 @@ class NodeGraph(QtCore.QObject):
             nodes (list): list of nodes.
         """
         [self._node_factory.register_node(n) for n in nodes]
-        self._viewer.rebuild_tab_search()
+        if self._viewer:
+            self._viewer.rebuild_tab_search()
         self.nodes_registered.emit(nodes)
 
     def create_node(self, node_type, name=None, selected=True, color=None,
@@ -1206,7 +2041,9 @@ class NodeGraph(QtCore.QObject):
         Returns:
             BaseNode: the created instance of the node.
         """
-        node = self._node_factory.create_node_instance(node_type)
+        node = self._node_factory.create_node_instance(
+            node_type, headless=self.is_headless()
+        )
         if node:
             node._graph = self
             node.model._graph_model = self.model
@@ -1504,7 +2341,7 @@ class NodeGraph(QtCore.QObject):
         else:
             undo_cmd.redo()
 
-        self.nodes_deleted.emit(node_ids)
+        self.emit_graph_signal('nodes_deleted', node_ids)
 
     def extract_nodes(self, nodes, push_undo=True, prompt_warning=True):
         """
@@ -1535,7 +2372,7 @@ class NodeGraph(QtCore.QObject):
                 'Selected nodes cannot be extracted because the following '
                 'ports are locked:\n{}'.format('\n'.join(sorted(locked_ports)))
             )
-            if prompt_warning:
+            if prompt_warning and self._viewer:
                 self._viewer.message_dialog(message, 'Can\'t Extract Nodes')
             return
 
@@ -1554,6 +2391,77 @@ class NodeGraph(QtCore.QObject):
         if push_undo:
             self._undo_stack.endMacro()
 
+    def set_properties(self, node, properties, push_undo=True):
+        """
+        Set multiple properties on a node with a single redraw and emit the
+        :attr:`NodeGraph.properties_changed` signal once.
+
+        Args:
+            node (NodeGraphQt.NodeObject): node object.
+            properties (dict): property names and values.
+            push_undo (bool): register the command to the undo stack. (default: True)
+        """
+        properties = {name: value for name, value in properties.items()
+                      if node.get_property(name) != value}
+        if not properties:
+            return
+
+        # prevent nodes from have the same name.
+        if 'name' in properties:
+            properties['name'] = self.get_unique_name(properties['name'])
+            node.NODE_NAME = properties['name']
+
+        undo_cmd = PropertiesChangedCmd(self, [(node, properties)])
+        undo_cmd.setText('change "{}" properties'.format(node.name()))
+        if push_undo:
+            self._undo_stack.push(undo_cmd)
+        else:
+            undo_cmd.redo()
+
+    def set_property_on_nodes(self, nodes, name, value, push_undo=True):
+        """
+        Set a property on multiple nodes in a single undo command.
+
+        Unlike calling :meth:`NodeObject.set_property` on each node the
+        nodes are redrawn once and a single
+        :attr:`NodeGraph.properties_changed` signal is emitted with the ids
+        of the changed nodes.
+
+        Args:
+            nodes (list[NodeGraphQt.NodeObject]): node objects.
+            name (str): name of the property.
+            value (object): property data (python built in types).
+            push_undo (bool): register the command to the undo stack. (default: True)
+        """
+        nodes = [n for n in nodes if n.get_property(name) != value]
+        if not nodes:
+            return
+
+        if name == 'name':
+            # prevent nodes from have the same name.
+            node_ids = set(n.id for n in nodes)
+            node_names = set(n.name() for n in self.all_nodes()
+                             if n.id not in node_ids)
+            changes = []
+            for node in nodes:
+                node_name = self._unique_name(value, node_names)
+                node_names.add(node_name)
+                node.NODE_NAME = node_name
+                changes.append((node, {name: node_name}))
+            self._cache_node_names(n.NODE_NAME for n in nodes)
+        else:
+            properties = {name: value}
+            changes = [(node, properties) for node in nodes]
+
+        undo_cmd = PropertiesChangedCmd(self, changes)
+        undo_cmd.setText(
+            'set property "{}" on {} node(s)'.format(name, len(nodes))
+        )
+        if push_undo:
+            self._undo_stack.push(undo_cmd)
+        else:
+            undo_cmd.redo()
+
     def all_nodes(self):
         """
         Return all nodes in the node graph.
@@ -1570,6 +2478,8 @@ class NodeGraph(QtCore.QObject):
         Returns:
             list[NodeGraphQt.BaseNode]: list of nodes.
         """
+        if not self._viewer:
+            return [n for n in self._model.nodes.values() if n.model.selected]
         nodes = []
         for item in self._viewer.selected_nodes():
             node = self._model.nodes[item.id]
@@ -1584,6 +2494,8 @@ class NodeGraph(QtCore.QObject):
             list[tuple[NodeGraphQt.Port,NodeGraphQt.Port]]: list of port tuples
         """
         pipes = []
+        if not self._viewer:
+            return pipes
         ptypes = {PortTypeEnum.IN.value: "inputs", PortTypeEnum.OUT.value: "outputs"}
 
         for item in self._viewer.selected_pipes():
@@ -1673,27 +2585,73 @@ class NodeGraph(QtCore.QObject):
         Args:
             name (str): node name.
 
+        Returns:
+            str: unique node name.
+        """
+        if self._name_cache is not None:
+            node_names, suffixes = self._name_cache
+            if node_names is None:
+                node_names = set(n.name() for n in self.all_nodes())
+                self._name_cache = (node_names, suffixes)
+            name = self._unique_name(name, node_names, suffixes)
+            node_names.add(name)
+            return name
+        node_names = set(n.name() for n in self.all_nodes())
+        return self._unique_name(name, node_names)
+
+    def _cache_node_names(self, names):
+        """
+        Add node names that entered the graph to the unique name cache used
+        while the updates are suspended.
+        (used internally by the node graph and undo commands)
+
+        Args:
+            names (list[str]): node names.
+        """
+        if self._name_cache is not None and self._name_cache[0] is not None:
+            self._name_cache[0].update(names)
+
+    def _invalidate_name_cache(self):
+        """
+        Drop the cached node names after nodes were removed from the graph,
+        they're collected again the next time a unique name is requested.
+        (used internally by the node graph and undo commands)
+        """
+        if self._name_cache is not None:
+            self._name_cache = (None, {})
+
+    @staticmethod
+    def _unique_name(name, node_names, suffixes=None):
+        """
+        Creates a node name that isn't in the specified node names.
+
+        Args:
+            name (str): node name.
+            node_names (set[str]): existing node names.
+            suffixes (dict): optional last number suffix used per base name
+                to start the search from (updated in place).
+
         Returns:
             str: unique node name.
         """
         name = ' '.join(name.split())
-        node_names = [n.name() for n in self.all_nodes()]
         if name not in node_names:
             return name
 
         regex = re.compile(r'\w+ (\d+)$')
         search = regex.search(name)
-        if not search:
-            for x in range(1, len(node_names) + 2):
-                new_name = '{} {}'.format(name, x)
-                if new_name not in node_names:
-                    return new_name
-
-        version = search.group(1)
-        name = name[:len(version) * -1].strip()
-        for x in range(1, len(node_names) + 2):
+        if search:
+            version = search.group(1)
+            name = name[:len(version) * -1].strip()
+
+        start = 1
+        if suffixes is not None:
+            start = suffixes.get(name, 0) + 1
+        for x in range(start, start + len(node_names) + 1):
             new_name = '{} {}'.format(name, x)
             if new_name not in node_names:
+                if suffixes is not None:
+                    suffixes[name] = x
                 return new_name
 
     def current_session(self):
@@ -1841,7 +2799,9 @@ class NodeGraph(QtCore.QObject):
         nodes = {}
         for n_id, n_data in data.get('nodes', {}).items():
             identifier = n_data['type_']
-            node = self._node_factory.create_node_instance(identifier)
+            node = self._node_factory.create_node_instance(
+                identifier, headless=self.is_headless()
+            )
             if node:
                 node.NODE_NAME = n_data.get('name', node.NODE_NAME)
                 # set properties.
@@ -1894,10 +2854,10 @@ class NodeGraph(QtCore.QObject):
                 in_node.on_input_connected(in_port, out_port)
 
         node_objs = nodes.values()
-        if relative_pos:
+        if self._viewer and relative_pos:
             self._viewer.move_nodes([n.view for n in node_objs])
             [setattr(n.model, 'pos', n.view.xy_pos) for n in node_objs]
-        elif pos:
+        elif self._viewer and pos:
             self._viewer.move_nodes([n.view for n in node_objs], pos=pos)
             [setattr(n.model, 'pos', n.view.xy_pos) for n in node_objs]
 
@@ -2234,6 +3194,26 @@ class NodeGraph(QtCore.QObject):
             NodeGraph._update_node_rank(node, nodes_rank, down_stream)
         return nodes_rank
 
+    @staticmethod
+    def _nodes_rect(nodes, positions):
+        """
+        Returns the combined rect of the nodes from their sizes at the
+        specified positions (nodes in a headless graph aren't in a scene).
+
+        Args:
+            nodes (list[NodeGraphQt.NodeObject]): nodes.
+            positions (dict): {<node>: [x, y]} node positions.
+
+        Returns:
+            QtCore.QRectF: combined rect.
+        """
+        rect = QtCore.QRectF()
+        for node in nodes:
+            x, y = positions[node]
+            rect = rect.united(
+                QtCore.QRectF(x, y, node.view.width, node.view.height))
+        return rect
+
     def auto_layout_nodes(self, nodes=None, down_stream=True, start_nodes=None):
         """
         Auto layout the nodes in the node graph.
@@ -2249,8 +3229,6 @@ class NodeGraph(QtCore.QObject):
             start_nodes (list[NodeGraphQt.BaseNode]):
                 list of nodes to start the auto layout from (Optional).
         """
-        self.begin_undo('Auto Layout Nodes')
-
         nodes = nodes or self.all_nodes()
 
         # filter out the backdrops.
@@ -2274,8 +3252,7 @@ class NodeGraph(QtCore.QObject):
         if not start_nodes:
             return
 
-        node_views = [n.view for n in nodes]
-        nodes_center_0 = self.viewer().nodes_rect_center(node_views)
+        self.begin_undo('Auto Layout Nodes')
 
         nodes_rank = NodeGraph._compute_node_rank(start_nodes, down_stream)
 
@@ -2286,7 +3263,13 @@ class NodeGraph(QtCore.QObject):
             else:
                 rank_map[rank] = [node]
 
-        node_layout_direction = self._viewer.get_layout_direction()
+        # the new node positions are computed first and then applied with
+        # a single undo command.
+        prev_positions = {n: n.pos() for n in nodes}
+        positions = dict(prev_positions)
+        nodes_center_0 = self._nodes_rect(nodes, prev_positions).center()
+
+        node_layout_direction = self._model.layout_direction
 
         if node_layout_direction is LayoutDirectionEnum.HORIZONTAL.value:
             current_x = 0
@@ -2299,7 +3282,7 @@ class NodeGraph(QtCore.QObject):
                 for idx, node in enumerate(ranked_nodes):
                     dy = max(node_height, node.view.height)
                     current_y += 0 if idx == 0 else dy
-                    node.set_pos(current_x, current_y)
+                    positions[node] = [current_x, current_y]
                     current_y += dy * 0.5 + 10
 
                 current_x += max_width * 0.5 + 100
@@ -2314,15 +3297,25 @@ class NodeGraph(QtCore.QObject):
                 for idx, node in enumerate(ranked_nodes):
                     dx = max(node_width, node.view.width)
                     current_x += 0 if idx == 0 else dx
-                    node.set_pos(current_x, current_y)
+                    positions[node] = [current_x, current_y]
                     current_x += dx * 0.5 + 10
 
                 current_y += max_height * 0.5 + 100
 
-        nodes_center_1 = self.viewer().nodes_rect_center(node_views)
-        dx = nodes_center_0[0] - nodes_center_1[0]
-        dy = nodes_center_0[1] - nodes_center_1[1]
-        [n.set_pos(n.x_pos() + dx, n.y_pos() + dy) for n in nodes]
+        # re-center the nodes to where they were before the layout.
+        nodes_center = self._nodes_rect(nodes, positions).center()
+        dx = nodes_center_0.x() - nodes_center.x()
+        dy = nodes_center_0.y() - nodes_center.y()
+        for node in nodes:
+            x, y = positions[node]
+            positions[node] = [x + dx, y + dy]
+
+        moved_nodes = list(positions.keys())
+        self._undo_stack.push(NodesMovedCmd(
+            moved_nodes,
+            [positions[n] for n in moved_nodes],
+            [prev_positions.get(n) or n.pos() for n in moved_nodes]
+        ))
 
         # wrap the backdrop nodes.
         for backdrop, contained_nodes in backdrops.items():
@@ -2720,7 +3713,9 @@ class SubGraph(NodeGraph):
                 nodes[n_id].set_pos(*(n_data.get('pos') or [0, 0]))
                 continue
 
-            node = self._node_factory.create_node_instance(identifier)
+            node = self._node_factory.create_node_instance(
+                identifier, headless=self.is_headless()
+            )
             if not node:
                 continue
 
@@ -2762,10 +3757,10 @@ class SubGraph(NodeGraph):
                 )
 
         node_objs = list(nodes.values())
-        if relative_pos:
+        if self._viewer and relative_pos:
             self._viewer.move_nodes([n.view for n in node_objs])
             [setattr(n.model, 'pos', n.view.xy_pos) for n in node_objs]
-        elif pos:
+        elif self._viewer and pos:
             self._viewer.move_nodes([n.view for n in node_objs], pos=pos)
             [setattr(n.model, 'pos', n.view.xy_pos) for n in node_objs]
 
@@ -0,0 +1,326 @@
+#!/usr/bin/python
+import contextlib
+import threading
+from collections import OrderedDict
+
+from NodeGraphQt.constants import (LayoutDirectionEnum,
+                                   NodeEnum,
+                                   PortEnum,
+                                   PortTypeEnum)
+from NodeGraphQt.errors import NodeWidgetError
+
+_state = threading.local()
+
+
+@contextlib.contextmanager
+def headless_nodes():
+    """
+    Context manager where node objects created in it use the headless node
+    items instead of their ``QGraphicsItem`` views.
+    """
+    _state.depth = getattr(_state, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+
+
+def is_headless():
+    """
+    Returns true if called within the :func:`headless_nodes` context.
+
+    Returns:
+        bool: true if nodes are created headless.
+    """
+    return getattr(_state, 'depth', 0) > 0
+
+
+def _item_property(name):
+    """
+    Returns a property that reads and writes the item properties dict.
+
+    Args:
+        name (str): property name.
+
+    Returns:
+        property: item property.
+    """
+    def getter(self):
+        return self._properties[name]
+
+    def setter(self, value):
+        self._properties[name] = value
+
+    return property(getter, setter)
+
+
+class HeadlessPortItem(object):
+    """
+    Model only stand-in for the :class:`NodeGraphQt.qgraphics.port.PortItem`
+    used by the ports of headless nodes.
+
+    Args:
+        node (HeadlessNodeItem): parent node item.
+    """
+
+    def __init__(self, node=None):
+        self._node = node
+        self.name = 'port'
+        self.display_name = True
+        self.color = PortEnum.COLOR.value
+        self.border_color = PortEnum.BORDER_COLOR.value
+        self.port_type = None
+        self.multi_connection = False
+        self.locked = False
+        self._visible = True
+
+    def __repr__(self):
+        return '{}.HeadlessPortItem("{}")'.format(self.__module__, self.name)
+
+    @property
+    def node(self):
+        return self._node
+
+    @property
+    def connected_pipes(self):
+        return []
+
+    @property
+    def connected_ports(self):
+        return []
+
+    def isVisible(self):
+        return self._visible
+
+    def setVisible(self, visible):
+        self._visible = visible
+
+    def connect_to(self, port):
+        return
+
+    def disconnect_from(self, port):
+        return
+
+    def update(self):
+        return
+
+
+class HeadlessNodeItem(object):
+    """
+    Model only stand-in for the node ``QGraphicsItem`` views used by nodes
+    in a headless :class:`NodeGraphQt.NodeGraph` so nodes can be created,
+    edited and serialized without a scene (or a ``QApplication``).
+
+    The item keeps the view attributes the node objects read back into
+    their model, drawing calls are no-ops.
+
+    Args:
+        name (str): node name.
+        parent (object): not used.
+    """
+
+    def __init__(self, name='node', parent=None):
+        self._properties = {
+            'id': None,
+            'name': name.strip(),
+            'color': (13, 18, 23, 255),
+            'border_color': (46, 57, 66, 255),
+            'text_color': (255, 255, 255, 180),
+            'type_': 'AbstractBaseNode',
+            'selected': False,
+            'disabled': False,
+            'visible': False,
+            'layout_direction': LayoutDirectionEnum.HORIZONTAL.value,
+        }
+        self.width = NodeEnum.WIDTH.value
+        self.height = NodeEnum.HEIGHT.value
+        self.xy_pos = [0.0, 0.0]
+        self._inputs = []
+        self._outputs = []
+        self._widgets = OrderedDict()
+
+    def __repr__(self):
+        return '{}.{}(\'{}\')'.format(
+            self.__module__, self.__class__.__name__, self.name)
+
+    id = _item_property('id')
+    name = _item_property('name')
+    color = _item_property('color')
+    border_color = _item_property('border_color')
+    text_color = _item_property('text_color')
+    type_ = _item_property('type_')
+    selected = _item_property('selected')
+    disabled = _item_property('disabled')
+    visible = _item_property('visible')
+    layout_direction = _item_property('layout_direction')
+
+    @property
+    def icon(self):
+        return self._properties.get('icon')
+
+    @icon.setter
+    def icon(self, path=None):
+        self._properties['icon'] = path
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def properties(self):
+        """
+        return the node item attributes.
+
+        Returns:
+            dict: {property_name: property_value}
+        """
+        props = {'width': self.width,
+                 'height': self.height,
+                 'pos': list(self.xy_pos)}
+        props.update(self._properties)
+        return props
+
+    def from_dict(self, node_dict):
+        """
+        set the node item attributes from the dictionary.
+
+        Args:
+            node_dict (dict): serialized node dict.
+        """
+        for name, value in node_dict.items():
+            if name in self._properties or name == 'icon':
+                self._properties[name] = value
+            elif name in ['width', 'height']:
+                setattr(self, name, value)
+            elif name == 'pos':
+                self.xy_pos = list(value)
+
+    # --- item interface ---
+
+    def scene(self):
+        return
+
+    def viewer(self):
+        return
+
+    def isSelected(self):
+        return self._properties['selected']
+
+    def setSelected(self, selected):
+        self._properties['selected'] = selected
+
+    def isVisible(self):
+        return self._properties['visible']
+
+    def setVisible(self, visible):
+        self._properties['visible'] = visible
+
+    def update(self):
+        return
+
+    def pre_init(self, viewer, pos=None):
+        return
+
+    def post_init(self, viewer=None, pos=None):
+        return
+
+    def draw_node(self):
+        return
+
+    def delete(self):
+        return
+
+    # --- ports ---
+
+    @property
+    def inputs(self):
+        return list(self._inputs)
+
+    @property
+    def outputs(self):
+        return list(self._outputs)
+
+    def _add_port(self, port_type, name, multi_port, display_name, locked):
+        port = HeadlessPortItem(self)
+        port.name = name
+        port.port_type = port_type
+        port.multi_connection = multi_port
+        port.display_name = display_name
+        port.locked = locked
+        return port
+
+    def add_input(self, name='input', multi_port=False, display_name=True,
+                  locked=False, painter_func=None):
+        port = self._add_port(PortTypeEnum.IN.value, name, multi_port,
+                              display_name, locked)
+        self._inputs.append(port)
+        return port
+
+    def add_output(self, name='output', multi_port=False, display_name=True,
+                   locked=False, painter_func=None):
+        port = self._add_port(PortTypeEnum.OUT.value, name, multi_port,
+                              display_name, locked)
+        self._outputs.append(port)
+        return port
+
+    def delete_input(self, port):
+        if port in self._inputs:
+            self._inputs.remove(port)
+
+    def delete_output(self, port):
+        if port in self._outputs:
+            self._outputs.remove(port)
+
+    def get_input_text_item(self, port_item):
+        return
+
+    def get_output_text_item(self, port_item):
+        return
+
+    # --- widgets ---
+
+    @property
+    def widgets(self):
+        return self._widgets.copy()
+
+    def add_widget(self, widget):
+        self._widgets[widget.get_name()] = widget
+
+    def get_widget(self, name):
+        widget = self._widgets.get(name)
+        if widget:
+            return widget
+        raise NodeWidgetError('node has no widget "{}"'.format(name))
+
+    def has_widget(self, name):
+        return name in self._widgets.keys()
+
+    # --- backdrop ---
+
+    def get_nodes(self, inc_intersects=False):
+        return []
+
+    def calc_backdrop_size(self, nodes=None):
+        """
+        Returns the backdrop size to fit around the node items.
+
+        Args:
+            nodes (list[HeadlessNodeItem]): node items.
+
+        Returns:
+            dict: backdrop "pos", "width" and "height".
+        """
+        if not nodes:
+            return {'pos': list(self.xy_pos),
+                    'width': self.width,
+                    'height': self.height}
+        left = min(n.xy_pos[0] for n in nodes)
+        top = min(n.xy_pos[1] for n in nodes)
+        right = max(n.xy_pos[0] + n.width for n in nodes)
+        bottom = max(n.xy_pos[1] + n.height for n in nodes)
+        padding = 40
+        return {
+            'pos': [left - padding, top - padding],
+            'width': right - left + (padding * 2),
+            'height': bottom - top + (padding * 2)
+        }
@@ -1,9 +1,9 @@
 #!/usr/bin/python
 import re
-from distutils.version import LooseVersion
 
 from Qt import QtGui, QtCore
 
+from NodeGraphQt.constants import QT_VERSION
 from NodeGraphQt.errors import NodeMenuError
 from NodeGraphQt.widgets.actions import BaseMenu, GraphAction, NodeAction
 
@@ -141,7 +141,7 @@ class NodeGraphMenu(object):
         """
         action = GraphAction(name, self._graph.viewer())
         action.graph = self._graph
-        if LooseVersion(QtCore.qVersion()) >= LooseVersion('5.10'):
+        if QT_VERSION >= (5, 10):
             action.setShortcutVisibleInContextMenu(True)
 
         if shortcut:
@@ -218,7 +218,7 @@ class NodesMenu(NodeGraphMenu):
 
         action = NodeAction(name, self._graph.viewer())
         action.graph = self._graph
-        if LooseVersion(QtCore.qVersion()) >= LooseVersion('5.10'):
+        if QT_VERSION >= (5, 10):
             action.setShortcutVisibleInContextMenu(True)
 
         if shortcut:
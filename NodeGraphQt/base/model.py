@@ -5,7 +5,9 @@ from collections import defaultdict
 from NodeGraphQt.constants import (
     LayoutDirectionEnum,
     NodePropWidgetEnum,
-    PipeLayoutEnum
+    PipeLayoutEnum,
+    PortEnum,
+    ViewerEnum
 )
 from NodeGraphQt.errors import NodePropertyError
 
@@ -454,8 +456,12 @@ class NodeGraphModel(object):
         self.acyclic = True
         self.pipe_collision = False
         self.pipe_slicing = True
+        self.port_snap_radius = PortEnum.SNAP_RADIUS.value
         self.pipe_style = PipeLayoutEnum.CURVED.value
         self.layout_direction = LayoutDirectionEnum.HORIZONTAL.value
+        self.background_color = ViewerEnum.BACKGROUND_COLOR.value
+        self.grid_color = ViewerEnum.GRID_COLOR.value
+        self.grid_mode = ViewerEnum.GRID_DISPLAY_LINES.value
 
     def common_properties(self):
         """
@@ -1,5 +1,6 @@
 #!/usr/bin/python
 from NodeGraphQt.base.commands import PropertyChangedCmd
+from NodeGraphQt.base.headless import HeadlessNodeItem, is_headless
 from NodeGraphQt.base.model import NodeModel
 from NodeGraphQt.constants import NodePropWidgetEnum
 
@@ -90,6 +91,10 @@ class NodeObject(object):
                 'No qgraphics item specified for the node object!'
             )
 
+        # nodes created for a headless graph don't have a graphics item.
+        if is_headless():
+            _NodeItem = HeadlessNodeItem
+
         self._view = _NodeItem()
         self._view.type_ = self.type_
         self._view.name = self.model.name
@@ -141,6 +146,16 @@ class NodeObject(object):
         """
         return self._view
 
+    def is_headless(self):
+        """
+        Returns true if the node was created for a headless node graph and
+        doesn't have a ``QGraphicsItem`` view.
+
+        Returns:
+            bool: true if headless.
+        """
+        return isinstance(self._view, HeadlessNodeItem)
+
     def set_view(self, item):
         """
         Set a new ``QGraphicsItem`` item to be used as the view.
@@ -150,10 +165,10 @@ class NodeObject(object):
         Args:
             item (NodeGraphQt.qgraphics.node_abstract.AbstractNodeItem): node item.
         """
-        if self._view:
-            old_view = self._view
-            scene = self._view.scene()
-            scene.removeItem(old_view)
+        # headless and released node items aren't in a scene.
+        scene = self._view.scene() if self._view else None
+        if scene:
+            scene.removeItem(self._view)
             self._view = item
             scene.addItem(self._view)
         else:
@@ -297,6 +312,9 @@ class NodeObject(object):
         """
         Set the node state to either disabled or enabled.
 
+        A disabled node isn't computed when the graph is evaluated, its
+        input values are passed through to the output ports instead.
+
         Args:
             mode(bool): True to disable node.
         """
@@ -404,7 +422,10 @@ class NodeObject(object):
             self.NODE_NAME = value
 
         if self.graph:
-            undo_cmd = PropertyChangedCmd(self, name, value)
+            undo_cmd = PropertyChangedCmd(
+                self, name, value,
+                merge=self.graph.is_merging_property_edits()
+            )
             if name == 'name':
                 undo_cmd.setText(
                     'renamed "{}" to "{}"'.format(self.name(), value)
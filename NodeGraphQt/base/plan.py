@@ -0,0 +1,388 @@
+#!/usr/bin/python
+from NodeGraphQt.base.process import is_ndarray
+from NodeGraphQt.errors import NodeEvaluationError
+
+
+class PlanNode(object):
+    """
+    Detached stand-in for a node in a :class:`ExecutionPlan`, it's passed
+    as ``self`` to the node class :meth:`NodeGraphQt.BaseNode.compute`
+    function and holds a snapshot of the node properties.
+
+    Args:
+        node_id (str): node id.
+        name (str): node name.
+        type_ (str): node type.
+        properties (dict): property values.
+        vectorized (bool): true if the node compute function accepts arrays.
+    """
+
+    def __init__(self, node_id, name, type_, properties, vectorized=False):
+        self.id = node_id
+        self.type_ = type_
+        self.vectorized = vectorized
+        self._name = name
+        self._properties = properties
+
+    def __repr__(self):
+        return '<{}("{}") object at {}>'.format(
+            self.__class__.__name__, self._name, hex(id(self)))
+
+    def name(self):
+        """
+        Returns:
+            str: node name.
+        """
+        return self._name
+
+    def has_property(self, name):
+        """
+        Args:
+            name (str): property name.
+
+        Returns:
+            bool: true if the property exists.
+        """
+        return name in self._properties
+
+    def get_property(self, name):
+        """
+        Args:
+            name (str): property name.
+
+        Returns:
+            object: property value.
+        """
+        return self._properties[name]
+
+    def properties(self):
+        """
+        Returns:
+            dict: copy of the property values.
+        """
+        return dict(self._properties)
+
+    def with_properties(self, properties):
+        """
+        Returns a copy of the plan node with property values overridden.
+
+        Args:
+            properties (dict): property values.
+
+        Returns:
+            PlanNode: plan node copy.
+        """
+        values = dict(self._properties)
+        values.update(properties)
+        return PlanNode(self.id, self._name, self.type_, values,
+                        self.vectorized)
+
+
+class ExecutionPlan(object):
+    """
+    Immutable execution plan created by :meth:`NodeGraph.compile`.
+
+    The plan is an ordered list of node compute functions where the input
+    and output values are passed through a flat list of slots with the
+    slot indices resolved when the plan is compiled, running the plan only
+    calls the compute functions and doesn't touch the node graph, node
+    objects or Qt.
+
+    Args:
+        steps (tuple): (<compute function>, <input slots>, <output slots>)
+            for each node in evaluation order.
+        states (tuple[PlanNode]): plan node for each step.
+        slot_count (int): number of value slots.
+        outputs (tuple): (<node_id>, <port_name>) plan outputs.
+        output_slots (tuple[int]): slot indices of the plan outputs.
+    """
+
+    def __init__(self, steps, states, slot_count, outputs, output_slots):
+        self._steps = steps
+        self._states = states
+        self._slot_count = slot_count
+        self._outputs = outputs
+        self._output_slots = output_slots
+        self._step_index = {state.id: i for i, state in enumerate(states)}
+        self._name_index = {state.name(): i for i, state in enumerate(states)}
+
+    def __repr__(self):
+        return '<{}() nodes={} slots={} object at {}>'.format(
+            self.__class__.__name__, len(self._steps), self._slot_count,
+            hex(id(self)))
+
+    def __len__(self):
+        return len(self._steps)
+
+    @property
+    def outputs(self):
+        """
+        Returns:
+            tuple: (<node_id>, <port_name>) for each value returned by
+                :meth:`ExecutionPlan.run`.
+        """
+        return self._outputs
+
+    @property
+    def node_ids(self):
+        """
+        Returns:
+            tuple[str]: node ids in evaluation order.
+        """
+        return tuple(state.id for state in self._states)
+
+    @property
+    def slot_count(self):
+        """
+        Returns:
+            int: number of value slots.
+        """
+        return self._slot_count
+
+    def node_properties(self, node_id):
+        """
+        Returns the property values the node is computed with.
+
+        Args:
+            node_id (str): node id.
+
+        Returns:
+            dict: property values.
+        """
+        return self._states[self._step_index[node_id]].properties()
+
+    def _states_for(self, properties):
+        """
+        Args:
+            properties (dict): {<node_id>: {<property_name>: <value>}}
+
+        Returns:
+            list[PlanNode]: plan node for each step.
+        """
+        if not properties:
+            return self._states
+        states = list(self._states)
+        for node_id, values in properties.items():
+            index = self._step_index.get(node_id)
+            if index is None:
+                raise NodeEvaluationError(
+                    'Node "{}" is not in the execution plan.'.format(node_id))
+            states[index] = states[index].with_properties(values)
+        return states
+
+    def run(self, properties=None):
+        """
+        Run the plan.
+
+        .. code-block:: python
+            :linenos:
+
+            plan = graph.compile([node.output(0)])
+            for value in range(1000):
+                result, = plan.run({node.id: {'offset': value}})
+
+        Args:
+            properties (dict): {<node_id>: {<property_name>: <value>}}
+                property values to override for this run.
+
+        Returns:
+            list: output values in the order of
+                :attr:`ExecutionPlan.outputs`.
+        """
+        slots = [None] * self._slot_count
+        states = self._states_for(properties)
+        index = 0
+        try:
+            for index, (compute, inputs, outputs) in enumerate(self._steps):
+                values = {}
+                for name, slot in inputs:
+                    if slot.__class__ is tuple:
+                        values[name] = [slots[i] for i in slot]
+                    else:
+                        values[name] = None if slot < 0 else slots[slot]
+                result = compute(states[index], values)
+                if result:
+                    for name, slot in outputs:
+                        slots[slot] = result.get(name)
+        except NodeEvaluationError:
+            raise
+        except Exception as e:
+            raise NodeEvaluationError(
+                'Failed to compute node "{}": {}'
+                .format(states[index].name(), e)) from e
+        return [slots[i] for i in self._output_slots]
+
+    def _batch_columns(self, table):
+        """
+        Args:
+            table (numpy.ndarray or dict): batch table.
+
+        Returns:
+            tuple: (<row count>, {<step index>: {<property_name>: <column>}})
+        """
+        field_names = getattr(getattr(table, 'dtype', None), 'names', None)
+        if field_names:
+            columns = [(name, table[name]) for name in field_names]
+        elif isinstance(table, dict):
+            columns = list(table.items())
+        else:
+            raise NodeEvaluationError(
+                'Batch table must be a NumPy structured array or a dict '
+                'of arrays.')
+        if not columns:
+            raise NodeEvaluationError('Batch table has no columns.')
+
+        rows = None
+        overrides = {}
+        for key, column in columns:
+            if isinstance(key, tuple):
+                node_key, name = key
+            elif '.' in key:
+                node_key, name = key.rsplit('.', 1)
+            else:
+                raise NodeEvaluationError(
+                    'Invalid batch column "{}" expected '
+                    '"<node>.<property>".'.format(key))
+            index = self._step_index.get(node_key)
+            if index is None:
+                index = self._name_index.get(node_key)
+            if index is None:
+                raise NodeEvaluationError(
+                    'Node "{}" is not in the execution plan.'.format(node_key))
+            if not self._states[index].has_property(name):
+                raise NodeEvaluationError(
+                    'Node "{}" has no property "{}".'.format(
+                        self._states[index].name(), name))
+            if rows is None:
+                rows = len(column)
+            elif len(column) != rows:
+                raise NodeEvaluationError(
+                    'Batch column "{}" has {} rows expected {}.'.format(
+                        key, len(column), rows))
+            overrides.setdefault(index, {})[name] = column
+        return rows, overrides
+
+    def run_batch(self, table):
+        """
+        Run the plan for each row of a table of property values.
+
+        The table is a NumPy structured array or a dict of equal length
+        arrays (or lists) with a ``"<node>.<property>"`` column name (or
+        ``(<node>, <property>)`` dict key) for each property to override
+        where ``<node>`` is a node name or id.
+
+        Nodes that don't depend on the table are computed once, nodes with
+        the :attr:`NodeGraphQt.BaseNode.VECTORIZED` flag are computed once
+        with arrays for the values that vary between rows and the other
+        nodes are computed once per row.
+
+        .. code-block:: python
+            :linenos:
+
+            plan = graph.compile([node.output(0)])
+            table = {'blur.radius': numpy.linspace(0.0, 4.0, 100)}
+            result, = plan.run_batch(table)
+
+        Args:
+            table (numpy.ndarray or dict): batch table.
+
+        Returns:
+            list: output values in the order of
+                :attr:`ExecutionPlan.outputs` each with a value per row
+                (an array for vectorized node outputs else a list).
+        """
+        rows, overrides = self._batch_columns(table)
+        slots = [None] * self._slot_count
+        batched = [False] * self._slot_count
+
+        def gather(inputs, get):
+            values = {}
+            for name, slot in inputs:
+                if slot.__class__ is tuple:
+                    values[name] = [get(i) for i in slot]
+                else:
+                    values[name] = None if slot < 0 else get(slot)
+            return values
+
+        def to_array(value):
+            if is_ndarray(value):
+                return value
+            import numpy
+            return numpy.asarray(value)
+
+        def as_array(i):
+            return to_array(slots[i]) if batched[i] else slots[i]
+
+        index = 0
+        row = None
+        try:
+            for index, (compute, inputs, outputs) in enumerate(self._steps):
+                state = self._states[index]
+                columns = overrides.get(index)
+                varies = columns or any(
+                    batched[i] for _, slot in inputs
+                    for i in (slot if slot.__class__ is tuple else (slot,))
+                    if i >= 0)
+
+                if not varies:
+                    result = compute(state, gather(inputs, slots.__getitem__))
+                    result = result or {}
+                    for name, slot in outputs:
+                        slots[slot] = result.get(name)
+                    continue
+
+                if state.vectorized:
+                    if columns:
+                        state = state.with_properties(
+                            {n: to_array(c) for n, c in columns.items()})
+                    result = compute(state, gather(inputs, as_array)) or {}
+                    for name, slot in outputs:
+                        value = result.get(name)
+                        if not hasattr(value, '__len__') or \
+                                len(value) != rows:
+                            raise NodeEvaluationError(
+                                'Vectorized node "{}" output "{}" must have '
+                                'a value for each of the {} rows.'.format(
+                                    state.name(), name, rows))
+                        slots[slot] = value
+                        batched[slot] = True
+                    continue
+
+                if columns:
+                    # index python values rather than numpy scalars.
+                    columns = {n: c.tolist() if is_ndarray(c) and c.ndim == 1
+                               else c for n, c in columns.items()}
+                values = {slot: [] for _, slot in outputs}
+                for row in range(rows):
+                    row_state = state
+                    if columns:
+                        row_state = state.with_properties(
+                            {n: c[row] for n, c in columns.items()})
+                    row_values = {}
+                    for name, slot in inputs:
+                        if slot.__class__ is tuple:
+                            row_values[name] = [
+                                slots[i][row] if batched[i] else slots[i]
+                                for i in slot]
+                        elif slot < 0:
+                            row_values[name] = None
+                        else:
+                            row_values[name] = (slots[slot][row]
+                                                if batched[slot]
+                                                else slots[slot])
+                    result = compute(row_state, row_values) or {}
+                    for name, slot in outputs:
+                        values[slot].append(result.get(name))
+                row = None
+                for slot, value in values.items():
+                    slots[slot] = value
+                    batched[slot] = True
+        except NodeEvaluationError:
+            raise
+        except Exception as e:
+            raise NodeEvaluationError(
+                'Failed to compute node "{}"{}: {}'.format(
+                    self._states[index].name(),
+                    '' if row is None else ' (row {})'.format(row), e)) from e
+        return [slots[i] if batched[i] else [slots[i]] * rows
+                for i in self._output_slots]
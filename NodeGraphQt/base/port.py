@@ -50,6 +50,16 @@ class Port(object):
         """
         return self.__view
 
+    def set_view(self, item):
+        """
+        Set a new ``QGraphicsItem`` item to be used as the port view.
+        (the port item must belong to the node item of the parent node.)
+
+        Args:
+            item (NodeGraphQt.qgraphics.port.PortItem): port item.
+        """
+        self.__view = item
+
     @property
     def model(self):
         """
@@ -210,6 +220,36 @@ class Port(object):
                     ports.append(node.inputs()[port_name])
         return ports
 
+    def _acyclic_check(self, port):
+        """
+        Validate the port connection, so it doesn't loop itself.
+        (the port models are checked if the node graph is headless)
+
+        Args:
+            port (NodeGraphQt.Port): port object.
+
+        Returns:
+            bool: True if port connection is valid.
+        """
+        viewer = self.node().graph.viewer()
+        if viewer:
+            return viewer.acyclic_check(self.view, port.view)
+
+        start_node = self.node()
+        check_nodes = [port.node()]
+        while check_nodes:
+            check_node = check_nodes.pop(0)
+            if port.type_() == PortTypeEnum.IN.value:
+                check_ports = check_node.output_ports()
+            else:
+                check_ports = check_node.input_ports()
+            for check_port in check_ports:
+                for connected_port in check_port.connected_ports():
+                    if connected_port.node() is start_node:
+                        return False
+                    check_nodes.append(connected_port.node())
+        return True
+
     def connect_to(self, port=None, push_undo=True, emit_signal=True):
         """
         Create connection to the specified port and emits the
@@ -261,7 +301,6 @@ class Port(object):
 
         # make the connection from here.
         graph = self.node().graph
-        viewer = graph.viewer()
 
         if push_undo:
             undo_stack = graph.undo_stack()
@@ -285,7 +324,7 @@ class Port(object):
                     NodeInputDisconnectedCmd(self, port).redo()
             return
 
-        if graph.acyclic() and viewer.acyclic_check(self.view, port.view):
+        if graph.acyclic() and self._acyclic_check(port):
             if pre_conn_port:
                 if push_undo:
                     undo_stack.push(
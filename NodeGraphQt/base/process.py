@@ -0,0 +1,232 @@
+#!/usr/bin/python
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = shared_memory = None
+
+from NodeGraphQt.base.headless import headless_nodes
+
+# arrays smaller than this are pickled with the rest of the output values.
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+
+# shared memory blocks released by their arrays waiting to be closed.
+_released_blocks = []
+
+
+def is_ndarray(value):
+    """
+    Returns true if the value is a NumPy array (without importing NumPy).
+
+    Args:
+        value (object): value.
+
+    Returns:
+        bool: true if a NumPy array.
+    """
+    value_type = type(value)
+    return (value_type.__name__ == 'ndarray' and
+            value_type.__module__ == 'numpy')
+
+
+def _close_released_blocks():
+    """
+    Close the shared memory blocks whose arrays have been deleted.
+    """
+    while _released_blocks:
+        _released_blocks.pop().close()
+
+
+class SharedArray(object):
+    """
+    Reference to a NumPy array stored in a shared memory block, the array
+    is loaded without copying the data.
+
+    Args:
+        name (str): shared memory block name.
+        shape (tuple): array shape.
+        dtype (str): array data type string.
+    """
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def __repr__(self):
+        return '<{}("{}", {}, "{}") object at {}>'.format(
+            self.__class__.__name__, self.name, self.shape, self.dtype,
+            hex(id(self)))
+
+    @classmethod
+    def share(cls, array):
+        """
+        Copy an array into a new shared memory block.
+
+        Args:
+            array (numpy.ndarray): array.
+
+        Returns:
+            SharedArray: shared array reference.
+        """
+        import numpy
+        block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+        shared = numpy.ndarray(array.shape, dtype=array.dtype,
+                               buffer=block.buf)
+        shared[...] = array
+        del shared
+        block.close()
+        return cls(block.name, array.shape, array.dtype.str)
+
+    def load(self):
+        """
+        Map the shared memory block as a NumPy array, the block is unlinked
+        and freed once the array is deleted.
+
+        Returns:
+            numpy.ndarray: array.
+        """
+        import numpy
+        _close_released_blocks()
+        block = shared_memory.SharedMemory(name=self.name)
+        array = numpy.ndarray(self.shape, dtype=self.dtype, buffer=block.buf)
+        block.unlink()
+        # the block can't be closed while the array still holds its buffer
+        # so it's closed on the next load.
+        weakref.finalize(array, _released_blocks.append, block)
+        return array
+
+    def unlink(self):
+        """
+        Free the shared memory block without loading the array.
+        """
+        try:
+            block = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        block.close()
+        block.unlink()
+
+
+def create_process_pool(max_workers):
+    """
+    Create the process pool the nodes are computed in.
+
+    Args:
+        max_workers (int): number of worker processes.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: process pool.
+    """
+    if resource_tracker is not None and os.name != 'nt':
+        # start the tracker before the workers so they share it and the
+        # shared memory blocks they create are released by the unlink in
+        # this process.
+        resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def share_outputs(outputs, min_bytes=SHARED_MEMORY_MIN_BYTES):
+    """
+    Replace the NumPy arrays in the node output values with shared memory
+    references.
+
+    Note:
+        Arrays are pickled on Windows where the shared memory is freed when
+        the worker process closes it.
+
+    Args:
+        outputs (dict): {<output_port_name>: <value>}
+        min_bytes (int): min array size to share.
+
+    Returns:
+        dict: {<output_port_name>: <value or SharedArray>}
+    """
+    if shared_memory is None or os.name == 'nt':
+        return outputs
+    shared = {}
+    try:
+        for name, value in outputs.items():
+            if (is_ndarray(value) and not value.dtype.hasobject and
+                    value.nbytes >= max(min_bytes, 1)):
+                value = SharedArray.share(value)
+            shared[name] = value
+    except Exception:
+        release_outputs(shared)
+        raise
+    return shared
+
+
+def load_outputs(outputs):
+    """
+    Load the shared memory references in the node output values.
+
+    Args:
+        outputs (dict): {<output_port_name>: <value or SharedArray>}
+
+    Returns:
+        dict: {<output_port_name>: <value>}
+    """
+    if not any(isinstance(v, SharedArray) for v in outputs.values()):
+        return outputs
+    return {name: value.load() if isinstance(value, SharedArray) else value
+            for name, value in outputs.items()}
+
+
+def release_outputs(outputs):
+    """
+    Free the shared memory blocks referenced in node output values that
+    won't be loaded.
+
+    Args:
+        outputs (dict): {<output_port_name>: <value or SharedArray>}
+    """
+    for value in outputs.values():
+        if isinstance(value, SharedArray):
+            value.unlink()
+
+
+def release_future_outputs(future):
+    """
+    Done callback for the computation future of a failed or cancelled
+    evaluation that frees the shared memory blocks of its output values.
+
+    Args:
+        future (concurrent.futures.Future): node computation future.
+    """
+    if future.cancelled() or future.exception() is not None:
+        return
+    outputs = future.result()
+    if isinstance(outputs, dict):
+        release_outputs(outputs)
+
+
+def compute_in_process(node_cls, node_data, inputs):
+    """
+    Compute a node in a worker process.
+
+    The node is created headless from its class and the properties from
+    the serialized node model data are set before it's computed.
+
+    Args:
+        node_cls (type): node class.
+        node_data (dict): serialized node data from ``NodeModel.to_dict``.
+        inputs (dict): {<input_port_name>: <value>}
+
+    Returns:
+        dict: {<output_port_name>: <value or SharedArray>}
+    """
+    from NodeGraphQt.base.evaluation import GraphEvaluator
+
+    with headless_nodes():
+        node = node_cls()
+    model = node.model
+    for name in model.properties.keys():
+        if name in node_data and name not in ('inputs', 'outputs'):
+            model.set_property(name, node_data[name])
+    for name, value in node_data.get('custom', {}).items():
+        model.set_property(name, value)
+    return share_outputs(GraphEvaluator.compute_node(node, inputs))
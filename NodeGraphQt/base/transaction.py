@@ -0,0 +1,132 @@
+#!/usr/bin/python
+from collections import OrderedDict
+
+
+class SignalBatch(object):
+    """
+    Queue of the node graph signals emitted during a
+    :meth:`NodeGraph.transaction` that are flushed when the transaction is
+    closed, once as the per item signals and once as batched signals.
+
+    Events that cancel each other out (eg. a node created then deleted or a
+    port connected then disconnected) are dropped and repeated property
+    changes on a node are only reported once.
+    """
+
+    NODE_SIGNALS = {'node_created': 'created', 'nodes_deleted': 'deleted'}
+    PORT_SIGNALS = {'port_connected': 'connected',
+                    'port_disconnected': 'disconnected'}
+    PROPERTY_SIGNALS = ('property_changed', 'properties_changed')
+
+    def __init__(self):
+        self.depth = 0
+        self._nodes = OrderedDict()
+        self._connections = OrderedDict()
+        self._prop_names = OrderedDict()
+
+    @staticmethod
+    def _track(events, key, event, item=None):
+        """
+        Record the first and last event for a key.
+
+        Args:
+            events (OrderedDict): tracked events.
+            key (object): event key.
+            event (str): event name.
+            item (object): object to report with the event.
+        """
+        if key in events:
+            events[key][1] = event
+            events[key][2] = item
+        else:
+            events[key] = [event, event, item]
+
+    @staticmethod
+    def _net_events(events, event):
+        """
+        Returns the items where the event is the net result of the
+        recorded events.
+
+        Args:
+            events (OrderedDict): tracked events.
+            event (str): event name.
+
+        Returns:
+            list: event items.
+        """
+        return [item for first, last, item in events.values()
+                if first == last == event]
+
+    def queue(self, name, args):
+        """
+        Queue a graph signal.
+
+        Args:
+            name (str): signal name.
+            args (tuple): signal arguments.
+
+        Returns:
+            bool: false if the signal isn't batched and should be emitted.
+        """
+        if name in self.NODE_SIGNALS:
+            event = self.NODE_SIGNALS[name]
+            if event == 'created':
+                self._track(self._nodes, args[0].id, event, args[0])
+            else:
+                for node_id in args[0]:
+                    self._track(self._nodes, node_id, event, node_id)
+        elif name in self.PORT_SIGNALS:
+            self._track(self._connections, args,
+                        self.PORT_SIGNALS[name], args)
+        elif name in self.PROPERTY_SIGNALS:
+            if name == 'property_changed':
+                node_ids, prop_names = [args[0].id], [args[1]]
+            else:
+                node_ids, prop_names = args
+            for node_id in node_ids:
+                self._prop_names.setdefault(node_id, set()).update(prop_names)
+        else:
+            return False
+        return True
+
+    def flush(self, graph):
+        """
+        Emit the batched signals from the node graph.
+
+        Args:
+            graph (NodeGraphQt.NodeGraph): node graph.
+        """
+        deleted_ids = self._net_events(self._nodes, 'deleted')
+        created_nodes = self._net_events(self._nodes, 'created')
+        disconnected = self._net_events(self._connections, 'disconnected')
+        connected = self._net_events(self._connections, 'connected')
+
+        # created nodes are reported with their current state so only the
+        # property changes on pre-existing nodes are emitted.
+        created_ids = set(n.id for n in created_nodes)
+        prop_nodes = [graph.get_node_by_id(n_id) for n_id in self._prop_names
+                      if n_id not in created_ids]
+        prop_nodes = [n for n in prop_nodes if n]
+        prop_names = set()
+        for node in prop_nodes:
+            prop_names.update(self._prop_names[node.id])
+
+        if deleted_ids:
+            graph.nodes_deleted.emit(deleted_ids)
+        for node in created_nodes:
+            graph.node_created.emit(node)
+        if created_nodes:
+            graph.nodes_created.emit(created_nodes)
+        for ports in disconnected:
+            graph.port_disconnected.emit(*ports)
+        for ports in connected:
+            graph.port_connected.emit(*ports)
+        if disconnected or connected:
+            graph.connections_changed.emit(disconnected, connected)
+        for node in prop_nodes:
+            for name in sorted(self._prop_names[node.id]):
+                graph.property_changed.emit(
+                    node, name, node.get_property(name))
+        if prop_nodes:
+            graph.properties_changed.emit([n.id for n in prop_nodes],
+                                          sorted(prop_names))
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 import os
 
-from Qt import QtWidgets
+from Qt import QtCore, QtWidgets
 from enum import Enum
 
 from .pkg_info import __version__ as _v
@@ -18,6 +18,9 @@ MIME_TYPE = 'nodegraphqt/nodes'
 URI_SCHEME = 'nodegraphqt://'
 URN_SCHEME = 'nodegraphqt::'
 
+# QT VERSION (major, minor)
+QT_VERSION = tuple(int(v) for v in QtCore.qVersion().split('.')[:2])
+
 # PATHS
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
 ICON_PATH = os.path.join(BASE_PATH, 'widgets', 'icons')
@@ -141,6 +144,9 @@ class PortEnum(Enum):
     HOVER_BORDER_COLOR = (136, 255, 35, 255)
     #: threshold for selecting a port.
     CLICK_FALLOFF = 15.0
+    #: radius (in viewer pixels) for snapping a live connection to the
+    #: nearest compatible port. (0 to disable)
+    SNAP_RADIUS = 0.0
 
 
 class PortTypeEnum(Enum):
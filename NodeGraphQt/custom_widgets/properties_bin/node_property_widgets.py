@@ -681,10 +681,13 @@ class PropertiesBinWidget(QtWidgets.QWidget):
         layout.addWidget(self._prop_list, 1)
 
         # wire up node graph.
+        self._node_graph = node_graph
         node_graph.add_properties_bin(self)
         node_graph.node_double_clicked.connect(self.add_node)
         node_graph.nodes_deleted.connect(self.__on_nodes_deleted)
         node_graph.property_changed.connect(self.__on_graph_property_changed)
+        node_graph.properties_changed.connect(
+            self.__on_graph_properties_changed)
 
     def __repr__(self):
         return '<{} object at {}>'.format(
@@ -746,6 +749,20 @@ class PropertiesBinWidget(QtWidgets.QWidget):
         """
         Slot function that updates the property bin from the node graph signal.
 
+        Args:
+            node (NodeGraphQt.NodeObject):
+            prop_name (str): node property name.
+            prop_value (object): node property value.
+        """
+        # the properties are updated from the batched signal.
+        if self._node_graph.is_flushing_signals():
+            return
+        self._update_property_widget(node, prop_name, prop_value)
+
+    def _update_property_widget(self, node, prop_name, prop_value):
+        """
+        Update the property widget value in the node properties editor.
+
         Args:
             node (NodeGraphQt.NodeObject):
             prop_name (str): node property name.
@@ -762,6 +779,23 @@ class PropertiesBinWidget(QtWidgets.QWidget):
             property_widget.set_value(prop_value)
             self._block_signal = False
 
+    def __on_graph_properties_changed(self, node_ids, prop_names):
+        """
+        Slot function that updates the property bin when properties have
+        been changed on multiple nodes.
+
+        Args:
+            node_ids (list[str]): node ids.
+            prop_names (list[str]): node property names.
+        """
+        for node_id in node_ids:
+            if not self.get_property_editor_widget(node_id):
+                continue
+            node = self._node_graph.get_node_by_id(node_id)
+            for prop_name in prop_names:
+                self._update_property_widget(
+                    node, prop_name, node.get_property(prop_name))
+
     def __on_property_widget_changed(self, node_id, prop_name, prop_value):
         """
         Slot function triggered when a property widget value has changed.
@@ -58,6 +58,36 @@ class BaseNode(NodeObject):
 
     NODE_NAME = 'Node'
 
+    PROCESS_SAFE = False
+    """
+    Set to ``True`` if the node :meth:`BaseNode.compute` function only uses
+    the node properties and input values so it can be computed in a worker
+    process when :meth:`NodeGraph.set_evaluation_processes` is set.
+
+    The node is created in the worker process from its class and serialized
+    model data so the class must be importable and the property and input
+    values picklable.
+    """
+
+    COMPUTE_TIMEOUT = None
+    """
+    Max seconds the node :meth:`BaseNode.compute` function can take when
+    the graph is evaluated (``None`` uses the
+    :meth:`NodeGraph.set_evaluation_timeout` timeout).
+    """
+
+    VECTORIZED = False
+    """
+    Set to ``True`` if the node :meth:`BaseNode.compute` function accepts
+    NumPy arrays so :meth:`NodeGraph.evaluate_batch` computes all the rows
+    in a single call, the properties overridden by the batch table and the
+    input values that vary between rows are passed as arrays (one value per
+    row along the first axis) and the output values must be arrays with a
+    value per row.
+
+    Nodes that aren't vectorized are computed once per row.
+    """
+
     def __init__(self, qgraphics_item=None):
         super(BaseNode, self).__init__(qgraphics_item or NodeItem)
         self._inputs = []
@@ -174,6 +204,36 @@ class BaseNode(NodeObject):
         """
         return self.view.widgets.get(name)
 
+    def _link_widget(self, widget):
+        """
+        Link an embedded node widget to the node.
+
+        Widget value changes are set on the node the widget is linked to at
+        the time of the change so the node items can be moved to another
+        node object (see :func:`NodeGraphQt.base.commands.rebuild_node`),
+        consecutive changes are merged into one undo command.
+
+        Args:
+            widget (NodeBaseWidget): node widget.
+        """
+        widget._node = self
+        widget.value_changed.connect(
+            lambda k, v: widget.node._on_widget_value_changed(k, v))
+
+    def _on_widget_value_changed(self, name, value):
+        """
+        Slot called when an embedded node widget value has changed.
+
+        Args:
+            name (str): property name.
+            value (object): property value.
+        """
+        if self.graph is None:
+            self.set_property(name, value)
+            return
+        with self.graph.merge_property_edits():
+            self.set_property(name, value)
+
     def add_custom_widget(self, widget, widget_type=None, tab=None):
         """
         Add a custom node widget into the node.
@@ -200,8 +260,9 @@ class BaseNode(NodeObject):
                              widget.get_value(),
                              widget_type=widget_type,
                              tab=tab)
-        widget.value_changed.connect(lambda k, v: self.set_property(k, v))
-        widget._node = self
+        if self.is_headless():
+            return
+        self._link_widget(widget)
         self.view.add_widget(widget)
         #: redraw node to address calls outside the "__init__" func.
         self.view.draw_node()
@@ -236,9 +297,11 @@ class BaseNode(NodeObject):
             widget_tooltip=tooltip,
             tab=tab
         )
+        if self.is_headless():
+            return
         widget = NodeComboBox(self.view, name, label, items)
         widget.setToolTip(tooltip or '')
-        widget.value_changed.connect(lambda k, v: self.set_property(k, v))
+        self._link_widget(widget)
         self.view.add_widget(widget)
         #: redraw node to address calls outside the "__init__" func.
         self.view.draw_node()
@@ -269,9 +332,11 @@ class BaseNode(NodeObject):
             widget_tooltip=tooltip,
             tab=tab
         )
+        if self.is_headless():
+            return
         widget = NodeLineEdit(self.view, name, label, text, placeholder_text)
         widget.setToolTip(tooltip or '')
-        widget.value_changed.connect(lambda k, v: self.set_property(k, v))
+        self._link_widget(widget)
         self.view.add_widget(widget)
         #: redraw node to address calls outside the "__init__" func.
         self.view.draw_node()
@@ -308,9 +373,11 @@ class BaseNode(NodeObject):
             widget_tooltip=tooltip,
             tab=tab
         )
+        if self.is_headless():
+            return
         widget = NodeSpinBox(self.view,  name, label, 0,min_value, max_value ,double)
         widget.setToolTip(tooltip or '')
-        widget.value_changed.connect(lambda k, v: self.set_property(k, v))
+        self._link_widget(widget)
         self.view.add_widget(widget)
         #: redraw node to address calls outside the "__init__" func.
         self.view.draw_node()
@@ -332,6 +399,8 @@ class BaseNode(NodeObject):
         # This would create the button widget internally.
         # Unlike a checkbox, a button doesn't store a value, so we don't
         # call self.create_property().
+        if self.is_headless():
+            return
         widget = NodeButton(self.view, name, label, text)
         widget.setToolTip(tooltip or '')
 
@@ -366,9 +435,11 @@ class BaseNode(NodeObject):
             widget_tooltip=tooltip,
             tab=tab
         )
+        if self.is_headless():
+            return
         widget = NodeCheckBox(self.view, name, label, text, state)
         widget.setToolTip(tooltip or '')
-        widget.value_changed.connect(lambda k, v: self.set_property(k, v))
+        self._link_widget(widget)
         self.view.add_widget(widget)
         #: redraw node to address calls outside the "__init__" func.
         self.view.draw_node()
@@ -940,3 +1011,47 @@ class BaseNode(NodeObject):
             out_port (NodeGraphQt.Port): output port that was disconnected.
         """
         return
+
+    def compute(self, inputs):
+        """
+        Compute the node output values from its input values when the node
+        graph is evaluated.
+
+        *The default of this function does nothing re-implement if the node
+        is evaluated.*
+
+        The function can also be a coroutine (``async def compute``) in
+        which case it's awaited on the evaluation event loop alongside the
+        other async nodes.
+
+        .. code-block:: python
+            :linenos:
+
+            class AddNode(BaseNode):
+
+                __identifier__ = 'io.github.jchanvfx'
+                NODE_NAME = 'Add'
+
+                def __init__(self):
+                    super(AddNode, self).__init__()
+                    self.add_input('a')
+                    self.add_input('b')
+                    self.add_output('sum')
+                    self.create_property('offset', 0)
+
+                def compute(self, inputs):
+                    value = (inputs['a'] or 0) + (inputs['b'] or 0)
+                    return {'sum': value + self.get_property('offset')}
+
+        See Also:
+            :meth:`NodeGraph.evaluate`
+
+        Args:
+            inputs (dict): {<input_port_name>: <value>} values passed from
+                the connected output ports (``None`` if the port isn't
+                connected and a list of values for multi connection ports).
+
+        Returns:
+            dict: {<output_port_name>: <value>}
+        """
+        return {}
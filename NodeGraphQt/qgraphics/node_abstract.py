@@ -14,7 +14,8 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
         super(AbstractNodeItem, self).__init__(parent)
         self.setFlags(
             QtWidgets.QGraphicsItem.ItemIsSelectable |
-            QtWidgets.QGraphicsItem.ItemIsMovable
+            QtWidgets.QGraphicsItem.ItemIsMovable |
+            QtWidgets.QGraphicsItem.ItemSendsScenePositionChanges
         )
         self.setCacheMode(ITEM_CACHE_MODE)
         self.setZValue(Z_VAL_NODE)
@@ -50,6 +51,27 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
         self._properties['selected'] = True
         super(AbstractNodeItem, self).mousePressEvent(event)
 
+    def itemChange(self, change, value):
+        """
+        Re-implemented to keep the viewer item registry and spatial index
+        up to date.
+
+        Args:
+            change:
+            value:
+        """
+        if change == QtWidgets.QGraphicsItem.ItemSceneChange:
+            viewer = self.viewer()
+            if viewer:
+                viewer.unregister_item(self)
+        elif change == QtWidgets.QGraphicsItem.ItemSceneHasChanged:
+            viewer = self.viewer()
+            if viewer:
+                viewer.register_item(self)
+        elif change == QtWidgets.QGraphicsItem.ItemScenePositionHasChanged:
+            self.update_index()
+        return super(AbstractNodeItem, self).itemChange(change, value)
+
     def setSelected(self, selected):
         self._properties['selected'] = selected
         super(AbstractNodeItem, self).setSelected(selected)
@@ -63,6 +85,16 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
         """
         return
 
+    def update_index(self):
+        """
+        Flag the node item to be re-indexed in the viewer spatial index.
+
+        (called when the node is moved, resized or re-drawn.)
+        """
+        viewer = self.viewer()
+        if viewer:
+            viewer.node_index().mark_dirty(self)
+
     def pre_init(self, viewer, pos=None):
         """
         Called before node has been added into the scene.
@@ -118,6 +150,7 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
     @width.setter
     def width(self, width=0.0):
         self._width = width
+        self.update_index()
 
     @property
     def height(self):
@@ -126,6 +159,7 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
     @height.setter
     def height(self, height=0.0):
         self._height = height
+        self.update_index()
 
     @property
     def color(self):
@@ -161,6 +161,7 @@ class BackdropNodeItem(AbstractNodeItem):
     def on_sizer_pos_changed(self, pos):
         self._width = pos.x() + self._sizer.size
         self._height = pos.y() + self._sizer.size
+        self.update_index()
         self.update()
 
     def on_sizer_pos_mouse_release(self):
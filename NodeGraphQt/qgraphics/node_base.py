@@ -704,12 +704,16 @@ class NodeItem(AbstractNodeItem):
         Re-draw the node item in the scene with proper
         calculated size and widgets aligned.
         """
+        viewer = self.viewer()
+        if viewer and viewer.defer_draw(self):
+            return
         if self.layout_direction is LayoutDirectionEnum.HORIZONTAL.value:
             self._draw_node_horizontal()
         elif self.layout_direction is LayoutDirectionEnum.VERTICAL.value:
             self._draw_node_vertical()
         else:
             raise RuntimeError('Node graph layout direction not valid!')
+        self.update_index()
 
     def post_init(self, viewer=None, pos=None):
         """
@@ -992,10 +996,12 @@ class NodeItem(AbstractNodeItem):
             port (PortItem): port object.
             text (QtWidgets.QGraphicsTextItem): port text object.
         """
+        self.update_index()
         port.setParentItem(None)
         text.setParentItem(None)
-        self.scene().removeItem(port)
-        self.scene().removeItem(text)
+        if self.scene():
+            self.scene().removeItem(port)
+            self.scene().removeItem(text)
         del port
         del text
 
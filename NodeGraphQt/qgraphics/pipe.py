@@ -79,6 +79,14 @@ class PipeItem(QtWidgets.QGraphicsPathItem):
                 self.highlight()
             else:
                 self.reset()
+        elif change == QtWidgets.QGraphicsPathItem.ItemSceneChange:
+            viewer = self.viewer()
+            if viewer:
+                viewer.unregister_item(self)
+        elif change == QtWidgets.QGraphicsPathItem.ItemSceneHasChanged:
+            viewer = self.viewer()
+            if viewer:
+                viewer.register_item(self)
         return super(PipeItem, self).itemChange(change, value)
 
     def paint(self, painter, option, widget):
@@ -303,6 +311,12 @@ class PipeItem(QtWidgets.QGraphicsPathItem):
         if not start_port:
             return
 
+        # connected pipes are re-drawn once updates are resumed.
+        if cursor_pos is None and self.input_port and self.output_port:
+            viewer = self.viewer()
+            if viewer and viewer.defer_draw(self):
+                return
+
         # get start / end positions.
         pos1 = start_port.scenePos()
         pos1.setX(pos1.x() + (start_port.boundingRect().width() / 2))
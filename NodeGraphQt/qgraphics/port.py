@@ -116,6 +116,8 @@ class PortItem(QtWidgets.QGraphicsItem):
     def itemChange(self, change, value):
         if change == QtWidgets.QGraphicsItem.ItemScenePositionHasChanged:
             self.redraw_connected_pipes()
+            if self.node:
+                self.node.update_index()
         return super(PortItem, self).itemChange(change, value)
 
     def mousePressEvent(self, event):
@@ -58,7 +58,10 @@ class _NodeGroupBox(QtWidgets.QGroupBox):
                 style += '  {}:{};\n'.format(elm_name, elm_val)
             style += '}\n'
             stylesheet += style
-        self.setStyleSheet(stylesheet)
+        # re-applying a style sheet re-polishes the widget so only set it if
+        # it has changed (this is called every time the node is drawn).
+        if stylesheet != self.styleSheet():
+            self.setStyleSheet(stylesheet)
 
     def add_node_widget(self, widget):
         self.layout().addWidget(widget)
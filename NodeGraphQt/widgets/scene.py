@@ -1,8 +1,14 @@
 #!/usr/bin/python
+import math
+
 from Qt import QtGui, QtCore, QtWidgets
 
 from NodeGraphQt.constants import ViewerEnum
 
+# the zoom level used for the grid tile is rounded to this many steps per
+# doubling of the viewer scale so zooming reuses the cached tile.
+GRID_TILE_ZOOM_STEPS = 4
+
 
 class NodeScene(QtWidgets.QGraphicsScene):
 
@@ -11,6 +17,8 @@ class NodeScene(QtWidgets.QGraphicsScene):
         self._grid_mode = ViewerEnum.GRID_DISPLAY_LINES.value
         self._grid_color = ViewerEnum.GRID_COLOR.value
         self._bg_color = ViewerEnum.BACKGROUND_COLOR.value
+        self._grid_tile_key = None
+        self._grid_tile_brush = None
         self.setBackgroundBrush(QtGui.QColor(*self._bg_color))
 
     def __repr__(self):
@@ -58,62 +66,106 @@ class NodeScene(QtWidgets.QGraphicsScene):
         painter.setPen(pen)
         painter.drawLines(lines)
 
-    def _draw_dots(self, painter, rect, pen, grid_size):
-        """
-        draws the grid dots in the scene.
-
-        Args:
-            painter (QtGui.QPainter): painter object.
-            rect (QtCore.QRectF): rect object.
-            pen (QtGui.QPen): pen object.
-            grid_size (int): grid size.
+    def _build_grid_tile(self, zoom):
         """
-        zoom = self.viewer().get_zoom()
-        if zoom < 0:
-            grid_size = int(abs(zoom) / 0.3 + 1) * grid_size
-
-        left = int(rect.left())
-        right = int(rect.right())
-        top = int(rect.top())
-        bottom = int(rect.bottom())
-
-        first_left = left - (left % grid_size)
-        first_top = top - (top % grid_size)
+        Renders a single repeating tile of the current grid pattern into a
+        pixmap and returns it as a texture brush aligned to the scene origin.
 
-        pen.setWidth(grid_size / 10)
-        painter.setPen(pen)
+        The tile is rendered at the (rounded) zoom resolution so the brush
+        maps close to one tile pixel to one screen pixel when painted.
 
-        [painter.drawPoint(int(x), int(y))
-         for x in range(first_left, right, grid_size)
-         for y in range(first_top, bottom, grid_size)]
-
-    def drawBackground(self, painter, rect):
-        super(NodeScene, self).drawBackground(painter, rect)
+        Args:
+            zoom (float): current viewer zoom value.
 
-        painter.save()
+        Returns:
+            QtGui.QBrush: texture brush or None if no grid is displayed.
+        """
+        grid_size = ViewerEnum.GRID_SIZE.value
+        if self._grid_mode == ViewerEnum.GRID_DISPLAY_DOTS.value:
+            if zoom < 0:
+                grid_size = int(abs(zoom) / 0.3 + 1) * grid_size
+            tile_size = grid_size
+        elif self._grid_mode == ViewerEnum.GRID_DISPLAY_LINES.value:
+            tile_size = grid_size * 8
+        else:
+            return
+
+        # the grid origin is drawn half a grid step inside the tile so lines
+        # and dots are never clipped by the tile edges.
+        offset = grid_size / 2.0
+        scale = max(zoom + 1.0, 0.01)
+        pixel_size = max(int(round(tile_size * scale)), 1)
+        scale = pixel_size / float(tile_size)
+
+        pixmap = QtGui.QPixmap(pixel_size, pixel_size)
+        pixmap.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
         painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
-        painter.setBrush(self.backgroundBrush())
+        painter.scale(scale, scale)
+        painter.translate(offset, offset)
+        tile_rect = QtCore.QRectF(0, 0, tile_size, tile_size)
 
-        if self._grid_mode is ViewerEnum.GRID_DISPLAY_DOTS.value:
+        if self._grid_mode == ViewerEnum.GRID_DISPLAY_DOTS.value:
             pen = QtGui.QPen(QtGui.QColor(*self.grid_color), 0.65)
-            self._draw_dots(painter, rect, pen, ViewerEnum.GRID_SIZE.value)
-
-        elif self._grid_mode is ViewerEnum.GRID_DISPLAY_LINES.value:
-            zoom = self.viewer().get_zoom()
+            pen.setWidthF(grid_size / 10.0)
+            painter.setPen(pen)
+            painter.drawPoint(QtCore.QPointF(0.0, 0.0))
+        else:
             if zoom > -0.5:
                 pen = QtGui.QPen(QtGui.QColor(*self.grid_color), 0.65)
                 self._draw_grid(
-                    painter, rect, pen, ViewerEnum.GRID_SIZE.value
+                    painter, tile_rect.translated(-offset, -offset),
+                    pen, grid_size
                 )
-
             color = QtGui.QColor(*self._bg_color).darker(200)
             if zoom < -0.0:
                 color = color.darker(100 - int(zoom * 110))
             pen = QtGui.QPen(color, 0.65)
-            self._draw_grid(
-                painter, rect, pen, ViewerEnum.GRID_SIZE.value * 8
-            )
+            painter.setPen(pen)
+            painter.drawLines([QtCore.QLineF(0, -offset, 0, tile_size),
+                               QtCore.QLineF(-offset, 0, tile_size, 0)])
+        painter.end()
+
+        brush = QtGui.QBrush(pixmap)
+        brush.setTransform(
+            QtGui.QTransform.fromScale(1.0 / scale, 1.0 / scale) *
+            QtGui.QTransform.fromTranslate(-offset, -offset)
+        )
+        return brush
+
+    @staticmethod
+    def _grid_tile_zoom(zoom):
+        """
+        Round the viewer zoom value to the zoom level the grid tile is
+        rendered at.
+
+        Args:
+            zoom (float): viewer zoom value.
+
+        Returns:
+            float: rounded zoom value.
+        """
+        step = round(math.log(max(zoom + 1.0, 0.01), 2) * GRID_TILE_ZOOM_STEPS)
+        return 2.0 ** (step / float(GRID_TILE_ZOOM_STEPS)) - 1.0
+
+    def drawBackground(self, painter, rect):
+        super(NodeScene, self).drawBackground(painter, rect)
+
+        if self._grid_mode == ViewerEnum.GRID_DISPLAY_NONE.value:
+            return
+
+        zoom = self._grid_tile_zoom(self.viewer().get_zoom())
+        tile_key = (self._grid_mode, zoom,
+                    tuple(self._grid_color), tuple(self._bg_color))
+        if tile_key != self._grid_tile_key:
+            self._grid_tile_key = tile_key
+            self._grid_tile_brush = self._build_grid_tile(zoom)
+        if self._grid_tile_brush is None:
+            return
 
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+        painter.fillRect(rect, self._grid_tile_brush)
         painter.restore()
 
     def mousePressEvent(self, event):
@@ -0,0 +1,404 @@
+#!/usr/bin/python
+import math
+from collections import defaultdict
+
+
+def intersects(rect1, rect2):
+    """
+    Check if two rects intersect.
+
+    Args:
+        rect1 (tuple[float]): (left, top, right, bottom) rect.
+        rect2 (tuple[float]): (left, top, right, bottom) rect.
+
+    Returns:
+        bool: true if the rects intersect.
+    """
+    return (rect1[0] <= rect2[2] and rect1[2] >= rect2[0] and
+            rect1[1] <= rect2[3] and rect1[3] >= rect2[1])
+
+
+def subtract_rect(rect1, rect2):
+    """
+    Returns the area of the first rect not covered by the second rect as a
+    list of (up to 4) rects.
+
+    Args:
+        rect1 (tuple[float]): (left, top, right, bottom) rect.
+        rect2 (tuple[float]): (left, top, right, bottom) rect.
+
+    Returns:
+        list[tuple[float]]: list of (left, top, right, bottom) rects.
+    """
+    if not intersects(rect1, rect2):
+        return [rect1]
+    left, top, right, bottom = rect1
+    rects = []
+    if top < rect2[1]:
+        rects.append((left, top, right, rect2[1]))
+    if bottom > rect2[3]:
+        rects.append((left, rect2[3], right, bottom))
+    mid_top, mid_bottom = max(top, rect2[1]), min(bottom, rect2[3])
+    if left < rect2[0]:
+        rects.append((left, mid_top, rect2[0], mid_bottom))
+    if right > rect2[2]:
+        rects.append((rect2[2], mid_top, right, mid_bottom))
+    return rects
+
+
+class SpatialIndex(object):
+    """
+    Uniform grid (spatial hash) index of item bounding rects.
+
+    Items are bucketed into square cells by their bounding rect so area and
+    point lookups only have to test the items in the overlapping cells
+    instead of every item in the scene.
+
+    Args:
+        cell_size (float): width and height of a grid cell in scene units.
+    """
+
+    def __init__(self, cell_size=128.0):
+        self._cell_size = float(cell_size)
+        self._rects = {}
+        self._cells = defaultdict(set)
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, item):
+        return item in self._rects
+
+    def __iter__(self):
+        return iter(list(self._rects.keys()))
+
+    def _cell_range(self, rect):
+        """
+        Returns the range of grid cells covered by the rect.
+
+        Args:
+            rect (tuple[float]): (left, top, right, bottom) rect.
+
+        Returns:
+            tuple[int]: (first column, first row, last column, last row).
+        """
+        size = self._cell_size
+        return (int(math.floor(rect[0] / size)),
+                int(math.floor(rect[1] / size)),
+                int(math.floor(rect[2] / size)),
+                int(math.floor(rect[3] / size)))
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def rect(self, item):
+        """
+        Returns the indexed bounding rect of an item.
+
+        Args:
+            item (object): indexed item.
+
+        Returns:
+            tuple[float]: (left, top, right, bottom) rect or None.
+        """
+        return self._rects.get(item)
+
+    def insert(self, item, rect):
+        """
+        Add an item to the index or update its bounding rect if the item
+        is already indexed.
+
+        Args:
+            item (object): item to index.
+            rect (tuple[float]): (left, top, right, bottom) rect.
+        """
+        rect = tuple(rect)
+        prev_rect = self._rects.get(item)
+        if prev_rect == rect:
+            return
+        if prev_rect is not None:
+            if self._cell_range(prev_rect) == self._cell_range(rect):
+                self._rects[item] = rect
+                return
+            self.remove(item)
+        self._rects[item] = rect
+        c1, r1, c2, r2 = self._cell_range(rect)
+        for col in range(c1, c2 + 1):
+            for row in range(r1, r2 + 1):
+                self._cells[(col, row)].add(item)
+
+    def remove(self, item):
+        """
+        Remove an item from the index.
+
+        Args:
+            item (object): indexed item.
+        """
+        rect = self._rects.pop(item, None)
+        if rect is None:
+            return
+        c1, r1, c2, r2 = self._cell_range(rect)
+        for col in range(c1, c2 + 1):
+            for row in range(r1, r2 + 1):
+                cell = self._cells.get((col, row))
+                if cell is None:
+                    continue
+                cell.discard(item)
+                if not cell:
+                    del self._cells[(col, row)]
+
+    def clear(self):
+        """
+        Remove all items from the index.
+        """
+        self._rects.clear()
+        self._cells.clear()
+
+    def query(self, rect):
+        """
+        Returns all items with a bounding rect intersecting the rect.
+
+        Args:
+            rect (tuple[float]): (left, top, right, bottom) rect.
+
+        Returns:
+            list: indexed items.
+        """
+        c1, r1, c2, r2 = self._cell_range(rect)
+        if (c2 - c1 + 1) * (r2 - r1 + 1) > len(self._cells):
+            candidates = self._rects.keys()
+        else:
+            candidates = set()
+            for col in range(c1, c2 + 1):
+                for row in range(r1, r2 + 1):
+                    cell = self._cells.get((col, row))
+                    if cell:
+                        candidates.update(cell)
+        return [i for i in candidates if intersects(self._rects[i], rect)]
+
+    def query_point(self, x, y):
+        """
+        Returns all items with a bounding rect containing the point.
+
+        Args:
+            x (float): x position.
+            y (float): y position.
+
+        Returns:
+            list: indexed items.
+        """
+        size = self._cell_size
+        cell = self._cells.get(
+            (int(math.floor(x / size)), int(math.floor(y / size)))
+        )
+        if not cell:
+            return []
+        items = []
+        for item in cell:
+            x1, y1, x2, y2 = self._rects[item]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                items.append(item)
+        return items
+
+    def nearest(self, x, y, radius, predicate=None):
+        """
+        Returns the item with the bounding rect center closest to the point
+        within the search radius.
+
+        Args:
+            x (float): x position.
+            y (float): y position.
+            radius (float): search radius.
+            predicate (function): optional filter ``predicate(item) -> bool``.
+
+        Returns:
+            object: the closest item or None.
+        """
+        rect = (x - radius, y - radius, x + radius, y + radius)
+        candidates = []
+        for item in self.query(rect):
+            x1, y1, x2, y2 = self._rects[item]
+            dist = math.hypot((x1 + x2) / 2.0 - x, (y1 + y2) / 2.0 - y)
+            if dist <= radius:
+                candidates.append((dist, item))
+        # the predicate can be expensive so only test the closest first.
+        for _dist, item in sorted(candidates, key=lambda c: c[0]):
+            if predicate is None or predicate(item):
+                return item
+
+
+class NodeItemIndex(object):
+    """
+    Spatial index of the node items and port items in a viewer.
+
+    Node items flag themselves as dirty when they are moved, resized or
+    re-drawn and are re-indexed (along with their ports) lazily on the next
+    query so dragging nodes doesn't pay for index updates per mouse move.
+    """
+
+    NODE_CELL_SIZE = 256.0
+    PORT_CELL_SIZE = 64.0
+
+    def __init__(self):
+        self._nodes = SpatialIndex(self.NODE_CELL_SIZE)
+        self._ports = SpatialIndex(self.PORT_CELL_SIZE)
+        self._node_ports = {}
+        self._dirty = set()
+
+    @staticmethod
+    def _rect_tuple(rect):
+        """
+        Args:
+            rect (QtCore.QRectF): scene rect.
+
+        Returns:
+            tuple[float]: (left, top, right, bottom) rect.
+        """
+        return rect.left(), rect.top(), rect.right(), rect.bottom()
+
+    def mark_dirty(self, node):
+        """
+        Flag a node item to be re-indexed on the next query.
+
+        Args:
+            node (AbstractNodeItem): node item.
+        """
+        self._dirty.add(node)
+
+    def discard(self, node):
+        """
+        Remove a node item and its ports from the index.
+
+        Args:
+            node (AbstractNodeItem): node item.
+        """
+        self._dirty.discard(node)
+        self._nodes.remove(node)
+        for port in self._node_ports.pop(node, []):
+            self._ports.remove(port)
+
+    def clear(self):
+        """
+        Remove all items from the index.
+        """
+        self._dirty.clear()
+        self._nodes.clear()
+        self._ports.clear()
+        self._node_ports.clear()
+
+    def flush(self):
+        """
+        Re-index all the dirty node items.
+        """
+        while self._dirty:
+            node = self._dirty.pop()
+            if node.scene() is None:
+                self.discard(node)
+                continue
+            self._nodes.insert(
+                node, self._rect_tuple(node.sceneBoundingRect())
+            )
+            ports = (list(getattr(node, 'inputs', [])) +
+                     list(getattr(node, 'outputs', [])))
+            for port in self._node_ports.get(node, []):
+                if port not in ports:
+                    self._ports.remove(port)
+            for port in ports:
+                self._ports.insert(
+                    port, self._rect_tuple(port.sceneBoundingRect())
+                )
+            self._node_ports[node] = ports
+
+    def nodes_in_rect(self, rect):
+        """
+        Returns the visible node items intersecting the scene rect.
+
+        Args:
+            rect (QtCore.QRectF): scene rect.
+
+        Returns:
+            list[AbstractNodeItem]: node items (top most first).
+        """
+        self.flush()
+        nodes = [n for n in self._nodes.query(self._rect_tuple(rect))
+                 if n.isVisible()]
+        return sorted(nodes, key=lambda n: n.zValue(), reverse=True)
+
+    def nodes_in_rect_delta(self, rect, prev_rect, prev_nodes):
+        """
+        Returns the visible node items intersecting the scene rect computed
+        incrementally from the node items that intersected the previous rect.
+
+        (only the area of the rect not covered by the previous rect is
+        queried from the index.)
+
+        Args:
+            rect (QtCore.QRectF): scene rect.
+            prev_rect (QtCore.QRectF): previous scene rect.
+            prev_nodes (set[AbstractNodeItem]): nodes in the previous rect.
+
+        Returns:
+            set[AbstractNodeItem]: node items.
+        """
+        self.flush()
+        rect = self._rect_tuple(rect)
+        nodes = set()
+        for node in prev_nodes:
+            node_rect = self._nodes.rect(node)
+            if node_rect and intersects(node_rect, rect):
+                nodes.add(node)
+        for area in subtract_rect(rect, self._rect_tuple(prev_rect)):
+            nodes.update(n for n in self._nodes.query(area) if n.isVisible())
+        return nodes
+
+    def ports_in_rect(self, rect):
+        """
+        Returns the visible port items intersecting the scene rect.
+
+        Args:
+            rect (QtCore.QRectF): scene rect.
+
+        Returns:
+            list[PortItem]: port items (top most first).
+        """
+        self.flush()
+        ports = [p for p in self._ports.query(self._rect_tuple(rect))
+                 if p.isVisible()]
+        return sorted(ports, key=lambda p: p.node.zValue(), reverse=True)
+
+    def ports_at(self, pos):
+        """
+        Returns the visible port items under the scene position.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+
+        Returns:
+            list[PortItem]: port items (top most first).
+        """
+        self.flush()
+        ports = [p for p in self._ports.query_point(pos.x(), pos.y())
+                 if p.isVisible()]
+        return sorted(ports, key=lambda p: p.node.zValue(), reverse=True)
+
+    def nearest_port(self, pos, radius, predicate=None):
+        """
+        Returns the visible port item closest to the scene position.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+            radius (float): search radius in scene units.
+            predicate (function): optional filter ``predicate(port) -> bool``.
+
+        Returns:
+            PortItem: closest port item or None.
+        """
+        self.flush()
+
+        def _is_valid(port):
+            if not port.isVisible():
+                return False
+            return predicate(port) if predicate else True
+
+        return self._ports.nearest(pos.x(), pos.y(), radius, _is_valid)
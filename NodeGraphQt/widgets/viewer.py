@@ -1,7 +1,6 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 import math
-from distutils.version import LooseVersion
 
 from Qt import QtGui, QtCore, QtWidgets
 
@@ -11,6 +10,8 @@ from NodeGraphQt.constants import (
     PortTypeEnum,
     PipeEnum,
     PipeLayoutEnum,
+    PortEnum,
+    QT_VERSION,
     ViewerEnum,
     Z_VAL_PIPE,
 )
@@ -21,11 +22,15 @@ from NodeGraphQt.qgraphics.port import PortItem
 from NodeGraphQt.qgraphics.slicer import SlicerPipeItem
 from NodeGraphQt.widgets.dialogs import BaseDialog, FileDialog
 from NodeGraphQt.widgets.scene import NodeScene
+from NodeGraphQt.widgets.spatial_index import NodeItemIndex
 from NodeGraphQt.widgets.tab_search import TabSearchMenuWidget
 
 ZOOM_MIN = -0.95
 ZOOM_MAX = 2.0
 
+# minimum interval (ms) between rubber band selection updates.
+RUBBER_BAND_INTERVAL = 33
+
 
 class NodeViewer(QtWidgets.QGraphicsView):
     """
@@ -62,7 +67,23 @@ class NodeViewer(QtWidgets.QGraphicsView):
         """
         super(NodeViewer, self).__init__(parent)
 
+        # spatial index of the node & port items used for hit testing.
+        self._node_index = NodeItemIndex()
+
+        # registries of the node & pipe items in the scene and the cached
+        # (node items, pipe items) selection reset on "selectionChanged".
+        self._node_items = {}
+        self._pipe_items = {}
+        self._selection = None
+
+        # deferred node & pipe items re-drawn when updates are resumed.
+        self._suspended = 0
+        self._suspended_state = None
+        self._deferred_nodes = {}
+        self._deferred_pipes = {}
+
         self.setScene(NodeScene(self))
+        self.scene().selectionChanged.connect(self._on_selection_changed)
         self.setRenderHint(QtGui.QPainter.Antialiasing, True)
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
@@ -93,57 +114,37 @@ class NodeViewer(QtWidgets.QGraphicsView):
             QtWidgets.QRubberBand.Rectangle, self
         )
         self._rubber_band.isActive = False
-
-        text_color = QtGui.QColor(*tuple(map(
-            lambda i, j: i - j, (255, 255, 255),
-            ViewerEnum.BACKGROUND_COLOR.value
-        )))
-        text_color.setAlpha(50)
-        self._cursor_text = QtWidgets.QGraphicsTextItem()
-        self._cursor_text.setFlag(
-            QtWidgets.QGraphicsTextItem.ItemIsSelectable, False
+        self._rubber_band_candidates = set()
+        self._rubber_band_nodes = set()
+        self._rubber_band_pipes = set()
+        self._rubber_band_rect = None
+        self._rubber_band_prev_rect = None
+        self._rubber_band_mode = None
+        self._rubber_band_timer = QtCore.QTimer(self)
+        self._rubber_band_timer.setSingleShot(True)
+        self._rubber_band_timer.setInterval(RUBBER_BAND_INTERVAL)
+        self._rubber_band_timer.timeout.connect(
+            self._update_rubber_band_selection
         )
-        self._cursor_text.setDefaultTextColor(text_color)
-        self._cursor_text.setZValue(Z_VAL_PIPE - 1)
-        font = self._cursor_text.font()
-        font.setPointSize(7)
-        self._cursor_text.setFont(font)
-        self.scene().addItem(self._cursor_text)
-
-        self._LIVE_PIPE = LivePipeItem()
-        self._LIVE_PIPE.setVisible(False)
-        self.scene().addItem(self._LIVE_PIPE)
 
-        self._SLICER_PIPE = SlicerPipeItem()
-        self._SLICER_PIPE.setVisible(False)
-        self.scene().addItem(self._SLICER_PIPE)
+        # the cursor text, live & slicer pipe items, tab search widget and
+        # context menus are created on first use.
+        self._cursor_text_item = None
+        self._live_pipe = None
+        self._slicer_pipe = None
+        self._search_menu = None
 
-        self._search_widget = TabSearchMenuWidget()
-        self._search_widget.search_submitted.connect(self._on_search_submitted)
-
-        # workaround fix for shortcuts from the non-native menu.
-        # actions don't seem to trigger so we create a hidden menu bar.
-        self._ctx_menu_bar = QtWidgets.QMenuBar(self)
-        self._ctx_menu_bar.setNativeMenuBar(False)
-        # shortcuts don't work with "setVisibility(False)".
-        self._ctx_menu_bar.setMaximumSize(0, 0)
-
-        # context menus.
-        self._ctx_graph_menu = BaseMenu('NodeGraph', self)
-        self._ctx_node_menu = BaseMenu('Nodes', self)
-
-        if undo_stack:
-            self._undo_action = undo_stack.createUndoAction(self, '&Undo')
-            self._redo_action = undo_stack.createRedoAction(self, '&Redo')
-        else:
-            self._undo_action = None
-            self._redo_action = None
-
-        self._build_context_menus()
+        self._undo_stack = undo_stack
+        self._undo_action = None
+        self._redo_action = None
+        self._ctx_menu_bar = None
+        self._ctx_graph_menu = None
+        self._ctx_node_menu = None
 
         self.acyclic = True
         self.pipe_collision = False
         self.pipe_slicing = True
+        self.port_snap_radius = PortEnum.SNAP_RADIUS.value
 
         self.LMB_state = False
         self.RMB_state = False
@@ -169,6 +170,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         """
         # workaround fix: Re-populate the QMenuBar so the QAction shotcuts don't
         #                 conflict with parent existing host app.
+        self._build_context_menus()
         self._ctx_menu_bar.addMenu(self._ctx_graph_menu)
         self._ctx_menu_bar.addMenu(self._ctx_node_menu)
         return super(NodeViewer, self).focusInEvent(event)
@@ -180,7 +182,8 @@ class NodeViewer(QtWidgets.QGraphicsView):
         """
         # workaround fix: Clear the QMenuBar so the QAction shotcuts don't
         #                 conflict with existing parent host app.
-        self._ctx_menu_bar.clear()
+        if self._ctx_menu_bar:
+            self._ctx_menu_bar.clear()
         return super(NodeViewer, self).focusOutEvent(event)
 
     # --- private ---
@@ -188,7 +191,28 @@ class NodeViewer(QtWidgets.QGraphicsView):
     def _build_context_menus(self):
         """
         Build context menu for the node graph.
+        (the context menus are built the first time they're needed)
         """
+        if self._ctx_menu_bar:
+            return
+
+        # workaround fix for shortcuts from the non-native menu.
+        # actions don't seem to trigger so we create a hidden menu bar.
+        self._ctx_menu_bar = QtWidgets.QMenuBar(self)
+        self._ctx_menu_bar.setNativeMenuBar(False)
+        # shortcuts don't work with "setVisibility(False)".
+        self._ctx_menu_bar.setMaximumSize(0, 0)
+
+        # context menus.
+        self._ctx_graph_menu = BaseMenu('NodeGraph', self)
+        self._ctx_node_menu = BaseMenu('Nodes', self)
+
+        if self._undo_stack:
+            self._undo_action = self._undo_stack.createUndoAction(
+                self, '&Undo')
+            self._redo_action = self._undo_stack.createRedoAction(
+                self, '&Redo')
+
         # "node context menu" disabled by default and enabled when a action
         # is added through the "NodesMenu" interface.
         self._ctx_node_menu.setDisabled(True)
@@ -201,7 +225,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         if self._undo_action and self._redo_action:
             self._undo_action.setShortcuts(QtGui.QKeySequence.Undo)
             self._redo_action.setShortcuts(QtGui.QKeySequence.Redo)
-            if LooseVersion(QtCore.qVersion()) >= LooseVersion('5.10'):
+            if QT_VERSION >= (5, 10):
                 self._undo_action.setShortcutVisibleInContextMenu(True)
                 self._redo_action.setShortcutVisibleInContextMenu(True)
 
@@ -210,6 +234,89 @@ class NodeViewer(QtWidgets.QGraphicsView):
             self._ctx_graph_menu.addAction(self._redo_action)
             self._ctx_graph_menu.addSeparator()
 
+    @staticmethod
+    def _is_item_visible(item):
+        """
+        Args:
+            item (QtWidgets.QGraphicsItem or QtWidgets.QWidget): lazily
+                created item.
+
+        Returns:
+            bool: true if the item has been created and is visible.
+        """
+        return item is not None and item.isVisible()
+
+    @property
+    def _cursor_text(self):
+        """
+        Cursor text item that displays the modifier key hints.
+        (created on first use)
+
+        Returns:
+            QtWidgets.QGraphicsTextItem: cursor text item.
+        """
+        if self._cursor_text_item is None:
+            text_color = QtGui.QColor(*tuple(map(
+                lambda i, j: i - j, (255, 255, 255),
+                ViewerEnum.BACKGROUND_COLOR.value
+            )))
+            text_color.setAlpha(50)
+            item = QtWidgets.QGraphicsTextItem()
+            item.setFlag(QtWidgets.QGraphicsTextItem.ItemIsSelectable, False)
+            item.setDefaultTextColor(text_color)
+            item.setZValue(Z_VAL_PIPE - 1)
+            font = item.font()
+            font.setPointSize(7)
+            item.setFont(font)
+            self.scene().addItem(item)
+            self._cursor_text_item = item
+        return self._cursor_text_item
+
+    @property
+    def _LIVE_PIPE(self):
+        """
+        Pipe item drawn while the user is making a connection.
+        (created on first use)
+
+        Returns:
+            NodeGraphQt.qgraphics.pipe.LivePipeItem: live pipe item.
+        """
+        if self._live_pipe is None:
+            self._live_pipe = LivePipeItem()
+            self._live_pipe.setVisible(False)
+            self.scene().addItem(self._live_pipe)
+        return self._live_pipe
+
+    @property
+    def _SLICER_PIPE(self):
+        """
+        Pipe item drawn while the user is slicing connections.
+        (created on first use)
+
+        Returns:
+            NodeGraphQt.qgraphics.slicer.SlicerPipeItem: slicer pipe item.
+        """
+        if self._slicer_pipe is None:
+            self._slicer_pipe = SlicerPipeItem()
+            self._slicer_pipe.setVisible(False)
+            self.scene().addItem(self._slicer_pipe)
+        return self._slicer_pipe
+
+    @property
+    def _search_widget(self):
+        """
+        Tab search menu widget.
+        (created on first use)
+
+        Returns:
+            NodeGraphQt.widgets.tab_search.TabSearchMenuWidget: search widget.
+        """
+        if self._search_menu is None:
+            self._search_menu = TabSearchMenuWidget()
+            self._search_menu.search_submitted.connect(
+                self._on_search_submitted)
+        return self._search_menu
+
     def _set_viewer_zoom(self, value, sensitivity=None, pos=None):
         """
         Sets the zoom level.
@@ -279,9 +386,10 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             QtCore.QRectF: combined rect
         """
-        group = self.scene().createItemGroup(nodes)
-        rect = group.boundingRect()
-        self.scene().destroyItemGroup(group)
+        rect = QtCore.QRectF()
+        for node in nodes:
+            rect = rect.united(node.sceneBoundingRect())
+            rect = rect.united(node.mapRectToScene(node.childrenBoundingRect()))
         return rect
 
     def _items_near(self, pos, item_type=None, width=20, height=20):
@@ -289,6 +397,9 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Filter node graph items from the specified position, width and
         height area.
 
+        (node and port item types are looked up from the viewer spatial
+        index instead of the scene.)
+
         Args:
             pos (QtCore.QPoint): scene pos.
             item_type: filter item type. (optional)
@@ -300,8 +411,14 @@ class NodeViewer(QtWidgets.QGraphicsView):
         """
         x, y = pos.x() - width, pos.y() - height
         rect = QtCore.QRectF(x, y, width, height)
+        if item_type and issubclass(item_type, AbstractNodeItem):
+            return [i for i in self._node_index.nodes_in_rect(rect)
+                    if isinstance(i, item_type)]
+        if item_type and issubclass(item_type, PortItem):
+            return [i for i in self._node_index.ports_in_rect(rect)
+                    if isinstance(i, item_type)]
         items = []
-        excl = [self._LIVE_PIPE, self._SLICER_PIPE]
+        excl = [self._live_pipe, self._slicer_pipe]
         for item in self.scene().items(rect):
             if item in excl:
                 continue
@@ -323,6 +440,100 @@ class NodeViewer(QtWidgets.QGraphicsView):
         pos = self.mapToScene(self._previous_pos)
         self.search_triggered.emit(node_type, (pos.x(), pos.y()))
 
+    def _on_selection_changed(self):
+        """
+        Slot function triggered when the scene selection has changed.
+        (the selection is re-collected on the next "selected_items" call)
+        """
+        self._selection = None
+
+    def _reset_rubber_band(self):
+        """
+        Reset the rubber band selection state.
+        """
+        self._rubber_band_candidates = set()
+        self._rubber_band_nodes = set()
+        self._rubber_band_pipes = set()
+        self._rubber_band_rect = None
+        self._rubber_band_prev_rect = None
+        self._rubber_band_mode = None
+
+    def _update_rubber_band_selection(self):
+        """
+        Apply the pending rubber band rect to the node and pipe selection.
+
+        Nodes with a bounding rect entering or leaving the rect are found
+        incrementally from the previous rect with the spatial index, the
+        nodes on the edge of the rect are then tested against their shape
+        and only the items with a changed selection state are updated.
+        """
+        rect = self._rubber_band_rect
+        if rect is None:
+            return
+        self._rubber_band_rect = None
+
+        if self.CTRL_state:
+            mode = 'subtract'
+        elif self.SHIFT_state:
+            mode = 'extend'
+        else:
+            mode = 'replace'
+
+        if self._rubber_band_prev_rect is None:
+            candidates = set(self._node_index.nodes_in_rect(rect))
+        else:
+            candidates = self._node_index.nodes_in_rect_delta(
+                rect, self._rubber_band_prev_rect,
+                self._rubber_band_candidates
+            )
+
+        # match the item shape like "QGraphicsScene.setSelectionArea()".
+        path = QtGui.QPainterPath()
+        path.addRect(rect)
+        nodes = set()
+        for node in candidates:
+            if rect.contains(node.sceneBoundingRect()) or \
+                    node.collidesWithPath(node.mapFromScene(path)):
+                nodes.add(node)
+
+        pipes = set()
+        if mode != 'subtract':
+            excl = [self._live_pipe, self._slicer_pipe]
+            pipes = set(i for i in self.scene().items(rect)
+                        if isinstance(i, PipeItem) and i not in excl)
+
+        prev_nodes = self._rubber_band_nodes
+        prev_selection = set(self._prev_selection_nodes)
+        if self._rubber_band_mode != mode:
+            # first update or modifier changed so re-validate everything.
+            changed = prev_selection | prev_nodes | nodes
+            for pipe in self.selected_pipes():
+                pipe.setSelected(False)
+            self._rubber_band_pipes = set()
+        else:
+            changed = prev_nodes ^ nodes
+
+        for node in changed:
+            if mode == 'subtract':
+                selected = node in prev_selection and node not in nodes
+            elif mode == 'extend':
+                selected = node in prev_selection or node in nodes
+            else:
+                selected = node in nodes
+            if node.selected != selected:
+                node.selected = selected
+
+        for pipe in self._rubber_band_pipes - pipes:
+            pipe.setSelected(False)
+        for pipe in pipes - self._rubber_band_pipes:
+            pipe.setSelected(True)
+
+        self._rubber_band_candidates = candidates
+        self._rubber_band_nodes = nodes
+        self._rubber_band_pipes = pipes
+        self._rubber_band_prev_rect = rect
+        self._rubber_band_mode = mode
+
     def _on_pipes_sliced(self, path):
         """
         Triggered when the slicer pipe is active
@@ -332,7 +543,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         """
         ports = []
         for i in self.scene().items(path):
-            if isinstance(i, PipeItem) and i != self._LIVE_PIPE:
+            if isinstance(i, PipeItem) and i is not self._live_pipe:
                 if any([i.input_port.locked, i.output_port.locked]):
                     continue
                 ports.append([i.input_port, i.output_port])
@@ -359,8 +570,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
 
         if ctx_menus['nodes'].isEnabled():
             pos = self.mapToScene(self._previous_pos)
-            items = self._items_near(pos)
-            nodes = [i for i in items if isinstance(i, AbstractNodeItem)]
+            nodes = self._items_near(pos, AbstractNodeItem)
             if nodes:
                 node = nodes[0]
                 ctx_menu = ctx_menus['nodes'].get_menu(node.type_, node.id)
@@ -399,7 +609,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
          self._prev_selection_pipes) = self.selected_items()
 
         # close tab search
-        if self._search_widget.isVisible():
+        if self._is_item_visible(self._search_menu):
             self.tab_search_toggle()
 
         # cursor pos.
@@ -485,6 +695,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
             self.scene().update(map_rect)
             self._rubber_band.setGeometry(rect)
             self._rubber_band.isActive = True
+            self._reset_rubber_band()
 
         # stop here so we don't select a node.
         # (ctrl modifier can be used for something else in future.)
@@ -498,15 +709,14 @@ class NodeViewer(QtWidgets.QGraphicsView):
                 pipes[0].reset()
                 port = pipes[0].port_from_pos(map_pos, reverse=True)
                 if not port.locked and port.multi_connection:
-                    self._cursor_text.setPlainText('')
-                    self._cursor_text.setVisible(False)
+                    self._hide_cursor_text()
                     self.start_live_connection(port)
 
             # return here as the default behaviour unselects nodes with
             # the shift modifier.
             return
 
-        if not self._LIVE_PIPE.isVisible():
+        if not self._is_item_visible(self._live_pipe):
             super(NodeViewer, self).mousePressEvent(event)
 
     def mouseReleaseEvent(self, event):
@@ -518,7 +728,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
             self.MMB_state = False
 
         # hide pipe slicer.
-        if self._SLICER_PIPE.isVisible():
+        if self._is_item_visible(self._slicer_pipe):
             self._on_pipes_sliced(self._SLICER_PIPE.path())
             p = QtCore.QPointF(0.0, 0.0)
             self._SLICER_PIPE.draw_path(p, p)
@@ -533,13 +743,14 @@ class NodeViewer(QtWidgets.QGraphicsView):
                 self._rubber_band.hide()
 
                 rect = QtCore.QRect(self._origin_pos, event.pos()).normalized()
-                rect_items = self.scene().items(
-                    self.mapToScene(rect).boundingRect()
-                )
-                node_ids = []
-                for item in rect_items:
-                    if isinstance(item, AbstractNodeItem):
-                        node_ids.append(item.id)
+                rect = self.mapToScene(rect).boundingRect()
+
+                # apply the final rubber band selection.
+                self._rubber_band_timer.stop()
+                self._rubber_band_rect = rect
+                self._update_rubber_band_selection()
+                node_ids = [n.id for n in self._rubber_band_nodes]
+                self._reset_rubber_band()
 
                 # emit the node selection signals.
                 if node_ids:
@@ -581,7 +792,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
     def mouseMoveEvent(self, event):
         if self.ALT_state and self.SHIFT_state:
             if self.pipe_slicing:
-                if self.LMB_state and self._SLICER_PIPE.isVisible():
+                if self.LMB_state and self._is_item_visible(self._slicer_pipe):
                     p1 = self._SLICER_PIPE.path().pointAtPercent(0)
                     p2 = self.mapToScene(self._previous_pos)
                     self._SLICER_PIPE.draw_path(p1, p2)
@@ -602,7 +813,8 @@ class NodeViewer(QtWidgets.QGraphicsView):
 
         if not self.ALT_state:
             if self.SHIFT_state or self.CTRL_state:
-                if not self._LIVE_PIPE.isVisible():
+                if self._is_item_visible(self._cursor_text_item) and \
+                        not self._is_item_visible(self._live_pipe):
                     self._cursor_text.setPos(self.mapToScene(event.pos()))
 
         if self.LMB_state and self._rubber_band.isActive:
@@ -612,23 +824,14 @@ class NodeViewer(QtWidgets.QGraphicsView):
                 if not self._rubber_band.isVisible():
                     self._rubber_band.show()
                 map_rect = self.mapToScene(rect).boundingRect()
-                path = QtGui.QPainterPath()
-                path.addRect(map_rect)
                 self._rubber_band.setGeometry(rect)
-                self.scene().setSelectionArea(path)
                 self.scene().update(map_rect)
 
-                if self.SHIFT_state or self.CTRL_state:
-                    nodes, pipes = self.selected_items()
-
-                    for node in self._prev_selection_nodes:
-                        node.selected = True
-
-                    if self.CTRL_state:
-                        for pipe in pipes:
-                            pipe.setSelected(False)
-                        for node in nodes:
-                            node.selected = False
+                # selection updates are throttled to the timer interval.
+                self._rubber_band_rect = map_rect
+                if not self._rubber_band_timer.isActive():
+                    self._update_rubber_band_selection()
+                    self._rubber_band_timer.start()
 
         elif self.LMB_state:
             self.COLLIDING_state = False
@@ -720,13 +923,14 @@ class NodeViewer(QtWidgets.QGraphicsView):
             self.ALT_state = True
             self.SHIFT_state = True
 
-        if self._LIVE_PIPE.isVisible():
+        if self._is_item_visible(self._live_pipe):
             super(NodeViewer, self).keyPressEvent(event)
             return
 
         # show cursor text
         overlay_text = None
-        self._cursor_text.setVisible(False)
+        if self._cursor_text_item:
+            self._cursor_text_item.setVisible(False)
         if not self.ALT_state:
             if self.SHIFT_state:
                 overlay_text = '\n    SHIFT:\n    Toggle/Extend Selection'
@@ -758,8 +962,15 @@ class NodeViewer(QtWidgets.QGraphicsView):
         super(NodeViewer, self).keyReleaseEvent(event)
 
         # hide and reset cursor text.
-        self._cursor_text.setPlainText('')
-        self._cursor_text.setVisible(False)
+        self._hide_cursor_text()
+
+    def _hide_cursor_text(self):
+        """
+        Hide and reset the cursor text item if it's been created.
+        """
+        if self._cursor_text_item:
+            self._cursor_text_item.setPlainText('')
+            self._cursor_text_item.setVisible(False)
 
     # --- scene events ---
 
@@ -772,40 +983,36 @@ class NodeViewer(QtWidgets.QGraphicsView):
             event (QtWidgets.QGraphicsSceneMouseEvent):
                 The event handler from the QtWidgets.QGraphicsScene
         """
-        if not self._LIVE_PIPE.isVisible():
+        if not self._is_item_visible(self._live_pipe):
             return
         if not self._start_port:
             return
 
         pos = event.scenePos()
         pointer_color = None
-        for item in self.scene().items(pos):
-            if not isinstance(item, PortItem):
-                continue
-
-            x = item.boundingRect().width() / 2
-            y = item.boundingRect().height() / 2
-            pos = item.scenePos()
+        end_port = self._live_connection_end_port(pos)
+        if end_port:
+            x = end_port.boundingRect().width() / 2
+            y = end_port.boundingRect().height() / 2
+            pos = end_port.scenePos()
             pos.setX(pos.x() + x)
             pos.setY(pos.y() + y)
-            if item == self._start_port:
-                break
+
+        if end_port and end_port != self._start_port:
             pointer_color = PipeEnum.HIGHLIGHT_COLOR.value
-            accept = self._validate_accept_connection(self._start_port, item)
-            if not accept:
-                pointer_color = [150, 60, 255]
-                break
-            reject = self._validate_reject_connection(self._start_port, item)
-            if reject:
+            accept = self._validate_accept_connection(
+                self._start_port, end_port
+            )
+            reject = self._validate_reject_connection(
+                self._start_port, end_port
+            )
+            if not accept or reject:
                 pointer_color = [150, 60, 255]
-                break
-
-            if self.acyclic:
-                if item.node == self._start_port.node:
+            elif self.acyclic:
+                if end_port.node == self._start_port.node:
                     pointer_color = PipeEnum.DISABLED_COLOR.value
-                elif item.port_type == self._start_port.port_type:
+                elif end_port.port_type == self._start_port.port_type:
                     pointer_color = PipeEnum.DISABLED_COLOR.value
-            break
 
         self._LIVE_PIPE.draw_path(
             self._start_port, cursor_pos=pos, color=pointer_color
@@ -829,7 +1036,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         if self.ALT_state:
             return
 
-        if self._LIVE_PIPE.isVisible():
+        if self._is_item_visible(self._live_pipe):
             self.apply_live_connection(event)
             return
 
@@ -991,6 +1198,54 @@ class NodeViewer(QtWidgets.QGraphicsView):
             return False
         return False
 
+    def _is_port_connectable(self, from_port, to_port):
+        """
+        Check if a live connection from a port can be made to another port
+        with the port constraints and acyclic mode.
+
+        Args:
+            from_port (PortItem): start port.
+            to_port (PortItem): end port.
+
+        Returns:
+            bool: true if the connection is valid.
+        """
+        if to_port is from_port or to_port.locked:
+            return False
+        if to_port.port_type == from_port.port_type:
+            return False
+        if self.acyclic and to_port.node == from_port.node:
+            return False
+        if not self._validate_accept_connection(from_port, to_port):
+            return False
+        if self._validate_reject_connection(from_port, to_port):
+            return False
+        if self.acyclic and not self.acyclic_check(from_port, to_port):
+            return False
+        return True
+
+    def _live_connection_end_port(self, pos):
+        """
+        Returns the port item under the scene position or if there isn't one
+        the nearest connectable port within the port snapping radius.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+
+        Returns:
+            PortItem: end port item or None.
+        """
+        ports = self._node_index.ports_at(pos)
+        if ports:
+            return ports[0]
+        if self.port_snap_radius <= 0.0 or not self._start_port:
+            return
+        radius = self.port_snap_radius / self.transform().m11()
+        start_port = self._start_port
+        return self._node_index.nearest_port(
+            pos, radius, lambda p: self._is_port_connectable(start_port, p)
+        )
+
     def apply_live_connection(self, event):
         """
         triggered mouse press/release event for the scene.
@@ -1002,17 +1257,13 @@ class NodeViewer(QtWidgets.QGraphicsView):
             event (QtWidgets.QGraphicsSceneMouseEvent):
                 The event handler from the QtWidgets.QGraphicsScene
         """
-        if not self._LIVE_PIPE.isVisible():
+        if not self._is_item_visible(self._live_pipe):
             return
 
         self._start_port.hovered = False
 
         # find the end port.
-        end_port = None
-        for item in self.scene().items(event.scenePos()):
-            if isinstance(item, PortItem):
-                end_port = item
-                break
+        end_port = self._live_connection_end_port(event.scenePos())
 
         connected = []
         disconnected = []
@@ -1205,8 +1456,9 @@ class NodeViewer(QtWidgets.QGraphicsView):
         self.scene().update(rect)
 
     def rebuild_tab_search(self):
-        if isinstance(self._search_widget, TabSearchMenuWidget):
-            self._search_widget.rebuild = True
+        # the search widget is built with the current nodes when created.
+        if isinstance(self._search_menu, TabSearchMenuWidget):
+            self._search_menu.rebuild = True
 
     def qaction_for_undo(self):
         """
@@ -1215,6 +1467,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             QtWidgets.QAction: undo action.
         """
+        self._build_context_menus()
         return self._undo_action
 
     def qaction_for_redo(self):
@@ -1224,6 +1477,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             QtWidgets.QAction: redo action.
         """
+        self._build_context_menus()
         return self._redo_action
 
     def context_menus(self):
@@ -1233,6 +1487,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             dict: viewer context menu.
         """
+        self._build_context_menus()
         return {'graph': self._ctx_graph_menu, 'nodes': self._ctx_node_menu}
 
     def question_dialog(self, text, title='Node Graph', dialog_icon=None,
@@ -1328,6 +1583,132 @@ class NodeViewer(QtWidgets.QGraphicsView):
 
         return file_path
 
+    def node_index(self):
+        """
+        Returns the spatial index of the node and port items in the scene.
+
+        Returns:
+            NodeGraphQt.widgets.spatial_index.NodeItemIndex: item index.
+        """
+        return self._node_index
+
+    def updates_suspended(self):
+        """
+        Returns true if the viewer updates are suspended.
+
+        Returns:
+            bool: true if suspended.
+        """
+        return self._suspended > 0
+
+    def suspend_updates(self):
+        """
+        Suspend the viewport updates, the scene item indexing and the
+        re-drawing of node and pipe items until
+        :meth:`NodeViewer.resume_updates` is called.
+        (calls can be nested)
+        """
+        self._suspended += 1
+        if self._suspended > 1:
+            return
+        scene = self.scene()
+        self._suspended_state = (
+            scene.itemIndexMethod(),
+            self.viewportUpdateMode(),
+            self.viewport().updatesEnabled()
+        )
+        scene.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.NoViewportUpdate)
+        self.viewport().setUpdatesEnabled(False)
+
+    def resume_updates(self):
+        """
+        Resume the updates suspended by :meth:`NodeViewer.suspend_updates`
+        re-drawing the deferred node and pipe items in a single pass.
+
+        Returns:
+            list[AbstractNodeItem]: re-drawn node items.
+        """
+        if not self._suspended:
+            return []
+        if self._suspended > 1:
+            self._suspended -= 1
+            return []
+
+        # re-draw the nodes first while the pipes are still deferred so
+        # the pipes moved with the ports are only drawn once.
+        nodes = [n for n in self._deferred_nodes if n.scene() is not None]
+        self._deferred_nodes = None
+        for node in nodes:
+            node.draw_node()
+        self._deferred_nodes = {}
+        self._suspended = 0
+
+        pipes = self._deferred_pipes
+        self._deferred_pipes = {}
+        for pipe in pipes:
+            if pipe.scene() is None:
+                continue
+            if pipe.input_port and pipe.output_port:
+                pipe.draw_path(pipe.input_port, pipe.output_port)
+
+        index_method, update_mode, updates_enabled = self._suspended_state
+        self._suspended_state = None
+        self.scene().setItemIndexMethod(index_method)
+        self.setViewportUpdateMode(update_mode)
+        self.viewport().setUpdatesEnabled(updates_enabled)
+        self.scene().update()
+        return nodes
+
+    def defer_draw(self, item):
+        """
+        Queue a node item "draw_node" or pipe item "draw_path" call while
+        the viewer updates are suspended.
+
+        Args:
+            item (AbstractNodeItem or PipeItem): node or pipe item.
+
+        Returns:
+            bool: true if the draw call was deferred.
+        """
+        if not self._suspended:
+            return False
+        if isinstance(item, PipeItem):
+            self._deferred_pipes[item] = None
+        elif self._deferred_nodes is not None:
+            self._deferred_nodes[item] = None
+        else:
+            return False
+        return True
+
+    def register_item(self, item):
+        """
+        Register a node or pipe item that has been added to the scene.
+        (called from the item when it's added into the scene)
+
+        Args:
+            item (QtWidgets.QGraphicsItem): node or pipe item.
+        """
+        if isinstance(item, AbstractNodeItem):
+            self._node_items[item] = None
+            self._node_index.mark_dirty(item)
+        elif isinstance(item, PipeItem) and \
+                not isinstance(item, LivePipeItem):
+            self._pipe_items[item] = None
+
+    def unregister_item(self, item):
+        """
+        Unregister a node or pipe item that's being removed from the scene.
+        (called from the item when it's removed from the scene)
+
+        Args:
+            item (QtWidgets.QGraphicsItem): node or pipe item.
+        """
+        if item in self._node_items:
+            del self._node_items[item]
+            self._node_index.discard(item)
+        self._pipe_items.pop(item, None)
+
     def all_pipes(self):
         """
         Returns all pipe qgraphic items.
@@ -1335,9 +1716,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             list[PipeItem]: instances of pipe items.
         """
-        excl = [self._LIVE_PIPE, self._SLICER_PIPE]
-        return [i for i in self.scene().items()
-                if isinstance(i, PipeItem) and i not in excl]
+        return list(self._pipe_items.keys())
 
     def all_nodes(self):
         """
@@ -1346,8 +1725,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             list[AbstractNodeItem]: instances of node items.
         """
-        return [i for i in self.scene().items()
-                if isinstance(i, AbstractNodeItem)]
+        return list(self._node_items.keys())
 
     def selected_nodes(self):
         """
@@ -1356,8 +1734,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             list[AbstractNodeItem]: instances of node items.
         """
-        return [i for i in self.scene().selectedItems()
-                if isinstance(i, AbstractNodeItem)]
+        return self.selected_items()[0]
 
     def selected_pipes(self):
         """
@@ -1366,9 +1743,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         Returns:
             list[Pipe]: pipe items.
         """
-        pipes = [i for i in self.scene().selectedItems()
-                 if isinstance(i, PipeItem)]
-        return pipes
+        return self.selected_items()[1]
 
     def selected_items(self):
         """
@@ -1378,14 +1753,16 @@ class NodeViewer(QtWidgets.QGraphicsView):
             tuple(list[AbstractNodeItem], list[Pipe]):
                 selected (node items, pipe items).
         """
-        nodes = []
-        pipes = []
-        for item in self.scene().selectedItems():
-            if isinstance(item, AbstractNodeItem):
-                nodes.append(item)
-            elif isinstance(item, PipeItem):
-                pipes.append(item)
-        return nodes, pipes
+        if self._selection is None:
+            nodes = []
+            pipes = []
+            for item in self.scene().selectedItems():
+                if isinstance(item, AbstractNodeItem):
+                    nodes.append(item)
+                elif isinstance(item, PipeItem):
+                    pipes.append(item)
+            self._selection = (nodes, pipes)
+        return list(self._selection[0]), list(self._selection[1])
 
     def add_node(self, node, pos=None):
         """
@@ -1420,19 +1797,46 @@ class NodeViewer(QtWidgets.QGraphicsView):
             pos (tuple or list): custom x, y position.
             offset (tuple or list): x, y position offset.
         """
-        group = self.scene().createItemGroup(nodes)
-        group_rect = group.boundingRect()
+        if not nodes:
+            return
         if pos:
             x, y = pos
         else:
+            group_rect = self._combined_rect(nodes)
             pos = self.mapToScene(self._previous_pos)
             x = pos.x() - group_rect.center().x()
             y = pos.y() - group_rect.center().y()
         if offset:
             x += offset[0]
             y += offset[1]
-        group.setPos(x, y)
-        self.scene().destroyItemGroup(group)
+        self.set_node_positions(
+            nodes, [(n.pos().x() + x, n.pos().y() + y) for n in nodes]
+        )
+
+    def set_node_positions(self, nodes, positions):
+        """
+        Move node items to new scene positions in a single pass.
+
+        Port scene position change notifications are suppressed while the
+        nodes are moved and the connected pipes are redrawn once afterwards.
+
+        Args:
+            nodes (list[AbstractNodeItem]): node items.
+            positions (list[tuple(float, float)]): x, y scene positions.
+        """
+        flag = QtWidgets.QGraphicsItem.ItemSendsScenePositionChanges
+        pipes = set()
+        for node, (x, y) in zip(nodes, positions):
+            ports = (list(getattr(node, 'inputs', [])) +
+                     list(getattr(node, 'outputs', [])))
+            for port in ports:
+                port.setFlag(flag, False)
+                pipes.update(port.connected_pipes)
+            node.setPos(x, y)
+            for port in ports:
+                port.setFlag(flag, True)
+        for pipe in pipes:
+            pipe.draw_path(pipe.input_port, pipe.output_port)
 
     def get_pipes_from_nodes(self, nodes=None):
         nodes = nodes or self.selected_nodes()
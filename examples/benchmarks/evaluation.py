@@ -0,0 +1,241 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Benchmark the scheduling overhead of "NodeGraph.evaluate()" on a layered
+DAG of nodes in a headless node graph.
+
+The overhead per node is the evaluation time minus the time spent in the
+node "compute()" functions, the incremental run changes a property near the
+end of the graph so only its downstream nodes are recomputed, the port run
+evaluates a single output port of the dirty graph and the compiled run
+evaluates the "NodeGraph.compile()" execution plan.
+
+The sweep evaluates a table of values for a property of a first layer node
+with a plan run per row, a batch run and a batch run of vectorized nodes
+(requires NumPy).
+
+usage:
+    python -m examples.benchmarks.evaluation --layers 100 --width 100
+"""
+import argparse
+import time
+
+from NodeGraphQt import NodeGraph, BaseNode
+
+
+class SumNode(BaseNode):
+    """
+    Node that outputs the sum of its inputs plus the offset property.
+    """
+
+    __identifier__ = 'nodes.benchmark'
+    NODE_NAME = 'sum'
+
+    def __init__(self):
+        super(SumNode, self).__init__()
+        self.add_input('a')
+        self.add_input('b')
+        self.add_output('out')
+        self.create_property('offset', 1)
+
+    def compute(self, inputs):
+        a, b = inputs['a'], inputs['b']
+        return {'out': ((0 if a is None else a) + (0 if b is None else b) +
+                        self.get_property('offset'))}
+
+
+class VectorSumNode(SumNode):
+    """
+    Sum node computed with arrays in batch evaluations.
+    """
+
+    NODE_NAME = 'vector sum'
+    VECTORIZED = True
+
+
+def build_session(layers, width, node_type=SumNode.type_):
+    """
+    Build the session data for a layered DAG where each node is connected
+    to two nodes in the previous layer.
+
+    Args:
+        layers (int): number of layers.
+        width (int): number of nodes per layer.
+        node_type (str): node type.
+
+    Returns:
+        dict: serialized session data.
+    """
+    nodes = {}
+    connections = []
+    for layer in range(layers):
+        for i in range(width):
+            node_id = '{}_{}'.format(layer, i)
+            nodes[node_id] = {
+                'type_': node_type,
+                'name': 'sum {}'.format(node_id),
+                'pos': [layer * 250.0, i * 150.0]
+            }
+            if not layer:
+                continue
+            for port_name, src in (('a', i), ('b', (i + 1) % width)):
+                connections.append({
+                    'out': ['{}_{}'.format(layer - 1, src), 'out'],
+                    'in': [node_id, port_name]
+                })
+    return {'nodes': nodes, 'connections': connections}
+
+
+def time_compute(graph, order):
+    """
+    Time calling "compute()" on the nodes directly with their input values.
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+        order (list[NodeGraphQt.BaseNode]): nodes in evaluation order.
+
+    Returns:
+        float: elapsed time in seconds.
+    """
+    evaluator = graph.evaluator()
+    values = {}
+    inputs = {}
+    for node in order:
+        inputs[node.id] = evaluator.gather_inputs(node, values)
+        values[node.id] = node.compute(inputs[node.id])
+
+    start = time.perf_counter()
+    for node in order:
+        node.compute(inputs[node.id])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--layers', type=int, default=100,
+                        help='number of node layers.')
+    parser.add_argument('--width', type=int, default=100,
+                        help='number of nodes per layer.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of evaluation runs.')
+    parser.add_argument('--rows', type=int, default=100,
+                        help='number of sweep table rows.')
+    args = parser.parse_args()
+
+    graph = NodeGraph(headless=True)
+    graph.register_node(SumNode)
+
+    start = time.perf_counter()
+    with graph.suspend_updates():
+        graph.deserialize_session(build_session(args.layers, args.width),
+                                  clear_undo_stack=True)
+    node_count = len(graph.all_nodes())
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'load', node_count, time.perf_counter() - start))
+
+    last_layer = args.layers - 1
+    targets = [graph.get_node_by_name('sum {}_{}'.format(last_layer, i))
+               for i in range(args.width)]
+
+    schedule_times = []
+    evaluate_times = []
+    for _ in range(args.repeat):
+        graph.evaluator().invalidate()
+        start = time.perf_counter()
+        order = graph.evaluator().schedule(targets)
+        schedule_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        graph.evaluate(targets)
+        evaluate_times.append(time.perf_counter() - start)
+
+    schedule_time = min(schedule_times)
+    evaluate_time = min(evaluate_times)
+    compute_time = time_compute(graph, order)
+    overhead = (evaluate_time - compute_time) / len(order)
+
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'schedule', len(order), schedule_time))
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'evaluate', len(order), evaluate_time))
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'compute', len(order), compute_time))
+    print('overhead per node: {:.2f}us'.format(overhead * 1e6))
+
+    # change a property 5 layers from the end and re-evaluate.
+    node = graph.get_node_by_name(
+        'sum {}_0'.format(max(last_layer - 4, 0)))
+    computed = []
+    graph.node_evaluated.connect(lambda n, outputs: computed.append(n))
+    incremental_times = []
+    for i in range(args.repeat):
+        del computed[:]
+        node.set_property('offset', i + 2, push_undo=False)
+        start = time.perf_counter()
+        graph.evaluate(targets)
+        incremental_times.append(time.perf_counter() - start)
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'incremental', len(computed), min(incremental_times)))
+
+    # evaluate a single port near the start of the dirty graph.
+    port = graph.get_node_by_name('sum 4_0').output(0)
+    graph.evaluator().invalidate()
+    del computed[:]
+    start = time.perf_counter()
+    graph.evaluate_port(port)
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'port', len(computed), time.perf_counter() - start))
+
+    start = time.perf_counter()
+    plan = graph.compile(targets)
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'compile', len(plan), time.perf_counter() - start))
+
+    plan_times = []
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        plan.run({node.id: {'offset': i}})
+        plan_times.append(time.perf_counter() - start)
+    plan_time = min(plan_times)
+    print('{:<12} {:>6} nodes {:>8.3f}s'.format(
+        'plan run', len(plan), plan_time))
+    print('plan run per node: {:.2f}us'.format(
+        plan_time / len(plan) * 1e6))
+
+    # sweep the offset of a first layer node (about half the nodes vary).
+    node = graph.get_node_by_name('sum 0_0')
+    values = list(range(args.rows))
+    start = time.perf_counter()
+    for value in values:
+        plan.run({node.id: {'offset': value}})
+    print('{:<12} {:>6} rows  {:>8.3f}s'.format(
+        'sweep runs', args.rows, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    plan.run_batch({'sum 0_0.offset': values})
+    print('{:<12} {:>6} rows  {:>8.3f}s'.format(
+        'sweep batch', args.rows, time.perf_counter() - start))
+
+    try:
+        import numpy
+    except ImportError:
+        return
+    vector_graph = NodeGraph(headless=True)
+    vector_graph.register_node(VectorSumNode)
+    with vector_graph.suspend_updates():
+        vector_graph.deserialize_session(
+            build_session(args.layers, args.width, VectorSumNode.type_),
+            clear_undo_stack=True)
+    vector_plan = vector_graph.compile(
+        [vector_graph.get_node_by_name('sum {}_{}'.format(last_layer, i))
+         for i in range(args.width)])
+    # floats as the sums overflow int64 arrays.
+    start = time.perf_counter()
+    vector_plan.run_batch(
+        {'sum 0_0.offset': numpy.array(values, dtype=float)})
+    print('{:<12} {:>6} rows  {:>8.3f}s'.format(
+        'sweep vector', args.rows, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Benchmark building a node graph from code with and without
+"NodeGraph.suspend_updates()".
+
+usage:
+    python -m examples.benchmarks.graph_construction --nodes 10000
+"""
+import argparse
+import time
+
+from Qt import QtWidgets
+
+from examples.nodes import basic_nodes
+from NodeGraphQt import NodeGraph
+
+
+def build_graph(graph, node_count, columns=100):
+    """
+    Create a grid of nodes each connected to the previous node.
+
+    Args:
+        graph (NodeGraphQt.NodeGraph): node graph.
+        node_count (int): number of nodes to create.
+        columns (int): number of nodes per row.
+    """
+    prev_node = None
+    for i in range(node_count):
+        node = graph.create_node(
+            'nodes.basic.BasicNodeA',
+            pos=[(i % columns) * 250, (i // columns) * 150],
+            selected=False,
+            push_undo=False
+        )
+        if prev_node:
+            prev_node.output(0).connect_to(node.input(0), push_undo=False)
+        prev_node = node
+
+
+def run(node_count, suspend):
+    """
+    Time building the graph.
+
+    Args:
+        node_count (int): number of nodes to create.
+        suspend (bool): build the graph with the updates suspended.
+
+    Returns:
+        float: elapsed time in seconds.
+    """
+    graph = NodeGraph()
+    graph.register_node(basic_nodes.BasicNodeA)
+    graph.widget.resize(1280, 720)
+    graph.widget.show()
+    QtWidgets.QApplication.processEvents()
+
+    start = time.perf_counter()
+    if suspend:
+        with graph.suspend_updates():
+            build_graph(graph, node_count)
+    else:
+        build_graph(graph, node_count)
+    # include the first repaint of the scene.
+    QtWidgets.QApplication.processEvents()
+    elapsed = time.perf_counter() - start
+
+    graph.widget.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--nodes', type=int, default=10000,
+                        help='number of nodes to create.')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+
+    results = {}
+    for suspend in (False, True):
+        label = 'suspend_updates' if suspend else 'default'
+        results[label] = run(args.nodes, suspend)
+        print('{:<16} {:>6} nodes {:>8.3f}s'.format(
+            label, args.nodes, results[label]))
+
+    speedup = results['default'] / max(results['suspend_updates'], 1e-9)
+    print('speed up: {:.2f}x'.format(speedup))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
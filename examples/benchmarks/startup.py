@@ -0,0 +1,351 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Benchmark the NodeGraphQt startup: package import, "NodeGraph()"
+construction, node registration and the first paint of the node graph
+widget (runs under the "offscreen" Qt platform by default).
+
+The results are written out as JSON so runs can be compared between
+versions.
+
+usage:
+    python -m examples.benchmarks.startup --output results.json
+    python -m examples.benchmarks.startup --compare results.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from Qt import QtCore, QtWidgets
+
+# "-X importtime" stderr line: "import time: self [us] | cumulative | name"
+IMPORT_TIME_REGEX = re.compile(
+    r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$'
+)
+
+
+def _package_env():
+    """
+    Returns the environment for the sub process so it imports the same
+    NodeGraphQt package as this process.
+
+    Returns:
+        dict: environment variables.
+    """
+    env = os.environ.copy()
+    spec = importlib.util.find_spec('NodeGraphQt')
+    package_root = os.path.dirname(os.path.dirname(spec.origin))
+    paths = [package_root]
+    if env.get('PYTHONPATH'):
+        paths.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    return env
+
+
+def parse_import_times(text):
+    """
+    Parse the output of "python -X importtime".
+
+    Args:
+        text (str): stderr output.
+
+    Returns:
+        list[dict]: {"module", "self_us", "cumulative_us", "depth"} for each
+            imported module.
+    """
+    modules = []
+    for line in text.splitlines():
+        match = IMPORT_TIME_REGEX.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append({
+            'module': name,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': len(indent) // 2
+        })
+    return modules
+
+
+def bench_import(repeat=5, top=15):
+    """
+    Time "import NodeGraphQt" in a fresh interpreter.
+
+    Args:
+        repeat (int): number of runs (the median run is reported).
+        top (int): number of the slowest modules to report.
+
+    Returns:
+        dict: import results.
+    """
+    env = _package_env()
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import NodeGraphQt'],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True, check=True
+        )
+        modules = parse_import_times(proc.stderr)
+        total = next(m['cumulative_us'] for m in reversed(modules)
+                     if m['module'] == 'NodeGraphQt')
+        runs.append((total, modules))
+
+    runs.sort(key=lambda r: r[0])
+    total, modules = runs[len(runs) // 2]
+    package = [m for m in modules if m['module'].startswith('NodeGraphQt')]
+    slowest = sorted(modules, key=lambda m: m['self_us'], reverse=True)
+    return {
+        'total_s': total / 1e6,
+        'runs_s': [r[0] / 1e6 for r in runs],
+        'package_self_s': sum(m['self_us'] for m in package) / 1e6,
+        'module_count': len(modules),
+        'slowest_modules': [
+            {'module': m['module'], 'self_s': m['self_us'] / 1e6}
+            for m in slowest[:top]
+        ]
+    }
+
+
+def _timed(func, repeat):
+    """
+    Args:
+        func (function): function to time.
+        repeat (int): number of runs.
+
+    Returns:
+        dict: "median_s", "min_s" and "max_s" timings.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'median_s': statistics.median(timings),
+            'min_s': min(timings),
+            'max_s': max(timings)}
+
+
+def bench_graph_construction(repeat=20):
+    """
+    Time creating a "NodeGraph()".
+
+    Args:
+        repeat (int): number of runs.
+
+    Returns:
+        dict: timings.
+    """
+    from NodeGraphQt import NodeGraph
+
+    graphs = []
+    # keep the graphs alive so their deletion isn't timed.
+    result = _timed(lambda: graphs.append(NodeGraph()), repeat)
+    for graph in graphs:
+        graph.viewer().deleteLater()
+    return result
+
+
+def make_node_types(count):
+    """
+    Create node classes to register.
+
+    Args:
+        count (int): number of node types.
+
+    Returns:
+        list[type]: node classes.
+    """
+    from NodeGraphQt import BaseNode
+
+    def __init__(self):
+        BaseNode.__init__(self)
+        self.add_input('in')
+        self.add_output('out')
+
+    return [
+        type('BenchNode{}'.format(i), (BaseNode,), {
+            '__identifier__': 'bench.group{}'.format(i % 10),
+            'NODE_NAME': 'Bench Node {}'.format(i),
+            '__init__': __init__
+        })
+        for i in range(count)
+    ]
+
+
+def bench_register_nodes(count=500, repeat=5):
+    """
+    Time registering node types to a node graph.
+
+    Args:
+        count (int): number of node types.
+        repeat (int): number of runs.
+
+    Returns:
+        dict: timings.
+    """
+    from NodeGraphQt import NodeGraph
+
+    node_types = make_node_types(count)
+    graphs = [NodeGraph() for _ in range(repeat)]
+    result = _timed(lambda: graphs.pop().register_nodes(node_types), repeat)
+    result['node_types'] = count
+    return result
+
+
+class _PaintWatcher(QtCore.QObject):
+    """
+    Event filter that flags the first paint event of a widget.
+    """
+
+    def __init__(self):
+        super(_PaintWatcher, self).__init__()
+        self.painted = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint:
+            self.painted = True
+        return False
+
+
+def bench_first_paint(node_count=100, repeat=5, timeout=10.0):
+    """
+    Time from "NodeGraph()" to the first paint of the node graph widget
+    with nodes in the graph.
+
+    Args:
+        node_count (int): number of nodes in the graph.
+        repeat (int): number of runs.
+        timeout (float): max seconds to wait for the paint event.
+
+    Returns:
+        dict: timings.
+    """
+    from NodeGraphQt import NodeGraph
+
+    node_type = make_node_types(1)[0]
+    app = QtWidgets.QApplication.instance()
+
+    def first_paint():
+        graph = NodeGraph()
+        graph.register_node(node_type)
+        for i in range(node_count):
+            graph.create_node(node_type.type_, pos=[(i % 10) * 250,
+                                                    (i // 10) * 150],
+                              selected=False, push_undo=False)
+        watcher = _PaintWatcher()
+        graph.viewer().viewport().installEventFilter(watcher)
+        graph.widget.resize(1280, 720)
+        graph.widget.show()
+        end = time.perf_counter() + timeout
+        while not watcher.painted and time.perf_counter() < end:
+            app.processEvents()
+        graph.widget.close()
+        graph.widget.deleteLater()
+
+    result = _timed(first_paint, repeat)
+    result['nodes'] = node_count
+    return result
+
+
+def run(args):
+    """
+    Run the startup benchmarks.
+
+    Args:
+        args (argparse.Namespace): command line arguments.
+
+    Returns:
+        dict: benchmark results.
+    """
+    import NodeGraphQt
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    results = {
+        'version': NodeGraphQt.VERSION,
+        'python': platform.python_version(),
+        'qt': QtCore.qVersion(),
+        'platform': os.environ.get('QT_QPA_PLATFORM'),
+        'benchmarks': {
+            'import': bench_import(args.repeat),
+            'graph_construction': bench_graph_construction(args.repeat * 4),
+            'register_nodes': bench_register_nodes(args.node_types,
+                                                   args.repeat),
+            'first_paint': bench_first_paint(args.nodes, args.repeat),
+        }
+    }
+    app.processEvents()
+    return results
+
+
+def _primary_timing(result):
+    """
+    Args:
+        result (dict): benchmark result.
+
+    Returns:
+        float: timing used to compare benchmark runs.
+    """
+    return result.get('median_s', result.get('total_s'))
+
+
+def compare(results, baseline):
+    """
+    Print the results against a baseline results file.
+
+    Args:
+        results (dict): current results.
+        baseline (dict): previous results.
+    """
+    print('{:<20} {:>10} {:>10} {:>8}'.format(
+        'benchmark', 'baseline', 'current', 'ratio'))
+    for name, result in results['benchmarks'].items():
+        prev = baseline.get('benchmarks', {}).get(name)
+        current = _primary_timing(result)
+        if not prev:
+            print('{:<20} {:>10} {:>9.4f}s {:>8}'.format(
+                name, '-', current, '-'))
+            continue
+        prev = _primary_timing(prev)
+        print('{:<20} {:>9.4f}s {:>9.4f}s {:>7.2f}x'.format(
+            name, prev, current, current / max(prev, 1e-9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs for each benchmark.')
+    parser.add_argument('--node-types', type=int, default=500,
+                        help='number of node types to register.')
+    parser.add_argument('--nodes', type=int, default=100,
+                        help='number of nodes in the first paint benchmark.')
+    parser.add_argument('--output', help='write the JSON results to a file.')
+    parser.add_argument('--compare',
+                        help='JSON results file to compare the results to.')
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    elif not args.output:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
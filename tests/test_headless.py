@@ -0,0 +1,196 @@
+#!/usr/bin/python
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from Qt import QtWidgets
+
+from NodeGraphQt import BaseNode, NodeGraph
+from NodeGraphQt.constants import ViewerEnum
+
+
+class StatefulNode(BaseNode):
+    """
+    Node with a runtime attribute that isn't stored in the node model.
+    """
+
+    __identifier__ = 'nodes.test'
+    NODE_NAME = 'stateful'
+
+    def __init__(self):
+        super(StatefulNode, self).__init__()
+        self.add_input('in')
+        self.add_output('out')
+        self.add_text_input('text', 'Text', text='init')
+        self.state = 'init'
+
+
+class SumNode(BaseNode):
+    """
+    Node that outputs its input value plus the offset property.
+    """
+
+    __identifier__ = 'nodes.test'
+    NODE_NAME = 'sum'
+
+    def __init__(self):
+        super(SumNode, self).__init__()
+        self.add_input('in')
+        self.add_output('out')
+        self.create_property('offset', 1)
+
+    def compute(self, inputs):
+        return {'out': (inputs['in'] or 0) + self.get_property('offset')}
+
+
+class AttachViewerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = (QtWidgets.QApplication.instance() or
+                   QtWidgets.QApplication([]))
+
+    def setUp(self):
+        self.graph = NodeGraph(headless=True)
+        self.graph.register_node(StatefulNode)
+
+    def test_node_state_kept(self):
+        node_a = self.graph.create_node(StatefulNode.type_, name='a')
+        node_b = self.graph.create_node(StatefulNode.type_, name='b')
+        node_a.set_output(0, node_b.input(0))
+        node_a.state = 'changed'
+        node_a.set_property('text', 'value')
+        port = node_a.output(0)
+
+        self.graph.attach_viewer()
+
+        self.assertFalse(node_a.is_headless())
+        self.assertEqual(node_a.state, 'changed')
+        self.assertIs(self.graph.get_node_by_id(node_a.id), node_a)
+        self.assertIs(node_a.output(0), port)
+        self.assertIs(port.view.scene(), self.graph.scene())
+        self.assertEqual(len(port.view.connected_pipes), 1)
+        self.assertEqual(node_a.get_widget('text').get_value(), 'value')
+
+    def test_widget_updates_node(self):
+        node = self.graph.create_node(StatefulNode.type_)
+        self.graph.attach_viewer()
+
+        widget = node.get_widget('text')
+        self.assertIs(widget.node, node)
+        widget.set_value('edited')
+        widget.on_value_changed()
+        self.assertEqual(node.get_property('text'), 'edited')
+
+
+class HeadlessGraphTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = (QtWidgets.QApplication.instance() or
+                   QtWidgets.QApplication([]))
+
+    def setUp(self):
+        self.graph = NodeGraph(headless=True)
+        self.graph.register_node(StatefulNode)
+
+    def test_viewer_settings(self):
+        self.graph.set_background_color(10, 20, 30)
+        self.graph.set_grid_color(40, 50, 60)
+        self.graph.set_grid_mode(ViewerEnum.GRID_DISPLAY_DOTS.value)
+        self.assertEqual(self.graph.background_color(), (10, 20, 30))
+        self.assertEqual(self.graph.grid_color(), (40, 50, 60))
+
+        self.graph.attach_viewer()
+
+        scene = self.graph.scene()
+        self.assertEqual(scene.background_color, (10, 20, 30))
+        self.assertEqual(scene.grid_color, (40, 50, 60))
+        self.assertEqual(scene.grid_mode, ViewerEnum.GRID_DISPLAY_DOTS.value)
+
+    def test_view_calls(self):
+        node = self.graph.create_node(StatefulNode.type_)
+        node.set_selected(True)
+        self.graph.fit_to_selection()
+        self.graph.center_on([node])
+        self.graph.center_selection()
+        self.graph.reset_zoom()
+        self.graph.set_zoom(1.0)
+        self.assertEqual(self.graph.get_zoom(), 0.0)
+
+    def test_auto_layout_nodes(self):
+        node_a = self.graph.create_node(StatefulNode.type_, pos=[0, 0])
+        node_b = self.graph.create_node(StatefulNode.type_, pos=[0, 0])
+        node_a.set_output(0, node_b.input(0))
+
+        self.graph.auto_layout_nodes()
+
+        pos_a, pos_b = node_a.pos(), node_b.pos()
+        self.assertGreater(pos_b[0], pos_a[0])
+        self.assertEqual(pos_a[1], pos_b[1])
+        self.graph.undo_stack().undo()
+        self.assertEqual(node_a.pos(), node_b.pos())
+
+
+class EvaluationTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = (QtWidgets.QApplication.instance() or
+                   QtWidgets.QApplication([]))
+
+    def setUp(self):
+        self.graph = NodeGraph(headless=True)
+        self.graph.register_node(SumNode)
+        self.node_a = self.graph.create_node(SumNode.type_)
+        self.node_b = self.graph.create_node(SumNode.type_)
+        self.node_a.set_output(0, self.node_b.input(0))
+
+    def test_evaluate_in_transaction(self):
+        port = self.node_b.output(0)
+        self.assertEqual(self.graph.evaluate_port(port), 2)
+        with self.graph.transaction():
+            self.node_a.set_property('offset', 5)
+            self.assertEqual(self.graph.evaluate_port(port), 6)
+            node_c = self.graph.create_node(SumNode.type_)
+            node_c.set_property('offset', 10)
+            node_c.set_output(0, self.node_a.input(0))
+            self.assertEqual(self.graph.evaluate_port(port), 16)
+        self.assertEqual(self.graph.evaluate_port(port), 16)
+        self.graph.undo_stack().undo()
+        self.assertEqual(self.graph.evaluate_port(port), 2)
+
+
+class TransactionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = (QtWidgets.QApplication.instance() or
+                   QtWidgets.QApplication([]))
+
+    def setUp(self):
+        self.graph = NodeGraph(headless=True)
+        self.graph.register_node(SumNode)
+
+    def test_rollback_on_exception(self):
+        node = self.graph.create_node(SumNode.type_)
+        undo_count = self.graph.undo_stack().count()
+        created = []
+        self.graph.node_created.connect(created.append)
+
+        with self.assertRaises(RuntimeError):
+            with self.graph.transaction():
+                node.set_property('offset', 5)
+                self.graph.create_node(SumNode.type_)
+                raise RuntimeError('failed edit')
+
+        self.assertEqual(node.get_property('offset'), 1)
+        self.assertEqual(self.graph.all_nodes(), [node])
+        self.assertEqual(self.graph.undo_stack().count(), undo_count)
+        self.assertFalse(self.graph.in_transaction())
+        self.assertEqual(created, [])
+
+
+if __name__ == '__main__':
+    unittest.main()